@@ -1,15 +1,12 @@
 """GCE Eco-Devices integration."""
 
 import asyncio
-from datetime import timedelta
+from collections.abc import Mapping
+from functools import partial
 import logging
+from typing import Any
 
-from pyecodevices import (
-    EcoDevices,
-    EcoDevicesCannotConnectError,
-    EcoDevicesInvalidAuthError,
-)
-
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_HOST,
@@ -17,28 +14,61 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
+    CONF_WEBHOOK_ID,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers import device_registry as dr
 
+from .aggregation import EnergyAggregator
+from .api import (
+    EcoDevicesClient,
+    async_get_host_session,
+    async_release_host_session,
+)
+from .breaker import async_get_breaker, async_remove_breaker
+from .cache import DeviceInfoCache, async_get_device_info_cache
 from .const import (
+    AGGREGATOR,
+    COSTS,
+    CONF_C1_ENABLED,
+    CONF_C2_ENABLED,
+    CONF_PUSH,
     CONF_T1_ENABLED,
     CONF_T1_TYPE,
     CONF_T2_ENABLED,
     CONF_T2_TYPE,
+    CONF_TI_TYPE_AUTO,
     CONF_TI_TYPE_BASE,
     CONF_TI_TYPE_HCHP,
+    CONF_TI_TYPES,
+    CONFIG,
     CONTROLLER,
     COORDINATOR,
     DOMAIN,
+    ENTITY_UPDATERS,
+    FLEET_MEMBER,
+    HTTP_REQUEST_TIMEOUT,
     PLATFORMS,
+    RATES,
+    SAMPLER,
+    TARIFFS,
     UNDO_UPDATE_LISTENER,
 )
+from .coordinator import EcoDevicesCoordinator
+from .cost import CostEngine, async_get_cost_store, get_prices
+from .entity import get_device_info
+from .fleet import async_get_fleet
+from .push import async_setup_push
+from .rate import MeterRates
+from .sampling import PowerSampler
+from .tariff import TariffTracker
 
 _LOGGER = logging.getLogger(__name__)
 
+# Options needing a new controller or webhook, the others are applied in place
+RELOAD_OPTIONS = (CONF_USERNAME, CONF_PASSWORD, CONF_PUSH)
+
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old config entry."""
@@ -74,6 +104,19 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         _LOGGER.debug("Migration to version %s successful", entry.version)
 
+    if entry.version == 2:
+        _LOGGER.debug("Entry version %s needs migration", entry.version)
+        # The contracts not chosen are detected from the values the teleinfo
+        # reports
+        new_options = dict(entry.options)
+        for key in (CONF_T1_TYPE, CONF_T2_TYPE):
+            if new_options.get(key, entry.data.get(key)) not in CONF_TI_TYPES:
+                new_options[key] = CONF_TI_TYPE_AUTO
+        hass.config_entries.async_update_entry(
+            entry, data=entry.data, options=new_options, version=3
+        )
+        _LOGGER.debug("Migration to version %s successful", entry.version)
+
     return True
 
 
@@ -86,49 +129,99 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scan_interval = options.get(CONF_SCAN_INTERVAL, config.get(CONF_SCAN_INTERVAL))
     username = options.get(CONF_USERNAME, config.get(CONF_USERNAME))
     password = options.get(CONF_PASSWORD, config.get(CONF_PASSWORD))
+    push = options.get(CONF_PUSH, config.get(CONF_PUSH, False))
 
-    session = async_get_clientsession(hass, False)
+    if push and CONF_WEBHOOK_ID not in config:
+        hass.config_entries.async_update_entry(
+            entry, data={**config, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+        )
+        config = entry.data
+
+    session = async_get_host_session(hass, config[CONF_HOST])
+    entry.async_on_unload(partial(async_release_host_session, hass, config[CONF_HOST]))
 
-    controller = EcoDevices(
+    controller = EcoDevicesClient(
         config[CONF_HOST],
         config[CONF_PORT],
         username,
         password,
+        request_timeout=HTTP_REQUEST_TIMEOUT,
         session=session,
     )
 
-    try:
-        await controller.get_info()
-    except EcoDevicesCannotConnectError as exception:
-        raise ConfigEntryNotReady from exception
-
-    async def async_update_data():
-        """Fetch data from API."""
-        try:
-            return await controller.global_get()
-        except EcoDevicesInvalidAuthError as err:
-            raise UpdateFailed("Authentication error on Eco-Devices") from err
-        except EcoDevicesCannotConnectError as err:
-            raise UpdateFailed(f"Failed to communicating with API: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
+    cache = await async_get_device_info_cache(hass)
+    teleinfo_inputs, meter_inputs = _get_inputs(entry)
+    coordinator = EcoDevicesCoordinator(
         hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
+        entry,
+        controller,
+        scan_interval,
+        teleinfo_inputs=teleinfo_inputs,
+        meter_inputs=meter_inputs,
+        push=push,
+        breaker=async_get_breaker(hass, entry.entry_id),
+        info_listener=partial(_async_info_updated, hass, entry, cache),
     )
+    coordinator.async_set_contracts(_get_contracts({**config, **options}))
+
+    fleet = async_get_fleet(hass)
+    if (info := cache.get(entry.entry_id)) is not None:
+        # Known device: set up at once, the first poll revalidates the cache
+        controller.restore_info(info)
+        coordinator.restore_detected(
+            {
+                number: info[key]
+                for number in (1, 2)
+                if (key := f"t{number}_contract") in info
+            },
+            tuple(number for number in (1, 2) if info.get(f"t{number}_phases") == "3"),
+        )
+    else:
+        # Device information and first data in the same requests, a few
+        # entries at a time
+        await fleet.async_refresh(coordinator)
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady
+    coordinator.device_info = get_device_info(controller)
 
-    await coordinator.async_refresh()
+    undo_listener = entry.add_update_listener(_async_update_listener)
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    fleet_member = fleet.async_register(
+        entry.entry_id, coordinator, poll_now=info is not None
+    )
+    entry.async_on_unload(partial(fleet.async_unregister, entry.entry_id))
 
-    undo_listener = entry.add_update_listener(_async_update_listener)
+    if push:
+        async_setup_push(hass, entry, coordinator)
+
+    aggregator = EnergyAggregator(hass, entry, coordinator)
+    entry.async_on_unload(aggregator.async_start())
+    tariffs = TariffTracker(hass, entry, coordinator)
+    entry.async_on_unload(tariffs.async_start())
+    costs = CostEngine(
+        hass,
+        entry,
+        coordinator,
+        await async_get_cost_store(hass),
+        get_prices({**config, **options}),
+    )
+    entry.async_on_unload(costs.async_start())
+    rates = MeterRates(coordinator)
+    entry.async_on_unload(rates.async_start())
+    sampler = PowerSampler(coordinator)
+    entry.async_on_unload(sampler.async_start())
 
     hass.data[DOMAIN][entry.entry_id] = {
+        AGGREGATOR: aggregator,
+        CONFIG: {**entry.data, **entry.options},
         CONTROLLER: controller,
         COORDINATOR: coordinator,
+        COSTS: costs,
+        ENTITY_UPDATERS: [],
+        FLEET_MEMBER: fleet_member,
+        RATES: rates,
+        SAMPLER: sampler,
+        TARIFFS: tariffs,
         UNDO_UPDATE_LISTENER: undo_listener,
     }
 
@@ -137,9 +230,126 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@callback
+def _async_info_updated(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    cache: DeviceInfoCache,
+    coordinator: EcoDevicesCoordinator,
+) -> None:
+    """Cache the device information and teleinfo read from the Eco-Devices.
+
+    A new firmware version is written to the device registry, a new MAC
+    address (another Eco-Devices at this address) reloads the entry as the
+    unique IDs derive from it, a new contract or three-phase meter builds the
+    entities again.
+    """
+    controller = coordinator.controller
+    cached = cache.get(entry.entry_id)
+    detected = {
+        **{
+            f"t{number}_contract": contract
+            for number, contract in coordinator.detected_contracts.items()
+        },
+        **{f"t{number}_phases": "3" for number in coordinator.three_phase_inputs},
+    }
+    info = {**controller.info, **detected}
+    cache.async_set(entry.entry_id, info)
+    if cached is None or cached == info:
+        return
+    if cached["mac_address"] != controller.mac_address:
+        _LOGGER.warning(
+            "MAC address of %s changed from %s to %s, reloading",
+            controller.host,
+            cached["mac_address"],
+            controller.mac_address,
+        )
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    if cached["version"] != controller.version:
+        device_registry = dr.async_get(hass)
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, controller.mac_address)}
+        ):
+            device_registry.async_update_device(
+                device.id, sw_version=controller.version
+            )
+    if (data := hass.data[DOMAIN].get(entry.entry_id)) is not None and {
+        key: value for key, value in cached.items() if key not in controller.info
+    } != detected:
+        entry.async_create_background_task(
+            hass,
+            _async_update_entities(data),
+            f"{DOMAIN} {entry.entry_id} entities update",
+        )
+
+
+def _get_contracts(config: Mapping[str, Any]) -> dict[int, str]:
+    """Return the contracts chosen in the options, the others are detected."""
+    return {
+        number: contract
+        for number, key in ((1, CONF_T1_TYPE), (2, CONF_T2_TYPE))
+        if (contract := config.get(key)) and contract != CONF_TI_TYPE_AUTO
+    }
+
+
+def _get_inputs(entry: ConfigEntry) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Return the enabled teleinfo and meter inputs."""
+    config = entry.data
+    options = entry.options
+    return (
+        tuple(
+            number
+            for number, enabled in ((1, CONF_T1_ENABLED), (2, CONF_T2_ENABLED))
+            if options.get(enabled, config.get(enabled))
+        ),
+        tuple(
+            number
+            for number, enabled in ((1, CONF_C1_ENABLED), (2, CONF_C2_ENABLED))
+            if options.get(enabled, config.get(enabled))
+        ),
+    )
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update.
+
+    A change of the credentials or of the push mode reloads the entry, the
+    other options are applied in place: the interval is updated and only the
+    entities of the changed inputs are added or removed.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    previous = data[CONFIG]
+    current = data[CONFIG] = {**entry.data, **entry.options}
+    if current == previous:
+        return
+    if any(previous.get(key) != current.get(key) for key in RELOAD_OPTIONS):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator: EcoDevicesCoordinator = data[COORDINATOR]
+    data[COSTS].prices = get_prices(current)
+    if previous.get(CONF_SCAN_INTERVAL) != current.get(CONF_SCAN_INTERVAL):
+        coordinator.async_set_scan_interval(current[CONF_SCAN_INTERVAL])
+
+    inputs = _get_inputs(entry)
+    contracts = _get_contracts(current)
+    if inputs != (
+        coordinator.teleinfo_inputs,
+        coordinator.meter_inputs,
+    ) or contracts != _get_contracts(previous):
+        coordinator.async_set_inputs(*inputs)
+        coordinator.async_set_contracts(contracts)
+        # Data of the new inputs and indexes for their entities
+        await coordinator.async_refresh()
+
+    await _async_update_entities(data)
+
+
+async def _async_update_entities(data: dict[str, Any]) -> None:
+    """Build the entities of the platforms again, keeping the unchanged ones."""
+    for async_update_entities in data[ENTITY_UPDATERS]:
+        await async_update_entities()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -157,5 +367,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_remove_breaker(hass, entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the cached device information, costs and breaker of an entry."""
+    async_remove_breaker(hass, entry.entry_id)
+    cache = await async_get_device_info_cache(hass)
+    cache.async_remove(entry.entry_id)
+    cost_store = await async_get_cost_store(hass)
+    cost_store.async_remove(entry.entry_id)
@@ -0,0 +1,340 @@
+"""Hourly and daily energy aggregation, imported as external statistics."""
+
+from array import array
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    STATISTIC_UNIT_TO_UNIT_CONVERTER,
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    AGGREGATION_DAYS,
+    AGGREGATION_HOURS,
+    CONF_C1_TOTAL_UNIT_OF_MEASUREMENT,
+    CONF_C1_UNIT_OF_MEASUREMENT,
+    CONF_C2_TOTAL_UNIT_OF_MEASUREMENT,
+    CONF_C2_UNIT_OF_MEASUREMENT,
+    COUNTER_TELEINFO_MAX_RATE,
+    DEFAULT_C1_NAME,
+    DEFAULT_C2_NAME,
+    DEFAULT_T1_NAME,
+    DEFAULT_T2_NAME,
+    DOMAIN,
+)
+from .coordinator import EcoDevicesCoordinator
+from .counter import MonotonicCounter
+from .snapshot import TELEINFO_PERIODS, TariffPeriod
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_HOUR = 3600
+
+
+def _advance(buckets: array, current: int | None, position: int) -> int:
+    """Clear the buckets between the current and the new position of a ring."""
+    if current is None:
+        return position
+    size = len(buckets)
+    for index in range(max(current + 1, position - size + 1), position + 1):
+        buckets[index % size] = 0.0
+    return max(current, position)
+
+
+class EnergySeries:
+    """Consumption of an index per hour and per day, in fixed-size rings.
+
+    The hourly ring is indexed by the hours since the epoch, the daily ring
+    by the ordinal of the local date. The readings go through a monotonic
+    counter so a glitch never lands in a bucket. The last statistic of the
+    recorder restores the sum and the previous index, so the consumption
+    while Home Assistant was stopped lands in the first hour after it.
+    """
+
+    __slots__ = (
+        "_counter",
+        "_day",
+        "_divider",
+        "_hour",
+        "daily",
+        "hourly",
+        "last_delta",
+        "last_start",
+        "metadata",
+        "sum",
+    )
+
+    def __init__(
+        self,
+        metadata: StatisticMetaData,
+        max_rate: float | None,
+        divider: float = 1,
+    ) -> None:
+        """Initialize the series with empty buckets."""
+        self.metadata = metadata
+        self.hourly = array("d", bytes(8 * AGGREGATION_HOURS))
+        self.daily = array("d", bytes(8 * AGGREGATION_DAYS))
+        self._counter = MonotonicCounter(max_rate)
+        self._divider = divider
+        self._hour: int | None = None
+        self._day: int | None = None
+        # Last imported sum, hour start and consumption of that hour
+        self.sum: float | None = None
+        self.last_start: float | None = None
+        self.last_delta = 0.0
+
+    @property
+    def value(self) -> float | None:
+        """Return the last accepted index."""
+        if self._counter.value is None:
+            return None
+        return self._counter.value / self._divider
+
+    def restore(self, row: dict[str, Any] | None) -> None:
+        """Restore the last statistic imported in the recorder, if any."""
+        self.sum = 0.0
+        if row is None:
+            return
+        self.sum = row.get("sum") or 0.0
+        self.last_start = row["start"]
+        if (state := row.get("state")) is not None:
+            self._counter.restore(state * self._divider)
+
+    def add(self, hour: int, day: int, reading: float | None) -> None:
+        """Add the consumption since the previous reading to the buckets."""
+        self._hour = _advance(self.hourly, self._hour, hour)
+        self._day = _advance(self.daily, self._day, day)
+        previous = self._counter.value
+        if self._counter.update(reading) is not None or previous is None:
+            return
+        if (delta := self._counter.value - previous) > 0:
+            delta /= self._divider
+            self.hourly[hour % len(self.hourly)] += delta
+            self.daily[day % len(self.daily)] += delta
+
+    def hour_delta(self, hour: int) -> float | None:
+        """Return the consumption of an hour, None if out of the ring."""
+        if self._hour is None or not 0 <= self._hour - hour < len(self.hourly):
+            return None
+        return self.hourly[hour % len(self.hourly)]
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the hourly and daily buckets, oldest first."""
+        return {
+            "hourly": _ordered(self.hourly, self._hour),
+            "daily": _ordered(self.daily, self._day),
+        }
+
+
+def _ordered(buckets: array, current: int | None) -> list[float]:
+    """Return the buckets of a ring from the oldest to the current one."""
+    if current is None:
+        return []
+    start = (current + 1) % len(buckets)
+    return [round(value, 3) for value in (*buckets[start:], *buckets[:start])]
+
+
+class EnergyAggregator:
+    """Aggregate the indexes of an Eco-Devices on every coordinator update.
+
+    Each teleinfo index (one per tariff period) and meter total has its
+    series, created when it is first reported. When an hour is over, its
+    consumption is imported in the recorder as an external statistic, so the
+    energy dashboard reads precomputed hourly sums instead of the states.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: EcoDevicesCoordinator,
+    ) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self.series: dict[str, EnergySeries] = {}
+        self._hour: int | None = None
+        self._generation: int | None = None
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self._remove_stop_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start aggregating the coordinator updates, return the stop callback."""
+        self._remove_listener = self.coordinator.async_add_listener(
+            self._async_handle_update
+        )
+        self._remove_stop_listener = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_hass_stop
+        )
+        return self.async_stop
+
+    @callback
+    def _async_hass_stop(self, event: Event) -> None:
+        """Import the hour in progress when Home Assistant stops."""
+        self._remove_stop_listener = None
+        self.async_stop()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop aggregating, import the consumption of the hour in progress."""
+        if self._remove_stop_listener is not None:
+            self._remove_stop_listener()
+            self._remove_stop_listener = None
+        if self._remove_listener is None:
+            return
+        self._remove_listener()
+        self._remove_listener = None
+        if self._hour is not None:
+            self._async_import(range(self._hour, self._hour + 1))
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Add the new readings, import the hours which are over."""
+        data = self.coordinator.data
+        if data is None or data.generation == self._generation:
+            return
+        self._generation = data.generation
+
+        now = dt_util.utcnow()
+        hour = int(now.timestamp() // SECONDS_PER_HOUR)
+        day = dt_util.as_local(now).date().toordinal()
+        if self._hour is not None and hour > self._hour:
+            self._async_import(range(self._hour, hour))
+        self._hour = hour
+
+        for number, teleinfo in data.teleinfo.items():
+            for period, reading in zip(TELEINFO_PERIODS, teleinfo.indexes()):
+                key = f"t{number}_{period}"
+                if (series := self.series.get(key)) is None:
+                    if not reading:
+                        # Index of a period the contract does not have
+                        continue
+                    series = self.series[key] = self._teleinfo_series(number, period)
+                    self._async_load(series)
+                elif series.sum is not None:
+                    series.add(hour, day, reading)
+        for number, meter in data.meters.items():
+            if (series := self.series.get(f"c{number}")) is None:
+                series = self.series[f"c{number}"] = self._meter_series(number)
+                self._async_load(series)
+            elif series.sum is not None:
+                series.add(hour, day, meter.total)
+
+    @callback
+    def _async_load(self, series: EnergySeries) -> None:
+        """Load the last statistic of a new series in the background.
+
+        The readings are ignored until it is loaded: the indexes are
+        cumulative, so the first one after the load holds all the consumption
+        since the last imported index.
+        """
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_restore(series),
+            f"{DOMAIN} {series.metadata['statistic_id']} statistics load",
+        )
+
+    async def _async_restore(self, series: EnergySeries) -> None:
+        """Restore the last sum and index of a series from the recorder."""
+        statistic_id = series.metadata["statistic_id"]
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, False, {"sum", "state"}
+        )
+        series.restore(rows[0] if (rows := last.get(statistic_id)) else None)
+
+    def _metadata(self, key: str, name: str, unit: str | None) -> StatisticMetaData:
+        """Return the metadata of the statistic of a series."""
+        mac_address = slugify(self.coordinator.controller.mac_address)
+        converter = STATISTIC_UNIT_TO_UNIT_CONVERTER.get(unit)
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=f"Eco-Devices {self.coordinator.controller.host} {name}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{mac_address}_{key}",
+            unit_class=converter.UNIT_CLASS if converter else None,
+            unit_of_measurement=unit,
+        )
+
+    def _teleinfo_series(self, number: int, period: TariffPeriod) -> EnergySeries:
+        """Return a new series of a teleinfo index."""
+        name = DEFAULT_T1_NAME if number == 1 else DEFAULT_T2_NAME
+        return EnergySeries(
+            self._metadata(
+                f"t{number}_{period}",
+                f"{name} {period.upper()}",
+                UnitOfEnergy.WATT_HOUR,
+            ),
+            COUNTER_TELEINFO_MAX_RATE,
+        )
+
+    def _meter_series(self, number: int) -> EnergySeries:
+        """Return a new series of a meter total, in the unit of its sensor."""
+        config = {**self.entry.data, **self.entry.options}
+        unit_key, total_unit_key = (
+            (CONF_C1_UNIT_OF_MEASUREMENT, CONF_C1_TOTAL_UNIT_OF_MEASUREMENT)
+            if number == 1
+            else (CONF_C2_UNIT_OF_MEASUREMENT, CONF_C2_TOTAL_UNIT_OF_MEASUREMENT)
+        )
+        name = DEFAULT_C1_NAME if number == 1 else DEFAULT_C2_NAME
+        return EnergySeries(
+            self._metadata(
+                f"c{number}",
+                f"{name} Total",
+                config.get(total_unit_key, config.get(unit_key)),
+            ),
+            None,
+            divider=1000,
+        )
+
+    @callback
+    def _async_import(self, hours: range) -> None:
+        """Import the consumption of the hours which are over."""
+        for series in self.series.values():
+            if series.sum is None:
+                continue
+            statistic_id = series.metadata["statistic_id"]
+            statistics: list[StatisticData] = []
+            for hour in hours:
+                start = hour * SECONDS_PER_HOUR
+                if series.last_start is not None and start < series.last_start:
+                    # Already imported before a restart
+                    continue
+                if (delta := series.hour_delta(hour)) is None:
+                    continue
+                if start == series.last_start:
+                    # Partly imported when stopped, the sum includes that part
+                    series.sum -= series.last_delta
+                series.sum += delta
+                series.last_start = start
+                series.last_delta = delta
+                statistic = StatisticData(
+                    start=dt_util.utc_from_timestamp(start), sum=series.sum
+                )
+                if series.value is not None:
+                    statistic["state"] = series.value
+                statistics.append(statistic)
+            if statistics:
+                _LOGGER.debug("Import %s hours of %s", len(statistics), statistic_id)
+                async_add_external_statistics(self.hass, series.metadata, statistics)
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the buckets of every series."""
+        return {
+            series.metadata["statistic_id"]: series.statistics()
+            for series in self.series.values()
+        }
@@ -0,0 +1,202 @@
+"""HTTP access to the Eco-Devices."""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import logging
+import socket
+import time
+from typing import Any
+from xml.parsers.expat import ExpatError
+
+import aiohttp
+from aiohttp.hdrs import USER_AGENT
+from pyecodevices import (
+    EcoDevices,
+    EcoDevicesCannotConnectError,
+    EcoDevicesInvalidAuthError,
+)
+import xmltodict
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+
+from .const import (
+    DOMAIN,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_CONNECTIONS_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_REQUEST_TIMEOUT,
+    SESSIONS,
+    SOURCE_STATUS,
+    SOURCE_TELEINFO_1,
+    SOURCE_TELEINFO_2,
+)
+from .instrumentation import PollRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EcoDevicesClient(EcoDevices):
+    """Eco-Devices API able to fetch only some of its XML documents."""
+
+    @property
+    def info(self) -> dict[str, str]:
+        """Return the firmware version and MAC address, as cached."""
+        return {"mac_address": self._mac_address, "version": self._version}
+
+    def restore_info(self, info: dict[str, str]) -> None:
+        """Set the firmware version and MAC address from the cache."""
+        self._mac_address = info["mac_address"]
+        self._version = info["version"]
+
+    def update_info(self, data: dict[str, Any]) -> None:
+        """Set the firmware version and MAC address from the status values."""
+        self._version = data["version"]
+        self._mac_address = data["config_mac"]
+
+    def _source_url(self, source: str) -> str:
+        """Return the URL of a data source."""
+        return {
+            SOURCE_STATUS: self._api_url,
+            SOURCE_TELEINFO_1: self._api_teleinfo_1_url,
+            SOURCE_TELEINFO_2: self._api_teleinfo_2_url,
+        }[source]
+
+    async def get_sources(
+        self,
+        sources: Iterable[str],
+        record: PollRecord | None = None,
+        request_timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Return the merged values of the given data sources."""
+        result: dict[str, Any] = {}
+        for source in sources:
+            result.update(
+                await self._request(self._source_url(source), record, request_timeout)
+            )
+        return result
+
+    async def _request(
+        self,
+        url: str,
+        record: PollRecord | None = None,
+        request_timeout: float | None = None,
+    ) -> dict:
+        """Make a request to get Eco-Devices data, measuring its cost if recorded.
+
+        The network time (up to the end of the body) and the XML parsing time
+        are measured separately.
+        """
+        auth = None
+        if self._username and self._password:
+            auth = aiohttp.BasicAuth(self._username, self._password)
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._close_session = True
+
+        start = time.perf_counter()
+        try:
+            async with (
+                asyncio.timeout(request_timeout or self._request_timeout),
+                self._session.get(url, auth=auth) as response,
+            ):
+                if response.status == 401:
+                    raise EcoDevicesInvalidAuthError(
+                        "Authentication failed with Eco-Devices."
+                    )
+                contents = await response.read()
+        except TimeoutError as exception:
+            raise EcoDevicesCannotConnectError(
+                "Timeout occurred while connecting to Eco-Devices."
+            ) from exception
+        except (aiohttp.ClientError, socket.gaierror) as exception:
+            raise EcoDevicesCannotConnectError(
+                "Error occurred while communicating with Eco-Devices."
+            ) from exception
+
+        parse_start = time.perf_counter()
+        try:
+            data = xmltodict.parse(contents).get("response")
+        except ExpatError as exception:
+            # Another HTTP server, answering something else than XML
+            raise EcoDevicesCannotConnectError(
+                "Invalid XML received from Eco-Devices."
+            ) from exception
+        if record is not None:
+            record.request_duration += parse_start - start
+            record.parse_duration += time.perf_counter() - parse_start
+            record.response_bytes += len(contents)
+        if not data:
+            raise EcoDevicesCannotConnectError("Eco-Devices XML request error")
+        return data
+
+
+@dataclass(slots=True)
+class _HostSession:
+    """Client session shared by the users of an Eco-Devices host."""
+
+    session: aiohttp.ClientSession
+    unsub_close: CALLBACK_TYPE
+    users: int = 0
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Return a new client session for the Eco-Devices, to close once used."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            ssl=False,
+            limit_per_host=HTTP_CONNECTIONS_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            use_dns_cache=True,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        ),
+        timeout=aiohttp.ClientTimeout(
+            total=HTTP_REQUEST_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        ),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+    )
+
+
+@callback
+def async_get_host_session(hass: HomeAssistant, host: str) -> aiohttp.ClientSession:
+    """Return the keep-alive session of a host, to release once no longer used.
+
+    The small embedded HTTP server of the Eco-Devices is kept connected
+    between polls instead of opening a new TCP connection every time.
+    """
+    sessions: dict[str, _HostSession] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        SESSIONS, {}
+    )
+    if (host_session := sessions.get(host)) is None:
+        _LOGGER.debug("Create the HTTP session of %s", host)
+        session = create_session()
+
+        async def _async_close(_event: Event) -> None:
+            await session.close()
+
+        host_session = sessions[host] = _HostSession(
+            session,
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close),
+        )
+    host_session.users += 1
+    return host_session.session
+
+
+async def async_release_host_session(hass: HomeAssistant, host: str) -> None:
+    """Release the session of a host, closing it when it has no more users."""
+    sessions: dict[str, _HostSession] = hass.data[DOMAIN][SESSIONS]
+    host_session = sessions[host]
+    host_session.users -= 1
+    if host_session.users > 0:
+        return
+    _LOGGER.debug("Close the HTTP session of %s", host)
+    del sessions[host]
+    host_session.unsub_close()
+    await host_session.session.close()
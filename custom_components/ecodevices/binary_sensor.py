@@ -8,17 +8,11 @@ from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
 from homeassistant.util import slugify
 
 from .const import (
     CONF_T1_ENABLED,
-    CONF_T1_TYPE,
     CONF_T2_ENABLED,
-    CONF_T2_TYPE,
     CONF_TI_TYPE_HCHP,
     CONF_TI_TYPE_TEMPO,
     CONTROLLER,
@@ -27,7 +21,10 @@ from .const import (
     DEFAULT_T2_NAME,
     DOMAIN,
 )
-from .entity import get_device_info
+from .coordinator import EcoDevicesCoordinator
+from .entity import EcoDevicesEntity, async_add_entry_entities
+from .extractor import ValueExtractor
+from .snapshot import TariffPeriod
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +33,13 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the GCE Eco-Devices platform."""
+    async_add_entry_entities(hass, entry, async_add_entities, _build_entities)
+
+
+def _build_entities(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> list[BinarySensorEntity]:
+    """Return the entities of the enabled inputs."""
     data = hass.data[DOMAIN][entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
@@ -43,16 +47,14 @@ async def async_setup_entry(
     options = entry.options
 
     t1_enabled = options.get(CONF_T1_ENABLED, config.get(CONF_T1_ENABLED))
-    t1_type = options.get(CONF_T1_TYPE, config.get(CONF_T1_TYPE))
     t2_enabled = options.get(CONF_T2_ENABLED, config.get(CONF_T2_ENABLED))
-    t2_type = options.get(CONF_T2_TYPE, config.get(CONF_T2_TYPE))
 
     entities: list[BinarySensorEntity] = []
 
     for input_number in (1, 2):
         if t1_enabled and input_number == 1 or t2_enabled and input_number == 2:
             _LOGGER.debug("Add the teleinfo %s binary_sensor entities", input_number)
-            if t1_type in (CONF_TI_TYPE_HCHP, CONF_TI_TYPE_TEMPO) or t2_type in (
+            if coordinator.contracts.get(input_number) in (
                 CONF_TI_TYPE_HCHP,
                 CONF_TI_TYPE_TEMPO,
             ):
@@ -67,11 +69,10 @@ async def async_setup_entry(
                     )
                 )
 
-    if entities:
-        async_add_entities(entities)
+    return entities
 
 
-class TeleinfoInputHeuresCreuses(CoordinatorEntity, BinarySensorEntity):
+class TeleinfoInputHeuresCreuses(EcoDevicesEntity, BinarySensorEntity):
     """Representation of a Eco-Devices HC binary sensor."""
 
     _attr_icon = "mdi:cash-clock"
@@ -79,7 +80,7 @@ class TeleinfoInputHeuresCreuses(CoordinatorEntity, BinarySensorEntity):
     def __init__(
         self,
         controller: EcoDevices,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EcoDevicesCoordinator,
         input_number: int,
         input_name: str,
         name: str,
@@ -93,15 +94,20 @@ class TeleinfoInputHeuresCreuses(CoordinatorEntity, BinarySensorEntity):
         self._attr_unique_id = slugify(
             f"{DOMAIN}_{self.controller.mac_address}_binary_sensor_{self._input_number}_{self._input_name}"
         )
-        self._attr_device_info = get_device_info(self.controller)
+        self._extractor = ValueExtractor(
+            (f"T{self._input_number}_{self._input_name}",),
+            lambda snapshot: _is_off_peak(snapshot.teleinfo[self._input_number].period),
+        )
+        self._data_keys = self._extractor.keys
 
     @property
     def is_on(self) -> bool | None:
         """Return the state."""
-        if type_heure := self.coordinator.data.get(
-            f"T{self._input_number}_{self._input_name}"
-        ):
-            if type_heure.startswith("HC"):
-                return True
-            return False
+        return self._extractor.read(self.coordinator.data)
+
+
+def _is_off_peak(period: TariffPeriod | None) -> bool | None:
+    """Return whether the tariff period is an off-peak one."""
+    if period is None:
         return None
+    return period.off_peak
@@ -0,0 +1,106 @@
+"""Circuit breaker sparing the requests to an unreachable Eco-Devices."""
+
+from enum import StrEnum
+import random
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER,
+    BREAKER_MAX_DELAY,
+    BREAKERS,
+    DOMAIN,
+)
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop requesting a device after repeated failures, then probe it.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens and
+    no request is made until a jittered delay, doubling on every failed probe
+    up to BREAKER_MAX_DELAY. Once the delay expired the breaker is half-open:
+    the next request is a probe, closing the breaker if it succeeds and opening
+    it again otherwise.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_delay: float = BREAKER_BASE_DELAY,
+        max_delay: float = BREAKER_MAX_DELAY,
+    ) -> None:
+        """Initialize the breaker, closed."""
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.delay = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds before the breaker lets a probe through."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be made, half-opening when it is time."""
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() < self._retry_at:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> bool:
+        """Close the breaker, return True if it was not closed."""
+        was_closed = self.state is BreakerState.CLOSED
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.delay = 0.0
+        return not was_closed
+
+    def record_failure(self) -> bool:
+        """Count a failed request, return True if the breaker is now open."""
+        self.failures += 1
+        if (
+            self.state is BreakerState.CLOSED
+            and self.failures < self._failure_threshold
+        ):
+            return False
+        self.opens += 1
+        self.delay = min(
+            self._max_delay, self._base_delay * 2 ** (self.opens - 1)
+        ) * random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        self._retry_at = time.monotonic() + self.delay
+        self.state = BreakerState.OPEN
+        return True
+
+
+@callback
+def async_get_breaker(hass: HomeAssistant, entry_id: str) -> CircuitBreaker:
+    """Return the breaker of a config entry, kept across the setup retries."""
+    breakers: dict[str, CircuitBreaker] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        BREAKERS, {}
+    )
+    if (breaker := breakers.get(entry_id)) is None:
+        breaker = breakers[entry_id] = CircuitBreaker()
+    return breaker
+
+
+@callback
+def async_remove_breaker(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget the breaker of an unloaded or removed config entry."""
+    hass.data.get(DOMAIN, {}).get(BREAKERS, {}).pop(entry_id, None)
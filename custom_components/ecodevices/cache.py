@@ -0,0 +1,72 @@
+"""Persistent cache of the Eco-Devices identity."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEVICE_INFO_CACHE,
+    DOMAIN,
+    STORAGE_KEY_DEVICE_INFO,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceInfoCache:
+    """MAC address, firmware version and contracts of the Eco-Devices.
+
+    Kept per config entry, lets an entry set up with the entities of its
+    contracts without waiting for its Eco-Devices to answer, the first poll
+    then revalidates the cached identity.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, dict[str, str]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_DEVICE_INFO
+        )
+        self._data: dict[str, dict[str, str]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached identities."""
+        self._data = await self._store.async_load() or {}
+
+    def get(self, entry_id: str) -> dict[str, str] | None:
+        """Return the cached identity of a config entry."""
+        return self._data.get(entry_id)
+
+    @callback
+    def async_set(self, entry_id: str, info: dict[str, str]) -> None:
+        """Cache the identity of a config entry, saved only if it changed."""
+        if self._data.get(entry_id) == info:
+            return
+        _LOGGER.debug("Cache the device info of %s: %s", entry_id, info)
+        self._data[entry_id] = info
+        self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the identity of a removed config entry."""
+        if self._data.pop(entry_id, None) is not None:
+            self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+
+async def async_get_device_info_cache(hass: HomeAssistant) -> DeviceInfoCache:
+    """Return the device info cache, loaded once for all the entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (task := domain_data.get(DEVICE_INFO_CACHE)) is None:
+        cache = DeviceInfoCache(hass)
+        task = domain_data[DEVICE_INFO_CACHE] = hass.async_create_task(
+            _async_load(cache)
+        )
+    return await task
+
+
+async def _async_load(cache: DeviceInfoCache) -> DeviceInfoCache:
+    """Load and return the cache."""
+    await cache.async_load()
+    return cache
@@ -2,11 +2,7 @@
 
 from typing import Any
 
-from pyecodevices import (
-    EcoDevices,
-    EcoDevicesCannotConnectError,
-    EcoDevicesInvalidAuthError,
-)
+from pyecodevices import EcoDevicesCannotConnectError, EcoDevicesInvalidAuthError
 import voluptuous as vol
 
 from homeassistant.components.sensor import DEVICE_CLASSES as SENSOR_DEVICE_CLASSES
@@ -19,13 +15,13 @@ from homeassistant.config_entries import (
 )
 from homeassistant.const import (
     CONF_HOST,
+    CONF_HOSTS,
     CONF_PASSWORD,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
 
 from .const import (
     CONF_C1_DEVICE_CLASS,
@@ -38,20 +34,32 @@ from .const import (
     CONF_C2_ENABLED,
     CONF_C2_TOTAL_UNIT_OF_MEASUREMENT,
     CONF_C2_UNIT_OF_MEASUREMENT,
+    CONF_METER_WRITE_POLICY,
+    CONF_POWER_WRITE_POLICY,
+    CONF_PUSH,
+    CONF_SAMPLING_PERCENTILE,
+    CONF_SAMPLING_WINDOW,
     CONF_T1_ENABLED,
     CONF_T1_TYPE,
     CONF_T2_ENABLED,
     CONF_T2_TYPE,
-    CONF_TI_TYPE_BASE,
+    CONF_TI_TYPE_AUTO,
     CONF_TI_TYPES,
+    DEFAULT_PORT,
+    DEFAULT_SAMPLING_PERCENTILE,
+    DEFAULT_SAMPLING_WINDOW,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    HTTP_REQUEST_TIMEOUT,
 )
+from .cost import price_key
+from .discovery import ProbeResult, async_discover, async_probe, parse_hosts
+from .snapshot import CONTRACT_PERIODS, TELEINFO_PERIODS, TariffPeriod
 
 BASE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
-        vol.Required(CONF_PORT, default=80): int,
+        vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
         vol.Optional(CONF_USERNAME): str,
         vol.Optional(CONF_PASSWORD): str,
         vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
@@ -59,6 +67,16 @@ BASE_SCHEMA = vol.Schema(
         vol.Required(CONF_T2_ENABLED, default=False): bool,
         vol.Required(CONF_C1_ENABLED, default=False): bool,
         vol.Required(CONF_C2_ENABLED, default=False): bool,
+        vol.Required(CONF_PUSH, default=False): bool,
+    }
+)
+
+DISCOVERY_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOSTS): str,
+        vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
+        vol.Optional(CONF_USERNAME): str,
+        vol.Optional(CONF_PASSWORD): str,
     }
 )
 
@@ -67,39 +85,138 @@ BASE_SCHEMA = vol.Schema(
 class EcoDevicesConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a eco-devices config flow."""
 
-    VERSION = 2
+    VERSION = 3
 
     def __init__(self) -> None:
         """Initialize class variables."""
         self.base_input: dict[str, Any] = {}
+        self.discovery_input: dict[str, Any] = {}
+        # Results of the probes of the flow, by host
+        self.probes: dict[str, ProbeResult] = {}
+        self.probe: ProbeResult | None = None
 
     async def async_step_user(self, user_input=None) -> ConfigFlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["discovery", "manual"]
+        )
+
+    async def async_step_discovery(self, user_input=None) -> ConfigFlowResult:
+        """Search the Eco-Devices of a network or of a list of hosts."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                hosts = parse_hosts(user_input[CONF_HOSTS])
+            except ValueError:
+                errors[CONF_HOSTS] = "invalid_hosts"
+            else:
+                configured = self._async_current_ids()
+                self.probes = {
+                    probe.host: probe
+                    for probe in await async_discover(
+                        self.hass,
+                        hosts,
+                        user_input[CONF_PORT],
+                        user_input.get(CONF_USERNAME),
+                        user_input.get(CONF_PASSWORD),
+                    )
+                    if _unique_id(probe.host, probe.port) not in configured
+                }
+                if self.probes:
+                    self.discovery_input = user_input
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=self.add_suggested_values_to_schema(
+                DISCOVERY_SCHEMA, user_input
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(self, user_input=None) -> ConfigFlowResult:
+        """Select one of the Eco-Devices found."""
+        if user_input is not None:
+            self.probe = self.probes[user_input[CONF_HOST]]
+            return await self.async_step_manual()
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(
+                        {
+                            host: f"{host} ({probe.mac_address}, {probe.version})"
+                            for host, probe in self.probes.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+    async def async_step_manual(self, user_input=None) -> ConfigFlowResult:
+        """Set the connection settings and the inputs used."""
         errors: dict[str, str] = {}
         if user_input is None:
             return self.async_show_form(
-                step_id="user", data_schema=BASE_SCHEMA, errors=errors
+                step_id="manual",
+                data_schema=self.add_suggested_values_to_schema(
+                    BASE_SCHEMA, self._suggested_values()
+                ),
+                errors=errors,
             )
 
         entry = await self.async_set_unique_id(
-            "_".join([DOMAIN, user_input[CONF_HOST], str(user_input[CONF_PORT])])
+            _unique_id(user_input[CONF_HOST], user_input[CONF_PORT])
         )
 
         if entry:
             self._abort_if_unique_id_configured()
 
-        session = async_get_clientsession(self.hass, False)
-
-        errors = await _test_connection(session, user_input)
+        if (probe := self._cached_probe(user_input)) is None:
+            errors, probe = await _test_connection(self.hass, user_input)
 
         if errors:
             return self.async_show_form(
-                step_id="user", data_schema=BASE_SCHEMA, errors=errors
+                step_id="manual",
+                data_schema=self.add_suggested_values_to_schema(
+                    BASE_SCHEMA, user_input
+                ),
+                errors=errors,
             )
 
+        self.probe = probe
         self.base_input = user_input
         return await self.async_step_params()
 
+    def _suggested_values(self) -> dict[str, Any]:
+        """Return the settings of the Eco-Devices picked in the discovery."""
+        if (probe := self.probe) is None:
+            return {}
+        return {
+            CONF_HOST: probe.host,
+            CONF_PORT: probe.port,
+            CONF_USERNAME: self.discovery_input.get(CONF_USERNAME),
+            CONF_PASSWORD: self.discovery_input.get(CONF_PASSWORD),
+            CONF_T1_ENABLED: 1 in probe.teleinfo,
+            CONF_T2_ENABLED: 2 in probe.teleinfo,
+            CONF_C1_ENABLED: 1 in probe.meters,
+            CONF_C2_ENABLED: 2 in probe.meters,
+        }
+
+    def _cached_probe(self, user_input: dict[str, Any]) -> ProbeResult | None:
+        """Return the probe of the discovery if the settings did not change."""
+        probe = self.probes.get(user_input[CONF_HOST])
+        if (
+            probe is None
+            or probe.port != user_input[CONF_PORT]
+            or user_input.get(CONF_USERNAME) != self.discovery_input.get(CONF_USERNAME)
+            or user_input.get(CONF_PASSWORD) != self.discovery_input.get(CONF_PASSWORD)
+        ):
+            return None
+        return probe
+
     async def async_step_params(self, user_input=None) -> ConfigFlowResult:
         """Handle the param flow to customize the device accordly to enabled inputs."""
         if user_input is not None:
@@ -111,7 +228,11 @@ class EcoDevicesConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="params",
-            data_schema=vol.Schema(_get_params(self.base_input, {})),
+            data_schema=vol.Schema(
+                _get_params(
+                    self.base_input, {}, _price_periods(self.base_input, self.probe)
+                )
+            ),
         )
 
     @staticmethod
@@ -128,15 +249,15 @@ class EcoDevicesOptionsFlowHandler(OptionsFlow):
         """Initialize."""
         self.config_entry: ConfigEntry = config_entry
         self.base_input: dict[str, Any] = {}
+        self.probe: ProbeResult | None = None
 
     async def async_step_init(self, user_input) -> ConfigFlowResult:
         """Manage the options."""
         errors = {}
         if user_input is not None:
-            session = async_get_clientsession(self.hass, False)
             user_input[CONF_HOST] = self.config_entry.data[CONF_HOST]
             user_input[CONF_PORT] = self.config_entry.data[CONF_PORT]
-            errors = await _test_connection(session, user_input)
+            errors, self.probe = await _test_connection(self.hass, user_input)
             if not errors:
                 self.base_input = user_input
                 return await self.async_step_params()
@@ -151,6 +272,7 @@ class EcoDevicesOptionsFlowHandler(OptionsFlow):
         t2_enabled = options.get(CONF_T2_ENABLED, config.get(CONF_T2_ENABLED))
         c1_enabled = options.get(CONF_C1_ENABLED, config.get(CONF_C1_ENABLED))
         c2_enabled = options.get(CONF_C2_ENABLED, config.get(CONF_C2_ENABLED))
+        push = options.get(CONF_PUSH, config.get(CONF_PUSH, False))
 
         options_schema = {
             vol.Optional(CONF_USERNAME, default=username): str,
@@ -160,6 +282,7 @@ class EcoDevicesOptionsFlowHandler(OptionsFlow):
             vol.Required(CONF_T2_ENABLED, default=t2_enabled): bool,
             vol.Required(CONF_C1_ENABLED, default=c1_enabled): bool,
             vol.Required(CONF_C2_ENABLED, default=c2_enabled): bool,
+            vol.Required(CONF_PUSH, default=push): bool,
         }
 
         return self.async_show_form(
@@ -181,11 +304,11 @@ class EcoDevicesOptionsFlowHandler(OptionsFlow):
         base_params = {
             CONF_T1_TYPE: options.get(
                 CONF_T1_TYPE,
-                config.get(CONF_T1_TYPE, False),
+                config.get(CONF_T1_TYPE, CONF_TI_TYPE_AUTO),
             ),
             CONF_T2_TYPE: options.get(
                 CONF_T2_TYPE,
-                config.get(CONF_T2_TYPE, False),
+                config.get(CONF_T2_TYPE, CONF_TI_TYPE_AUTO),
             ),
             CONF_C1_DEVICE_CLASS: options.get(
                 CONF_C1_DEVICE_CLASS, config.get(CONF_C1_DEVICE_CLASS)
@@ -213,43 +336,92 @@ class EcoDevicesOptionsFlowHandler(OptionsFlow):
                 CONF_C2_TOTAL_UNIT_OF_MEASUREMENT,
                 config.get(CONF_C2_TOTAL_UNIT_OF_MEASUREMENT),
             ),
+            CONF_SAMPLING_WINDOW: options.get(
+                CONF_SAMPLING_WINDOW,
+                config.get(CONF_SAMPLING_WINDOW, DEFAULT_SAMPLING_WINDOW),
+            ),
+            CONF_SAMPLING_PERCENTILE: options.get(
+                CONF_SAMPLING_PERCENTILE,
+                config.get(CONF_SAMPLING_PERCENTILE, DEFAULT_SAMPLING_PERCENTILE),
+            ),
+            **{
+                key: options.get(key, config.get(key, 0))
+                for key in (
+                    *CONF_POWER_WRITE_POLICY,
+                    *CONF_METER_WRITE_POLICY,
+                    *map(price_key, TELEINFO_PERIODS),
+                )
+            },
         }
 
         return self.async_show_form(
             step_id="params",
-            data_schema=vol.Schema(_get_params(self.base_input, base_params)),
+            data_schema=vol.Schema(
+                _get_params(
+                    self.base_input,
+                    base_params,
+                    _price_periods(self.base_input, self.probe),
+                )
+            ),
         )
 
 
-async def _test_connection(session, user_input):
-    errors = {}
+def _unique_id(host: str, port: int) -> str:
+    return "_".join([DOMAIN, host, str(port)])
 
-    controller = EcoDevices(
-        user_input[CONF_HOST],
-        user_input[CONF_PORT],
-        user_input.get(CONF_USERNAME),
-        user_input.get(CONF_PASSWORD),
-        session=session,
-    )
+
+async def _test_connection(
+    hass: HomeAssistant, user_input
+) -> tuple[dict[str, str], ProbeResult | None]:
+    errors = {}
+    probe = None
 
     try:
-        await controller.get_info()
+        probe = await async_probe(
+            hass,
+            user_input[CONF_HOST],
+            user_input[CONF_PORT],
+            user_input.get(CONF_USERNAME),
+            user_input.get(CONF_PASSWORD),
+            request_timeout=HTTP_REQUEST_TIMEOUT,
+        )
     except EcoDevicesInvalidAuthError:
         errors["base"] = "invalid_auth"
     except EcoDevicesCannotConnectError:
         errors["base"] = "cannot_connect"
 
-    return errors
+    return errors, probe
+
+
+def _price_periods(base_input, probe: ProbeResult | None) -> tuple[TariffPeriod, ...]:
+    """Return the periods of the contracts the enabled teleinfo inputs reported.
+
+    All the periods are returned while no contract is known.
+    """
+    contracts = {
+        contract
+        for number, enabled in ((1, CONF_T1_ENABLED), (2, CONF_T2_ENABLED))
+        if base_input[enabled]
+        and probe is not None
+        and (contract := probe.teleinfo.get(number)) is not None
+    }
+    if not contracts:
+        return TELEINFO_PERIODS
+    return tuple(
+        period
+        for period in TELEINFO_PERIODS
+        if any(period in CONTRACT_PERIODS[contract] for contract in contracts)
+    )
 
 
-def _get_params(base_input, base_params):
+def _get_params(base_input, base_params, price_periods=()):
     params_schema = {}
     if base_input[CONF_T1_ENABLED]:
         params_schema.update(
             {
                 vol.Required(
                     CONF_T1_TYPE,
-                    default=base_params.get(CONF_T1_TYPE, CONF_TI_TYPE_BASE),
+                    default=base_params.get(CONF_T1_TYPE, CONF_TI_TYPE_AUTO),
                 ): vol.All(str, vol.Lower, vol.In(CONF_TI_TYPES)),
             }
         )
@@ -259,7 +431,7 @@ def _get_params(base_input, base_params):
             {
                 vol.Required(
                     CONF_T2_TYPE,
-                    default=base_params.get(CONF_T2_TYPE, CONF_TI_TYPE_BASE),
+                    default=base_params.get(CONF_T2_TYPE, CONF_TI_TYPE_AUTO),
                 ): vol.All(str, vol.Lower, vol.In(CONF_TI_TYPES)),
             }
         )
@@ -306,4 +478,36 @@ def _get_params(base_input, base_params):
             }
         )
 
+    if base_input[CONF_T1_ENABLED] or base_input[CONF_T2_ENABLED]:
+        params_schema.update(
+            {
+                vol.Required(
+                    CONF_SAMPLING_WINDOW,
+                    default=base_params.get(
+                        CONF_SAMPLING_WINDOW, DEFAULT_SAMPLING_WINDOW
+                    ),
+                ): vol.All(int, vol.Range(min=10)),
+                vol.Required(
+                    CONF_SAMPLING_PERCENTILE,
+                    default=base_params.get(
+                        CONF_SAMPLING_PERCENTILE, DEFAULT_SAMPLING_PERCENTILE
+                    ),
+                ): vol.All(int, vol.Range(min=1, max=100)),
+            }
+        )
+        params_schema.update(_get_floats(CONF_POWER_WRITE_POLICY, base_params))
+        params_schema.update(_get_floats(map(price_key, price_periods), base_params))
+
+    if base_input[CONF_C1_ENABLED] or base_input[CONF_C2_ENABLED]:
+        params_schema.update(_get_floats(CONF_METER_WRITE_POLICY, base_params))
+
     return params_schema
+
+
+def _get_floats(keys, base_params):
+    return {
+        vol.Required(key, default=base_params.get(key, 0)): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        )
+        for key in keys
+    }
@@ -2,8 +2,21 @@
 
 DOMAIN = "ecodevices"
 
+AGGREGATOR = "aggregator"
+COSTS = "costs"
+COST_STORE = "cost_store"
+CONFIG = "config"
 CONTROLLER = "controller"
 COORDINATOR = "coordinator"
+ENTITY_UPDATERS = "entity_updaters"
+RATES = "rates"
+SAMPLER = "sampler"
+TARIFFS = "tariffs"
+FLEET = "fleet"
+FLEET_MEMBER = "fleet_member"
+SESSIONS = "sessions"
+BREAKERS = "breakers"
+DEVICE_INFO_CACHE = "device_info_cache"
 PLATFORMS = ["binary_sensor", "sensor"]
 UNDO_UPDATE_LISTENER = "undo_update_listener"
 
@@ -21,20 +34,105 @@ CONF_C2_UNIT_OF_MEASUREMENT = "c2_unit_of_measurement"
 CONF_C2_DIVIDER_FACTOR = "c2_divider_factor"
 CONF_C2_TOTAL_UNIT_OF_MEASUREMENT = "c2_total_unit_of_measurement"
 CONF_C2_DEVICE_CLASS = "c2_device_class"
+CONF_PUSH = "push"
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_POWER_DEADBAND_PERCENT = "power_deadband_percent"
+CONF_POWER_MIN_INTERVAL = "power_min_interval"
+CONF_POWER_MAX_INTERVAL = "power_max_interval"
+CONF_METER_DEADBAND = "meter_deadband"
+CONF_METER_DEADBAND_PERCENT = "meter_deadband_percent"
+CONF_METER_MIN_INTERVAL = "meter_min_interval"
+CONF_METER_MAX_INTERVAL = "meter_max_interval"
+CONF_SAMPLING_WINDOW = "sampling_window"
+CONF_SAMPLING_PERCENTILE = "sampling_percentile"
+# Price per kWh of a tariff period, followed by the period (price_hc)
+CONF_PRICE_PREFIX = "price_"
+CONF_POWER_WRITE_POLICY = (
+    CONF_POWER_DEADBAND,
+    CONF_POWER_DEADBAND_PERCENT,
+    CONF_POWER_MIN_INTERVAL,
+    CONF_POWER_MAX_INTERVAL,
+)
+CONF_METER_WRITE_POLICY = (
+    CONF_METER_DEADBAND,
+    CONF_METER_DEADBAND_PERCENT,
+    CONF_METER_MIN_INTERVAL,
+    CONF_METER_MAX_INTERVAL,
+)
 
 DEFAULT_T1_NAME = "Teleinfo 1"
 DEFAULT_T2_NAME = "Teleinfo 2"
 DEFAULT_C1_NAME = "Meter 1"
 DEFAULT_C2_NAME = "Meter 2"
+DEFAULT_PORT = 80
 DEFAULT_SCAN_INTERVAL = 5
+POLLING_BACKOFF_FACTOR = 2
+POLLING_MAX_INTERVAL = 60
+FLEET_MAX_CONCURRENT_POLLS = 4
+PUSH_RECONCILE_INTERVAL = 300
+DEFAULT_SAMPLING_WINDOW = 300
+DEFAULT_SAMPLING_PERCENTILE = 95
+SAMPLING_BUFFER_SIZE = 1024
+RATE_SMOOTHING_TIME = 300
+DISCOVERY_MAX_CONCURRENT_PROBES = 32
+DISCOVERY_MAX_HOSTS = 256
+DISCOVERY_PROBE_TIMEOUT = 3
+DISCOVERY_TIMEOUT = 30
 
+AGGREGATION_HOURS = 48
+AGGREGATION_DAYS = 35
+
+STORAGE_VERSION = 1
+STORAGE_KEY_DEVICE_INFO = f"{DOMAIN}.device_info"
+STORAGE_SAVE_DELAY = 10
+STORAGE_KEY_COSTS = f"{DOMAIN}.costs"
+COST_SAVE_DELAY = 60
+
+EVENT_TARIFF_CHANGED = f"{DOMAIN}_tariff_changed"
+EVENT_COLOR_TOMORROW_CHANGED = f"{DOMAIN}_color_tomorrow_changed"
+
+SOURCE_STATUS = "status"
+SOURCE_TELEINFO_1 = "teleinfo1"
+SOURCE_TELEINFO_2 = "teleinfo2"
+
+HTTP_CONNECTIONS_PER_HOST = 2
+HTTP_KEEPALIVE_TIMEOUT = POLLING_MAX_INTERVAL + 15
+HTTP_DNS_CACHE_TTL = 300
+HTTP_CONNECT_TIMEOUT = 3
+HTTP_READ_TIMEOUT = 5
+HTTP_REQUEST_TIMEOUT = 10
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_DELAY = 15
+BREAKER_MAX_DELAY = 900
+BREAKER_JITTER = 0.2
+BREAKER_PROBE_TIMEOUT = HTTP_CONNECT_TIMEOUT
+
+INSTRUMENTATION_BUFFER_SIZE = 100
+
+# Wh per second of a 100 kW installation, above the largest teleinfo contracts
+COUNTER_TELEINFO_MAX_RATE = 100_000 / 3600
+COUNTER_RESET_CONFIRMATIONS = 3
+# Diagnostic counters of the index sensors, not worth a recorder row each
+COUNTER_UNRECORDED_ATTR = frozenset(
+    {"rejected_zero", "rejected_decrease", "rejected_spike", "resets"}
+)
+
+LOG_BURST = 3
+LOG_REFILL_PERIOD = 600
+LOG_SUMMARY_INTERVAL = 3600
+
+CONF_TI_TYPE_AUTO = "auto"
 CONF_TI_TYPE_BASE = "base"
 CONF_TI_TYPE_HCHP = "hchp"
 CONF_TI_TYPE_TEMPO = "tempo"
+CONF_TI_TYPE_EJP = "ejp"
 CONF_TI_TYPES = [
+    CONF_TI_TYPE_AUTO,
     CONF_TI_TYPE_BASE,
     CONF_TI_TYPE_HCHP,
     CONF_TI_TYPE_TEMPO,
+    CONF_TI_TYPE_EJP,
 ]
 
 TELEINFO_EXTRA_ATTR = {
@@ -72,6 +170,27 @@ TELEINFO_EXTRA_ATTR = {
     "index_heures_pleines_jour_rouge": "BBRHPJR",
     "type_heures_demain": "DEMAIN",
 }
+# Static contract identity, the apparent power already stored as the state and
+# the phase currents, stored by their own sensors
+TELEINFO_UNRECORDED_ATTR = frozenset(
+    {
+        "numero_compteur",
+        "option_tarifaire",
+        "souscription",
+        "groupe_horaire",
+        "puissance_apparente",
+        "intensite_max_ph1",
+        "intensite_max_ph2",
+        "intensite_max_ph3",
+        "intensite_now_ph1",
+        "intensite_now_ph2",
+        "intensite_now_ph3",
+    }
+)
+TELEINFO_EJP_ATTR = {
+    "Heures Normales": "EJPHN",
+    "Heures Pointe Mobile": "EJPHPM",
+}
 TELEINFO_TEMPO_ATTR = {
     "Jour Bleu HC": "BBRHCJB",
     "Jour Bleu HP": "BBRHPJB",
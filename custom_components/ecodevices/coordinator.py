@@ -0,0 +1,323 @@
+"""Data update coordinator for the GCE Eco-Devices."""
+
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+from typing import Any
+
+from pyecodevices import EcoDevicesCannotConnectError, EcoDevicesInvalidAuthError
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import EcoDevicesClient
+from .breaker import BreakerState, CircuitBreaker
+from .const import (
+    BREAKER_PROBE_TIMEOUT,
+    DOMAIN,
+    POLLING_BACKOFF_FACTOR,
+    POLLING_MAX_INTERVAL,
+    PUSH_RECONCILE_INTERVAL,
+    SOURCE_STATUS,
+    SOURCE_TELEINFO_1,
+    SOURCE_TELEINFO_2,
+)
+from .instrumentation import PollInstrumentation, PollRecord
+from .log import LogAggregator
+from .snapshot import EcoDevicesSnapshot, detect_contract, detect_three_phase
+
+_LOGGER = logging.getLogger(__name__)
+_LOG = LogAggregator(_LOGGER)
+
+
+class EcoDevicesCoordinator(DataUpdateCoordinator[EcoDevicesSnapshot]):
+    """Poll the Eco-Devices, backing off while its values do not move.
+
+    The refreshes are scheduled by the fleet at the poll interval, the
+    coordinator does not run its own timer. In push mode, the values sent by
+    the Eco-Devices update the data as they arrive and the polls only
+    reconcile it at a slow fixed interval.
+
+    The contract of the teleinfo inputs is detected from the values they
+    report, unless it was chosen in the options, and only its indexes are
+    parsed. So are the three-phase meters, whose phases are parsed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        controller: EcoDevicesClient,
+        scan_interval: int,
+        teleinfo_inputs: tuple[int, ...],
+        meter_inputs: tuple[int, ...],
+        push: bool = False,
+        breaker: CircuitBreaker | None = None,
+        info_listener: Callable[["EcoDevicesCoordinator"], None] | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        The info listener is called with the coordinator once the device
+        information was read from the Eco-Devices, on the first successful
+        poll, and whenever a detected contract or three-phase meter changes.
+        """
+        super().__init__(hass, _LOGGER, config_entry=config_entry, name=DOMAIN)
+        self.controller = controller
+        self.push = push
+        self.pushes = 0
+        self.async_set_scan_interval(scan_interval)
+        self.contracts: dict[int, str] = {}
+        self.detected_contracts: dict[int, str] = {}
+        self.three_phase_inputs: tuple[int, ...] = ()
+        self._configured_contracts: dict[int, str] = {}
+        self._optarifs: dict[int, Any] = {}
+        self.async_set_inputs(teleinfo_inputs, meter_inputs)
+        self.generation = 0
+        self.instrumentation = PollInstrumentation()
+        self.breaker = breaker or CircuitBreaker()
+        self.device_info: DeviceInfo | None = None
+        self._info_needed = True
+        self._info_listener = info_listener
+        self._log_key = f"{controller.host}:{controller.port} poll"
+
+    @callback
+    def async_set_scan_interval(self, scan_interval: int) -> None:
+        """Set the fastest poll interval, the backoff starts over from it."""
+        if self.push:
+            scan_interval = PUSH_RECONCILE_INTERVAL
+        self.poll_interval = timedelta(seconds=scan_interval)
+        self.min_interval = timedelta(seconds=scan_interval)
+        self.max_interval = timedelta(
+            seconds=(
+                scan_interval if self.push else max(scan_interval, POLLING_MAX_INTERVAL)
+            )
+        )
+
+    @callback
+    def async_set_inputs(
+        self, teleinfo_inputs: tuple[int, ...], meter_inputs: tuple[int, ...]
+    ) -> None:
+        """Set the enabled inputs, applied from the next refresh."""
+        self.teleinfo_inputs = teleinfo_inputs
+        self.meter_inputs = meter_inputs
+        self.sources = _get_sources(teleinfo_inputs, meter_inputs)
+        self._watched_keys: tuple[str, ...] | None = None
+        self._watched_values: tuple[Any, ...] | None = None
+        self._update_contracts()
+
+    @callback
+    def async_set_contracts(self, configured: dict[int, str]) -> None:
+        """Set the contracts chosen in the options, the others are detected."""
+        self._configured_contracts = configured
+        self._update_contracts()
+
+    def restore_detected(
+        self, contracts: dict[int, str], three_phase_inputs: tuple[int, ...]
+    ) -> None:
+        """Set the contracts and three-phase meters detected before, from the cache."""
+        self.detected_contracts = contracts
+        self.three_phase_inputs = three_phase_inputs
+        self._update_contracts()
+
+    def _update_contracts(self) -> None:
+        """Set the contracts of the enabled teleinfo inputs."""
+        self.contracts = {
+            number: contract
+            for number in self.teleinfo_inputs
+            if (
+                contract := self._configured_contracts.get(
+                    number, self.detected_contracts.get(number)
+                )
+            )
+            is not None
+        }
+
+    def _detect_teleinfo(self, data: dict[str, Any]) -> bool:
+        """Detect the contracts and three-phase meters, return True if one changed."""
+        changed = self._detect_contracts(data)
+        three_phase_inputs = tuple(
+            number
+            for number in self.teleinfo_inputs
+            if detect_three_phase(data, number)
+        )
+        if three_phase_inputs != self.three_phase_inputs:
+            _LOGGER.info(
+                "Three-phase teleinfo inputs of %s: %s",
+                self.controller.host,
+                three_phase_inputs,
+            )
+            self.three_phase_inputs = three_phase_inputs
+            changed = True
+        return changed
+
+    def _detect_contracts(self, data: dict[str, Any]) -> bool:
+        """Detect the contracts from the values, return True if one changed.
+
+        The detection runs again only when the OPTARIF field changes.
+        """
+        changed = False
+        for number in self.teleinfo_inputs:
+            if number in self._configured_contracts:
+                continue
+            optarif = data.get(f"T{number}_OPTARIF")
+            if (
+                number in self._optarifs
+                and self._optarifs[number] == optarif
+                and number in self.detected_contracts
+            ):
+                continue
+            self._optarifs[number] = optarif
+            contract = detect_contract(data, number)
+            if contract is None or contract == self.detected_contracts.get(number):
+                continue
+            _LOGGER.info(
+                "Teleinfo %s of %s has the %s contract",
+                number,
+                self.controller.host,
+                contract,
+            )
+            self.detected_contracts = {**self.detected_contracts, number: contract}
+            changed = True
+        if changed:
+            self._update_contracts()
+        return changed
+
+    async def _async_update_data(self) -> EcoDevicesSnapshot:
+        """Fetch data from API."""
+        if not self.breaker.allow_request():
+            raise UpdateFailed(
+                f"Eco-Devices unreachable, next try in {self.breaker.retry_in:.0f} s"
+            )
+
+        sources = self.sources
+        if self._info_needed and SOURCE_STATUS not in sources:
+            # The device information comes from the status, fetched along
+            sources = (SOURCE_STATUS, *sources)
+        record = self.instrumentation.start(sources)
+        try:
+            if (
+                self.breaker.state is BreakerState.HALF_OPEN
+                and SOURCE_STATUS not in sources
+            ):
+                # Cheap health probe before requesting the teleinfo documents
+                await self.controller.get_sources(
+                    (SOURCE_STATUS,), record, BREAKER_PROBE_TIMEOUT
+                )
+            data = await self.controller.get_sources(sources, record)
+        except EcoDevicesInvalidAuthError as err:
+            self._device_reachable()
+            self._poll_failed(record, err)
+            raise UpdateFailed("Authentication error on Eco-Devices") from err
+        except EcoDevicesCannotConnectError as err:
+            if self.breaker.record_failure():
+                self.poll_interval = timedelta(seconds=self.breaker.delay)
+            self._poll_failed(record, err)
+            raise UpdateFailed("Failed to communicating with API") from err
+
+        notify = self._info_needed
+        if self._info_needed:
+            self.controller.update_info(data)
+            self._info_needed = False
+        if self._detect_teleinfo(data):
+            notify = True
+        if notify and self._info_listener is not None:
+            self._info_listener(self)
+        self._device_reachable()
+        if self.instrumentation.consecutive_failures:
+            # Back online, report what was suppressed while the device was down
+            _LOG.flush()
+        self.instrumentation.succeeded()
+        self.generation += 1
+        self._adapt_poll_interval(data)
+        return EcoDevicesSnapshot(
+            data,
+            self.generation,
+            self.teleinfo_inputs,
+            self.meter_inputs,
+            self.contracts,
+            self.three_phase_inputs,
+            self.data,
+        )
+
+    @callback
+    def async_push(self, values: dict[str, str]) -> None:
+        """Merge the values pushed by the Eco-Devices into the data."""
+        if self.data is None:
+            return
+        self._device_reachable()
+        self.pushes += 1
+        self.generation += 1
+        self.async_set_updated_data(
+            EcoDevicesSnapshot(
+                {**self.data.raw, **values},
+                self.generation,
+                self.teleinfo_inputs,
+                self.meter_inputs,
+                self.contracts,
+                self.three_phase_inputs,
+                self.data,
+            )
+        )
+
+    def _device_reachable(self) -> None:
+        """Close the breaker, back to the fastest interval if it was open."""
+        if self.breaker.record_success():
+            _LOGGER.info("Eco-Devices %s is reachable again", self.controller.host)
+            self.poll_interval = self.min_interval
+
+    def _poll_failed(self, record: PollRecord, err: Exception) -> None:
+        """Record a failed poll and log it, rate-limited per device."""
+        self.instrumentation.failed(record, err)
+        _LOG.warning(
+            self._log_key,
+            "Poll %s of %s failed, breaker %s: %s",
+            self.instrumentation.consecutive_failures,
+            self.controller.host,
+            self.breaker.state,
+            err,
+        )
+
+    def _adapt_poll_interval(self, data: dict[str, Any]) -> None:
+        """Poll fast while power or meters move, back off exponentially otherwise."""
+        if self._watched_keys is None:
+            self._watched_keys = tuple(
+                key for key in data if key.endswith("_PAPP") or key.startswith("meter")
+            )
+        values = tuple(data.get(key) for key in self._watched_keys)
+
+        if values != self._watched_values:
+            interval = self.min_interval
+        else:
+            interval = min(
+                self.poll_interval * POLLING_BACKOFF_FACTOR, self.max_interval
+            )
+        self._watched_values = values
+
+        if interval != self.poll_interval:
+            _LOGGER.debug(
+                "Set poll interval of %s to %s",
+                self.controller.host,
+                interval,
+            )
+            self.poll_interval = interval
+
+
+def _get_sources(
+    teleinfo_inputs: tuple[int, ...], meter_inputs: tuple[int, ...]
+) -> tuple[str, ...]:
+    """Return the data sources needed by the enabled inputs.
+
+    The meters are in the status document, each teleinfo input has its own
+    document. The status is still polled when no input is enabled, to follow
+    the availability of the device.
+    """
+    sources = []
+    if meter_inputs or not teleinfo_inputs:
+        sources.append(SOURCE_STATUS)
+    if 1 in teleinfo_inputs:
+        sources.append(SOURCE_TELEINFO_1)
+    if 2 in teleinfo_inputs:
+        sources.append(SOURCE_TELEINFO_2)
+    return tuple(sources)
@@ -0,0 +1,237 @@
+"""Cost of the teleinfo consumption per tariff period, from the option prices."""
+
+from collections.abc import Mapping
+from datetime import date, datetime
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_PRICE_PREFIX,
+    COST_SAVE_DELAY,
+    COST_STORE,
+    COUNTER_TELEINFO_MAX_RATE,
+    DOMAIN,
+    STORAGE_KEY_COSTS,
+    STORAGE_VERSION,
+)
+from .coordinator import EcoDevicesCoordinator
+from .counter import MonotonicCounter
+from .snapshot import TELEINFO_PERIODS, EcoDevicesSnapshot, TariffPeriod
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def price_key(period: TariffPeriod) -> str:
+    """Return the option of the price of a tariff period."""
+    return f"{CONF_PRICE_PREFIX}{period}"
+
+
+def get_prices(config: Mapping[str, Any]) -> dict[TariffPeriod, float]:
+    """Return the prices per kWh set in the options, by tariff period."""
+    return {
+        period: float(price)
+        for period in TELEINFO_PERIODS
+        if (price := config.get(price_key(period)))
+    }
+
+
+class PeriodCost:
+    """Cost of the index of a tariff period, in total, today and this month.
+
+    The readings go through a monotonic counter, each accepted increase adds
+    its cost, so nothing is computed again from the history.
+    """
+
+    __slots__ = ("_counter", "day", "month", "total")
+
+    def __init__(self, state: list[float | None] | None = None) -> None:
+        """Initialize the cost, from its stored state if any."""
+        self._counter = MonotonicCounter(COUNTER_TELEINFO_MAX_RATE)
+        index, self.total, self.day, self.month = state or (None, 0.0, 0.0, 0.0)
+        self._counter.restore(index)
+
+    def add(self, reading: float | None, price: float) -> bool:
+        """Add the cost of the increase since the last reading, in Wh."""
+        previous = self._counter.value
+        if self._counter.update(reading) is not None:
+            return False
+        if previous is None:
+            # First reading, the base of the next increases
+            return True
+        if (delta := self._counter.value - previous) <= 0:
+            return False
+        cost = delta / 1000 * price
+        self.total += cost
+        self.day += cost
+        self.month += cost
+        return True
+
+    def state(self) -> list[float | None]:
+        """Return the state to store."""
+        return [self._counter.value, self.total, self.day, self.month]
+
+
+class CostEngine:
+    """Cost of the teleinfo indexes of an Eco-Devices, per tariff period.
+
+    The engine follows the coordinator updates from a listener, the cost
+    sensors only read it, and only the periods with a price are accounted.
+    The costs of the day and of the month start over at local midnight.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: EcoDevicesCoordinator,
+        store: "CostStore",
+        prices: dict[TariffPeriod, float],
+    ) -> None:
+        """Initialize the engine from the stored costs."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self.prices = prices
+        self._store = store
+        self._generation: int | None = None
+        self.costs: dict[tuple[int, TariffPeriod], PeriodCost] = {}
+        stored = store.get(entry.entry_id) or {}
+        self.day = dt_util.now().date()
+        if "day" in stored:
+            self.day = date.fromisoformat(stored["day"])
+        for key, state in stored.get("costs", {}).items():
+            number, period = key.split("_", 1)
+            self.costs[int(number), TariffPeriod(period)] = PeriodCost(state)
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the coordinator updates, return the stop callback."""
+        return self.coordinator.async_add_listener(self._async_handle_update)
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Account the new readings, even if no cost sensor reads them."""
+        self.update(self.coordinator.data)
+
+    def update(self, snapshot: EcoDevicesSnapshot | None) -> None:
+        """Add the cost of the indexes of a new snapshot."""
+        if snapshot is None or snapshot.generation == self._generation:
+            return
+        self._generation = snapshot.generation
+        changed = self._start_period(dt_util.now().date())
+        prices = self.prices
+        for number, teleinfo in snapshot.teleinfo.items():
+            for period, reading in zip(TELEINFO_PERIODS, teleinfo.indexes()):
+                if reading is None or (price := prices.get(period)) is None:
+                    continue
+                if (cost := self.costs.get((number, period))) is None:
+                    cost = self.costs[number, period] = PeriodCost()
+                changed |= cost.add(reading, price)
+        if changed:
+            self._store.async_set(self.entry.entry_id, self.state())
+
+    def _start_period(self, today: date) -> bool:
+        """Start a new day, and month, return True if it changed."""
+        if today == self.day:
+            return False
+        _LOGGER.debug("Start the costs of %s for %s", today, self.entry.title)
+        new_month = (today.year, today.month) != (self.day.year, self.day.month)
+        for cost in self.costs.values():
+            cost.day = 0.0
+            if new_month:
+                cost.month = 0.0
+        self.day = today
+        return True
+
+    def last_reset(self, month: bool) -> datetime:
+        """Return when the costs of the day, or of the month, started over."""
+        return dt_util.start_of_local_day(
+            self.day.replace(day=1) if month else self.day
+        )
+
+    def input_costs(self, number: int) -> dict[TariffPeriod, PeriodCost]:
+        """Return the costs of the priced periods of a teleinfo input."""
+        return {
+            period: cost
+            for (input_number, period), cost in self.costs.items()
+            if input_number == number and period in self.prices
+        }
+
+    def state(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {
+            "day": self.day.isoformat(),
+            "costs": {
+                f"{number}_{period}": cost.state()
+                for (number, period), cost in self.costs.items()
+            },
+        }
+
+
+class CostStore:
+    """Costs of all the config entries, in a single store.
+
+    The store is saved at most every COST_SAVE_DELAY seconds while the costs
+    move, and when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_COSTS
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        """Load the stored costs."""
+        self._data = await self._store.async_load() or {}
+
+    def get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the stored costs of a config entry."""
+        return self._data.get(entry_id)
+
+    @callback
+    def async_set(self, entry_id: str, state: dict[str, Any]) -> None:
+        """Set the costs of a config entry, saved with the next write."""
+        self._data[entry_id] = state
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the costs of a removed config entry."""
+        if self._data.pop(entry_id, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a write, unless one is already pending."""
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, COST_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write, the next change schedules a new write."""
+        self._save_scheduled = False
+        return self._data
+
+
+async def async_get_cost_store(hass: HomeAssistant) -> CostStore:
+    """Return the cost store, loaded once for all the entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (task := domain_data.get(COST_STORE)) is None:
+        store = CostStore(hass)
+        task = domain_data[COST_STORE] = hass.async_create_task(_async_load(store))
+    return await task
+
+
+async def _async_load(store: CostStore) -> CostStore:
+    """Load and return the store."""
+    await store.async_load()
+    return store
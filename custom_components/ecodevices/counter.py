@@ -0,0 +1,113 @@
+"""Validation of the ever-increasing indexes of the Eco-Devices."""
+
+from enum import StrEnum
+import time
+from typing import Any
+
+from .const import COUNTER_RESET_CONFIRMATIONS
+
+
+class Rejection(StrEnum):
+    """Reason of a rejected counter reading."""
+
+    ZERO = "zero"
+    DECREASE = "decrease"
+    SPIKE = "spike"
+
+
+class MonotonicCounter:
+    """Filter the readings of an index, keeping the last accepted value.
+
+    A missing or null reading is a glitch. A reading lower than the value, or
+    higher than the maximum rate allows since the last accepted reading, is
+    rejected until it is confirmed by COUNTER_RESET_CONFIRMATIONS consistent
+    readings, then accepted as a meter replacement, a rollover or a legitimate
+    jump after a long outage.
+    """
+
+    __slots__ = (
+        "_confirmations",
+        "_last_accepted",
+        "_max_rate",
+        "_pending",
+        "_pending_count",
+        "_pending_time",
+        "rejections",
+        "resets",
+        "value",
+    )
+
+    def __init__(
+        self,
+        max_rate: float | None = None,
+        confirmations: int = COUNTER_RESET_CONFIRMATIONS,
+    ) -> None:
+        """Initialize the counter, max_rate being the maximum units per second."""
+        self._max_rate = max_rate
+        self._confirmations = confirmations
+        self.value: float | None = None
+        self.rejections = dict.fromkeys(Rejection, 0)
+        self.resets = 0
+        self._last_accepted: float | None = None
+        self._pending: float | None = None
+        self._pending_count = 0
+        self._pending_time = 0.0
+
+    def restore(self, value: float | None) -> None:
+        """Restore the last value, its time is unknown so any increase is valid."""
+        if value is not None and value > 0:
+            self.value = value
+
+    def _plausible(self, start: float, start_time: float | None, end: float) -> bool:
+        """Return True if the increase from start to end is possible in time."""
+        if end < start:
+            return False
+        if self._max_rate is None or start_time is None:
+            return True
+        # One unit of margin for the rounding of the indexes
+        return end - start <= self._max_rate * (time.monotonic() - start_time) + 1
+
+    def update(self, reading: float | None) -> Rejection | None:
+        """Validate a new reading, return the reason if it is rejected."""
+        if reading is None or reading <= 0:
+            self.rejections[Rejection.ZERO] += 1
+            return Rejection.ZERO
+
+        if self.value is None or self._plausible(
+            self.value, self._last_accepted, reading
+        ):
+            self._accept(reading)
+            return None
+
+        rejection = Rejection.DECREASE if reading < self.value else Rejection.SPIKE
+        if self._pending is not None and self._plausible(
+            self._pending, self._pending_time, reading
+        ):
+            self._pending_count += 1
+        else:
+            self._pending_count = 1
+        self._pending = reading
+        self._pending_time = time.monotonic()
+
+        if self._pending_count >= self._confirmations:
+            self.resets += 1
+            self._accept(reading)
+            return None
+        self.rejections[rejection] += 1
+        return rejection
+
+    def _accept(self, reading: float) -> None:
+        """Set the value from an accepted reading."""
+        self.value = reading
+        self._last_accepted = time.monotonic()
+        self._pending = None
+        self._pending_count = 0
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the rejection and reset counters."""
+        return {
+            **{
+                f"rejected_{reason}": count for reason, count in self.rejections.items()
+            },
+            "resets": self.resets,
+        }
@@ -0,0 +1,65 @@
+"""Diagnostics support for the GCE Eco-Devices."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .aggregation import EnergyAggregator
+from .const import AGGREGATOR, COORDINATOR, COSTS, DOMAIN, FLEET_MEMBER, TARIFFS
+from .coordinator import EcoDevicesCoordinator
+from .cost import CostEngine
+from .fleet import FleetMember
+from .tariff import TariffTracker
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EcoDevicesCoordinator = data[COORDINATOR]
+    fleet_member: FleetMember = data[FLEET_MEMBER]
+    aggregator: EnergyAggregator = data[AGGREGATOR]
+    tariffs: TariffTracker = data[TARIFFS]
+    costs: CostEngine = data[COSTS]
+    instrumentation = coordinator.instrumentation
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "device": {
+            "version": coordinator.controller.version,
+            "sources": coordinator.sources,
+            "contracts": coordinator.contracts,
+            "detected_contracts": coordinator.detected_contracts,
+            "three_phase_inputs": coordinator.three_phase_inputs,
+        },
+        "polling": {
+            "interval": coordinator.poll_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "generation": coordinator.generation,
+            "push": coordinator.push,
+            "pushes": coordinator.pushes,
+            "fleet": fleet_member.statistics(),
+            "breaker": {
+                "state": coordinator.breaker.state,
+                "failures": coordinator.breaker.failures,
+                "opens": coordinator.breaker.opens,
+                "retry_in": coordinator.breaker.retry_in,
+            },
+        },
+        "instrumentation": {
+            "summary": instrumentation.summary(),
+            "polls": [record.as_dict() for record in instrumentation.records],
+        },
+        "statistics": aggregator.statistics(),
+        "tariffs": tariffs.statistics(),
+        "costs": costs.state(),
+    }
@@ -0,0 +1,170 @@
+"""Discovery of the Eco-Devices of a network, for the config flow."""
+
+import asyncio
+from dataclasses import dataclass
+from ipaddress import ip_network
+import logging
+
+import aiohttp
+from pyecodevices import EcoDevicesCannotConnectError, EcoDevicesInvalidAuthError
+
+from homeassistant.core import HomeAssistant
+
+from .api import (
+    EcoDevicesClient,
+    async_get_host_session,
+    async_release_host_session,
+    create_session,
+)
+from .const import (
+    DISCOVERY_MAX_CONCURRENT_PROBES,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_PROBE_TIMEOUT,
+    DISCOVERY_TIMEOUT,
+    DOMAIN,
+    SESSIONS,
+    SOURCE_STATUS,
+    SOURCE_TELEINFO_1,
+    SOURCE_TELEINFO_2,
+)
+from .snapshot import MeterSnapshot, detect_contract
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """What an Eco-Devices reported when probed."""
+
+    host: str
+    port: int
+    mac_address: str
+    version: str
+    teleinfo: dict[int, str]
+    meters: tuple[int, ...]
+
+
+def parse_hosts(text: str) -> list[str]:
+    """Return the hosts of a list of networks, addresses and host names.
+
+    Raise ValueError if a network is invalid or if there are too many hosts.
+    """
+    hosts: list[str] = []
+    for item in text.replace(",", " ").split():
+        if "/" in item:
+            network = ip_network(item, strict=False)
+            if network.num_addresses > DISCOVERY_MAX_HOSTS:
+                raise ValueError(f"Too many hosts in {item}")
+            hosts.extend(str(address) for address in network.hosts())
+        elif item not in hosts:
+            hosts.append(item)
+        if len(hosts) > DISCOVERY_MAX_HOSTS:
+            raise ValueError("Too many hosts")
+    return hosts
+
+
+async def async_probe(
+    hass: HomeAssistant,
+    host: str,
+    port: int,
+    username: str | None = None,
+    password: str | None = None,
+    request_timeout: float = DISCOVERY_PROBE_TIMEOUT,
+    session: aiohttp.ClientSession | None = None,
+) -> ProbeResult:
+    """Return what an Eco-Devices reports, with a short timeout per request.
+
+    The requests go through the given session, or else the keep-alive
+    session of the host, shared with the entry of an Eco-Devices already
+    configured at this address.
+
+    Raise EcoDevicesCannotConnectError if nothing answers or if it is not an
+    Eco-Devices, EcoDevicesInvalidAuthError if the credentials are refused.
+    """
+    controller = EcoDevicesClient(
+        host,
+        port,
+        username,
+        password,
+        request_timeout=request_timeout,
+        session=session or async_get_host_session(hass, host),
+    )
+    try:
+        data = await controller.get_sources((SOURCE_STATUS,))
+        if "config_mac" not in data:
+            raise EcoDevicesCannotConnectError(f"{host}:{port} is not an Eco-Devices")
+        data.update(
+            await controller.get_sources((SOURCE_TELEINFO_1, SOURCE_TELEINFO_2))
+        )
+    finally:
+        if session is None:
+            await async_release_host_session(hass, host)
+    return ProbeResult(
+        host=host,
+        port=port,
+        mac_address=data["config_mac"],
+        version=data.get("version", ""),
+        teleinfo={
+            number: contract
+            for number in (1, 2)
+            if (contract := detect_contract(data, number)) is not None
+        },
+        meters=tuple(number for number in (1, 2) if MeterSnapshot(data, number).total),
+    )
+
+
+async def async_discover(
+    hass: HomeAssistant,
+    hosts: list[str],
+    port: int,
+    username: str | None = None,
+    password: str | None = None,
+) -> list[ProbeResult]:
+    """Probe the hosts, a few at a time, and return the Eco-Devices found.
+
+    The hosts not probed within DISCOVERY_TIMEOUT seconds are given up, so a
+    large network does not hold the config flow. The hosts without a session,
+    not configured, are probed through a session closed after the scan.
+    """
+    semaphore = asyncio.Semaphore(DISCOVERY_MAX_CONCURRENT_PROBES)
+    host_sessions = hass.data.get(DOMAIN, {}).get(SESSIONS, {})
+    scan_session = create_session()
+
+    async def _async_probe(host: str) -> ProbeResult | None:
+        async with semaphore:
+            try:
+                return await async_probe(
+                    hass,
+                    host,
+                    port,
+                    username,
+                    password,
+                    session=None if host in host_sessions else scan_session,
+                )
+            except EcoDevicesInvalidAuthError:
+                _LOGGER.info("Eco-Devices %s:%s needs credentials", host, port)
+            except EcoDevicesCannotConnectError:
+                pass
+            return None
+
+    tasks = [asyncio.create_task(_async_probe(host)) for host in hosts]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=DISCOVERY_TIMEOUT)
+        if pending:
+            _LOGGER.info(
+                "Discovery stopped after %s s, %s hosts not probed",
+                DISCOVERY_TIMEOUT,
+                len(pending),
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
+    finally:
+        await scan_session.close()
+    found = [
+        result
+        for task in tasks
+        if not task.cancelled() and (result := task.result()) is not None
+    ]
+    _LOGGER.debug("Found %s Eco-Devices out of %s hosts", len(found), len(hosts))
+    return found
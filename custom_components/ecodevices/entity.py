@@ -1,10 +1,19 @@
 """Generic entity for EcoDevices."""
 
+from collections.abc import Callable
+from typing import Any
+
 from pyecodevices import EcoDevices
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, ENTITY_UPDATERS
+from .coordinator import EcoDevicesCoordinator
 
 
 def get_device_info(controller: EcoDevices) -> DeviceInfo:
@@ -18,3 +27,92 @@ def get_device_info(controller: EcoDevices) -> DeviceInfo:
         connections={(CONNECTION_NETWORK_MAC, controller.mac_address)},
         configuration_url=f"http://{controller.host}:{controller.port}",
     )
+
+
+@callback
+def async_add_entry_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    build_entities: Callable[[HomeAssistant, ConfigEntry], list[Entity]],
+) -> None:
+    """Add the entities of a platform, then keep them in line with the options.
+
+    On an options update, the entities are built again from the new options:
+    only the ones which appeared, disappeared or are built differently are
+    added or removed, the others are kept as they are.
+    """
+    entities = {entity.unique_id: entity for entity in build_entities(hass, entry)}
+    async_add_entities(list(entities.values()))
+
+    async def _async_update_entities() -> None:
+        nonlocal entities
+        built = {entity.unique_id: entity for entity in build_entities(hass, entry)}
+        for unique_id, entity in entities.items():
+            if (new_entity := built.get(unique_id)) is not None and _settings(
+                entity
+            ) == _settings(new_entity):
+                built[unique_id] = entity
+            elif entity.hass is not None:
+                await entity.async_remove()
+        added = [
+            entity
+            for unique_id, entity in built.items()
+            if entities.get(unique_id) is not entity
+        ]
+        entities = built
+        if added:
+            async_add_entities(added)
+
+    hass.data[DOMAIN][entry.entry_id][ENTITY_UPDATERS].append(_async_update_entities)
+
+
+def _settings(entity: Entity) -> tuple[Any, ...]:
+    """Return what an entity is built from."""
+    return (type(entity), getattr(entity, "settings", None))
+
+
+class EcoDevicesEntity(CoordinatorEntity[EcoDevicesCoordinator]):
+    """Coordinator entity writing its state only when its data changed."""
+
+    _data_keys: tuple[str, ...] = ()
+    _last_fingerprint: tuple[Any, ...] | None = None
+
+    def __init__(self, coordinator: EcoDevicesCoordinator) -> None:
+        """Initialize the entity, on the device shared by the entry."""
+        super().__init__(coordinator)
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return True once data was received and if the last poll succeeded."""
+        return super().available and self.coordinator.data is not None
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the slice of the coordinator data the state depends on."""
+        data = self.coordinator.data.raw if self.coordinator.data else {}
+        return (
+            self.coordinator.last_update_success,
+            *(data.get(key) for key in self._data_keys),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the data the initial state is written from."""
+        await super().async_added_to_hass()
+        self._last_fingerprint = self._fingerprint()
+
+    def _write_allowed(self) -> bool:
+        """Return True if the changed state may be written now."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the data it depends on moved."""
+        if (
+            fingerprint := self._fingerprint()
+        ) == self._last_fingerprint or not self._write_allowed():
+            self.coordinator.instrumentation.entity_handled(written=False)
+            return
+        self.coordinator.instrumentation.entity_handled(written=True)
+        self._last_fingerprint = fingerprint
+        self.async_write_ha_state()
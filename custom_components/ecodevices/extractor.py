@@ -0,0 +1,32 @@
+"""Precompiled value extractors for the Eco-Devices data."""
+
+from collections.abc import Callable
+from typing import Any
+
+from .snapshot import EcoDevicesSnapshot
+
+
+class ValueExtractor:
+    """Precompiled getter of a value of the snapshot.
+
+    The snapshot is parsed once per coordinator update, so reading the value
+    again within the same update costs a lookup only. The keys are the raw
+    data keys the value is parsed from, used to detect whether it may have
+    changed.
+    """
+
+    __slots__ = ("keys", "read")
+
+    def __init__(
+        self, keys: tuple[str, ...], read: Callable[[EcoDevicesSnapshot], Any]
+    ) -> None:
+        """Initialize the extractor."""
+        self.keys = keys
+        self.read = read
+
+
+def divided(value: float | None, divider_factor: float | None) -> float | None:
+    """Return the value divided by the factor, if any."""
+    if value is None or not divider_factor:
+        return value
+    return value / divider_factor
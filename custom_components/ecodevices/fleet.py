@@ -0,0 +1,202 @@
+"""Domain-level scheduler polling every Eco-Devices of the installation."""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .breaker import BreakerState
+from .const import DOMAIN, FLEET, FLEET_MAX_CONCURRENT_POLLS
+from .coordinator import EcoDevicesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FleetMember:
+    """Scheduling state and health statistics of a polled Eco-Devices."""
+
+    coordinator: EcoDevicesCoordinator
+    next_poll: float = 0.0
+    polling: bool = False
+    polls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_duration: float | None = None
+    last_wait: float | None = None
+    last_poll: datetime | None = None
+    _listeners: list[CALLBACK_TYPE] = field(default_factory=list)
+
+    @property
+    def interval(self) -> float:
+        """Return the current polling interval in seconds."""
+        return self.coordinator.poll_interval.total_seconds()
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the health and timing statistics of the device."""
+        return {
+            "interval": self.interval,
+            "polls": self.polls,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_duration": self.last_duration,
+            "last_wait": self.last_wait,
+            "last_poll": self.last_poll.isoformat() if self.last_poll else None,
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for statistics updates, return a function to stop listening."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners of a statistics update."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+class EcoDevicesFleet:
+    """Poll the registered coordinators on staggered slots, with bounded concurrency.
+
+    A single timer is armed for the next due poll instead of one timer per
+    device, the devices are spread evenly over their interval and at most
+    FLEET_MAX_CONCURRENT_POLLS requests run at the same time. A device whose
+    breaker is open is polled again when the breaker lets a probe through.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fleet."""
+        self.hass = hass
+        self.members: dict[str, FleetMember] = {}
+        self._semaphore = asyncio.Semaphore(FLEET_MAX_CONCURRENT_POLLS)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register(
+        self,
+        entry_id: str,
+        coordinator: EcoDevicesCoordinator,
+        poll_now: bool = False,
+    ) -> FleetMember:
+        """Add a coordinator to the fleet and re-spread the polls.
+
+        With poll_now, the coordinator is polled right away instead of on its
+        slot, for an entry set up without data.
+        """
+        member = self.members[entry_id] = FleetMember(coordinator)
+        _LOGGER.debug("Add %s to the fleet of %s", entry_id, len(self.members))
+        self._stagger()
+        if poll_now:
+            member.next_poll = self.hass.loop.time()
+        self._schedule()
+        return member
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove a coordinator from the fleet."""
+        self.members.pop(entry_id, None)
+        self._schedule()
+
+    async def async_refresh(self, coordinator: EcoDevicesCoordinator) -> None:
+        """Refresh a coordinator out of schedule, within the concurrency limit.
+
+        Used for the first refresh of the entries, so a restart does not
+        request all the devices at once.
+        """
+        async with self._semaphore:
+            await coordinator.async_refresh()
+
+    @callback
+    def _stagger(self) -> None:
+        """Spread the next polls evenly over the interval of each device."""
+        now = self.hass.loop.time()
+        count = len(self.members)
+        for index, member in enumerate(self.members.values()):
+            member.next_poll = now + member.interval * (index + 1) / count
+
+    @callback
+    def _schedule(self) -> None:
+        """Arm the timer for the next due poll."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        waiting = [m.next_poll for m in self.members.values() if not m.polling]
+        if waiting:
+            self._unsub_timer = self.hass.loop.call_at(
+                min(waiting), self._async_on_timer
+            ).cancel
+
+    @callback
+    def _async_on_timer(self) -> None:
+        """Start the due polls."""
+        self._unsub_timer = None
+        if self.hass.is_stopping:
+            return
+        now = self.hass.loop.time()
+        for entry_id, member in self.members.items():
+            if member.polling or member.next_poll > now:
+                continue
+            if retry_in := self._breaker_retry_in(member):
+                # Not polled, the breaker would refuse the request
+                member.next_poll = now + retry_in
+                continue
+            member.polling = True
+            self.hass.async_create_background_task(
+                self._async_poll(member), name=f"{DOMAIN} {entry_id} poll"
+            )
+        self._schedule()
+
+    async def _async_poll(self, member: FleetMember) -> None:
+        """Refresh a coordinator and record its statistics."""
+        loop = self.hass.loop
+        scheduled = member.next_poll
+        try:
+            async with self._semaphore:
+                start = loop.time()
+                member.last_wait = start - scheduled
+                await member.coordinator.async_refresh()
+                member.last_duration = loop.time() - start
+        finally:
+            member.polling = False
+
+        member.polls += 1
+        member.last_poll = dt_util.utcnow()
+        if member.coordinator.last_update_success:
+            member.consecutive_failures = 0
+        else:
+            member.failures += 1
+            member.consecutive_failures += 1
+
+        if retry_in := self._breaker_retry_in(member):
+            # The breaker delay runs from the failure, not from the slot
+            member.next_poll = loop.time() + retry_in
+        else:
+            # Keep the slot of the device instead of drifting by the poll duration
+            member.next_poll = scheduled + member.interval
+        if member.next_poll < loop.time():
+            member.next_poll = loop.time() + member.interval
+        member.async_update_listeners()
+        self._schedule()
+
+    @staticmethod
+    def _breaker_retry_in(member: FleetMember) -> float:
+        """Return the seconds before the open breaker of a device lets a probe."""
+        breaker = member.coordinator.breaker
+        if breaker.state is not BreakerState.OPEN:
+            return 0.0
+        return breaker.retry_in
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> EcoDevicesFleet:
+    """Return the fleet of the domain, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (fleet := domain_data.get(FLEET)) is None:
+        fleet = domain_data[FLEET] = EcoDevicesFleet(hass)
+    return fleet
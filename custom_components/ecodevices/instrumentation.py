@@ -0,0 +1,95 @@
+"""Per-poll instrumentation of the Eco-Devices."""
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import INSTRUMENTATION_BUFFER_SIZE
+
+
+@dataclass(slots=True)
+class PollRecord:
+    """Measures of a poll of the Eco-Devices."""
+
+    sources: tuple[str, ...]
+    time: datetime = field(default_factory=dt_util.utcnow)
+    request_duration: float = 0.0
+    response_bytes: int = 0
+    parse_duration: float = 0.0
+    entities_updated: int = 0
+    entities_skipped: int = 0
+    consecutive_failures: int = 0
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a serializable dictionary."""
+        return {**asdict(self), "time": self.time.isoformat()}
+
+
+class PollInstrumentation:
+    """Fixed-size ring buffer of the measures of the last polls."""
+
+    def __init__(self, size: int = INSTRUMENTATION_BUFFER_SIZE) -> None:
+        """Initialize the instrumentation."""
+        self.records: deque[PollRecord] = deque(maxlen=size)
+        self.polls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+
+    @property
+    def last(self) -> PollRecord | None:
+        """Return the record of the last poll."""
+        return self.records[-1] if self.records else None
+
+    def start(self, sources: tuple[str, ...]) -> PollRecord:
+        """Return the record of a new poll, dropping the oldest one if full."""
+        record = PollRecord(sources)
+        self.records.append(record)
+        self.polls += 1
+        return record
+
+    def failed(self, record: PollRecord, error: Exception) -> None:
+        """Record a failed poll."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        record.consecutive_failures = self.consecutive_failures
+        record.error = str(error)
+
+    def succeeded(self) -> None:
+        """Record a successful poll."""
+        self.consecutive_failures = 0
+
+    def entity_handled(self, written: bool) -> None:
+        """Count an entity whose state was written or skipped after the last poll."""
+        if (record := self.last) is None:
+            return
+        if written:
+            record.entities_updated += 1
+        else:
+            record.entities_skipped += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return the averages and maximums over the buffered polls."""
+        records = [record for record in self.records if record.error is None]
+        summary: dict[str, Any] = {
+            "polls": self.polls,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "buffered": len(self.records),
+        }
+        if not records:
+            return summary
+        for name in (
+            "request_duration",
+            "response_bytes",
+            "parse_duration",
+            "entities_updated",
+            "entities_skipped",
+        ):
+            values = [getattr(record, name) for record in records]
+            summary[f"{name}_mean"] = sum(values) / len(values)
+            summary[f"{name}_max"] = max(values)
+        return summary
@@ -0,0 +1,104 @@
+"""Rate-limited logging of the repeated Eco-Devices problems."""
+
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .const import LOG_BURST, LOG_REFILL_PERIOD, LOG_SUMMARY_INTERVAL
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Token bucket and suppressed records of a log key."""
+
+    tokens: float
+    updated: float
+    suppressed: int = 0
+
+
+class LogAggregator:
+    """Log through a token bucket per key, then summarize what was suppressed.
+
+    Each key may log LOG_BURST records at once, then one record every
+    LOG_REFILL_PERIOD seconds. The records over the limit are only counted,
+    and a single summary of the counters is logged at most every
+    LOG_SUMMARY_INTERVAL seconds, with the next record or on flush.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        burst: int = LOG_BURST,
+        refill_period: float = LOG_REFILL_PERIOD,
+        summary_interval: float = LOG_SUMMARY_INTERVAL,
+    ) -> None:
+        """Initialize the aggregator."""
+        self._logger = logger
+        self._burst = burst
+        self._refill_period = refill_period
+        self._summary_interval = summary_interval
+        self._buckets: dict[Any, _Bucket] = {}
+        self._summary_level = logging.NOTSET
+        self._last_summary = time.monotonic()
+
+    def log(self, level: int, key: Any, msg: str, *args: Any) -> None:
+        """Log a record of the key unless its bucket is empty."""
+        if not self._logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if (bucket := self._buckets.get(key)) is None:
+            bucket = self._buckets[key] = _Bucket(self._burst, now)
+        else:
+            bucket.tokens = min(
+                self._burst,
+                bucket.tokens + (now - bucket.updated) / self._refill_period,
+            )
+            bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self._logger.log(level, msg, *args)
+        else:
+            bucket.suppressed += 1
+            self._summary_level = max(self._summary_level, level)
+
+        if now - self._last_summary >= self._summary_interval:
+            self.flush()
+
+    def warning(self, key: Any, msg: str, *args: Any) -> None:
+        """Log a rate-limited warning."""
+        self.log(logging.WARNING, key, msg, *args)
+
+    def debug(self, key: Any, msg: str, *args: Any) -> None:
+        """Log a rate-limited debug record."""
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def flush(self) -> None:
+        """Log the summary of the suppressed records, if any."""
+        self._last_summary = time.monotonic()
+        suppressed = {
+            key: bucket.suppressed
+            for key, bucket in self._buckets.items()
+            if bucket.suppressed
+        }
+        # Forget the keys back to a full bucket, they would log right away
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if bucket.suppressed
+            or bucket.tokens
+            + (self._last_summary - bucket.updated) / self._refill_period
+            < self._burst
+        }
+        if not suppressed:
+            return
+        for bucket in self._buckets.values():
+            bucket.suppressed = 0
+        self._logger.log(
+            self._summary_level,
+            "Suppressed %s similar log records: %s",
+            sum(suppressed.values()),
+            ", ".join(f"{key}: {count}" for key, count in suppressed.items()),
+        )
+        self._summary_level = logging.NOTSET
@@ -0,0 +1,74 @@
+"""Reception of the values pushed by the Eco-Devices."""
+
+from functools import partial
+from http import HTTPStatus
+import logging
+from xml.parsers.expat import ExpatError
+
+from aiohttp import web
+import xmltodict
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import EcoDevicesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_read_values(request: web.Request) -> dict[str, str]:
+    """Return the values of the query string and of the body of a push.
+
+    The body may be a form, a JSON object or an XML document in the format of
+    the status.xml of the Eco-Devices.
+    """
+    values = dict(request.query)
+    if request.method == "POST" and request.can_read_body:
+        if request.content_type == "application/json":
+            if isinstance(body := await request.json(), dict):
+                values.update(body)
+        elif request.content_type in ("application/xml", "text/xml"):
+            values.update(xmltodict.parse(await request.text()).get("response") or {})
+        else:
+            values.update(await request.post())
+    return {key: str(value) for key, value in values.items()}
+
+
+@callback
+def async_setup_push(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: EcoDevicesCoordinator
+) -> None:
+    """Register the webhook the Eco-Devices pushes its values to."""
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+
+    async def _async_handle_push(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Update the coordinator with the pushed values."""
+        try:
+            values = await _async_read_values(request)
+        except (ValueError, ExpatError) as err:
+            _LOGGER.debug("Invalid push to %s: %s", entry.title, err)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        if values:
+            coordinator.async_push(values)
+        return web.Response(status=HTTPStatus.OK)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        _async_handle_push,
+        local_only=True,
+        allowed_methods=("GET", "POST"),
+    )
+    entry.async_on_unload(partial(webhook.async_unregister, hass, webhook_id))
+    _LOGGER.info(
+        "Push the values of %s to %s",
+        entry.title,
+        webhook.async_generate_path(webhook_id),
+    )
@@ -0,0 +1,86 @@
+"""Flow rates derived from the pulse counters of the meter inputs."""
+
+import math
+import time
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import RATE_SMOOTHING_TIME
+from .coordinator import EcoDevicesCoordinator
+from .counter import MonotonicCounter
+from .snapshot import EcoDevicesSnapshot
+
+
+class RateMeter:
+    """Rate of an ever-increasing counter, in counter units per second.
+
+    The rate is the increase between two accepted readings divided by the
+    monotonic time between them. The smoothed rate is an exponential moving
+    average whose weight depends on that time, so irregular polls or pushes
+    do not bias it. A counter reset starts over from the new value.
+    """
+
+    __slots__ = ("_counter", "_resets", "_time", "rate", "smoothed")
+
+    def __init__(self) -> None:
+        """Initialize the rate, unknown until two readings."""
+        self._counter = MonotonicCounter()
+        self._resets = 0
+        self._time: float | None = None
+        self.rate: float | None = None
+        self.smoothed: float | None = None
+
+    def update(self, reading: float | None, now: float) -> None:
+        """Update the rates with a new counter reading."""
+        previous = self._counter.value
+        if self._counter.update(reading) is not None:
+            return
+        if previous is None or self._counter.resets != self._resets:
+            self._resets = self._counter.resets
+            self._time = now
+            return
+        if (elapsed := now - self._time) <= 0:
+            return
+        self.rate = (self._counter.value - previous) / elapsed
+        if self.smoothed is None:
+            self.smoothed = self.rate
+        else:
+            weight = 1 - math.exp(-elapsed / RATE_SMOOTHING_TIME)
+            self.smoothed += weight * (self.rate - self.smoothed)
+        self._time = now
+
+
+class MeterRates:
+    """Rates of the meter inputs, updated once per coordinator update."""
+
+    def __init__(self, coordinator: EcoDevicesCoordinator) -> None:
+        """Initialize the rates."""
+        self.coordinator = coordinator
+        self._rates: dict[int, RateMeter] = {}
+        self._generation: int | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the coordinator updates, return the stop callback."""
+        return self.coordinator.async_add_listener(self._async_handle_update)
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Add the counter readings of the new snapshot."""
+        self.update(self.coordinator.data)
+
+    def rate(self, input_number: int) -> RateMeter:
+        """Return the rate of a meter input."""
+        if (rate := self._rates.get(input_number)) is None:
+            rate = self._rates[input_number] = RateMeter()
+        return rate
+
+    def update(self, snapshot: EcoDevicesSnapshot | None) -> None:
+        """Add the counter readings of a new snapshot."""
+        if snapshot is None or snapshot.generation == self._generation:
+            return
+        self._generation = snapshot.generation
+        now = time.monotonic()
+        for input_number, rate in self._rates.items():
+            if (meter := snapshot.meters.get(input_number)) is not None:
+                rate.update(meter.total, now)
@@ -0,0 +1,287 @@
+"""Recent samples of the teleinfo power and current, with windowed statistics."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from enum import StrEnum
+from itertools import accumulate
+import time
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import SAMPLING_BUFFER_SIZE
+from .coordinator import EcoDevicesCoordinator
+from .snapshot import EcoDevicesSnapshot
+
+QUANTITY_PAPP = "papp"
+QUANTITY_IINST = "iinst"
+
+
+class WindowStatistic(StrEnum):
+    """Statistic of the samples of a window."""
+
+    MEAN = "mean"
+    MAX = "max"
+    MIN = "min"
+    PERCENTILE = "percentile"
+
+
+class _ExtremumQueue:
+    """Monotonic queue of the numbers of the samples which may be the extremum.
+
+    The numbers are kept in a ring of the size of the samples rings, which
+    the queue never outgrows. The sign is 1 for the maximum, -1 for the
+    minimum.
+    """
+
+    __slots__ = ("_head", "_numbers", "_sign", "_tail")
+
+    def __init__(self, size: int, sign: float) -> None:
+        """Initialize an empty queue."""
+        self._numbers = array("q", bytes(8 * size))
+        self._sign = sign
+        self._head = 0
+        self._tail = 0
+
+    def __bool__(self) -> bool:
+        """Return True if the queue is not empty."""
+        return self._tail > self._head
+
+    @property
+    def first(self) -> int:
+        """Return the number of the extremum."""
+        return self._numbers[self._head % len(self._numbers)]
+
+    def push(self, number: int, value: float, values: array) -> None:
+        """Add a sample, dropping the ones it outranks."""
+        numbers = self._numbers
+        size = len(numbers)
+        sign = self._sign
+        while (
+            self._tail > self._head
+            and sign * values[numbers[(self._tail - 1) % size] % size] <= sign * value
+        ):
+            self._tail -= 1
+        numbers[self._tail % size] = number
+        self._tail += 1
+
+    def drop(self, number: int) -> None:
+        """Drop the sample of the given number if it is the first one."""
+        if self._tail > self._head and self.first == number:
+            self._head += 1
+
+
+class SlidingWindow:
+    """Samples of the last seconds of a value, in fixed-size rings.
+
+    The samples are identified by their sequence number, their slot in the
+    rings being the number modulo the size. Each sample weighs the time it
+    was held, until the next one, so the mean and the percentile are not
+    biased by the faster polls while the value moves. The weighted sum is
+    kept as the samples come and go, the minimum and maximum with monotonic
+    queues, so the mean, minimum and maximum cost O(1) per sample; the
+    percentile uses a copy of the held samples sorted by value, updated by
+    bisection. Everything is stored in typed arrays, without a float object
+    per sample. When the rings are full the oldest samples are dropped even
+    if they are still in the window.
+    """
+
+    __slots__ = (
+        "_end",
+        "_held",
+        "_max",
+        "_min",
+        "_sorted",
+        "_start",
+        "_times",
+        "_values",
+        "_weighted",
+        "window",
+    )
+
+    def __init__(self, window: float, size: int = SAMPLING_BUFFER_SIZE) -> None:
+        """Initialize an empty window of the given seconds."""
+        self.window = window
+        self._values = array("d", bytes(8 * size))
+        self._times = array("d", bytes(8 * size))
+        self._start = 0
+        self._end = 0
+        self._weighted = 0.0
+        self._max = _ExtremumQueue(size, 1)
+        self._min = _ExtremumQueue(size, -1)
+        # Values of the samples followed by another, sorted, and their durations
+        self._sorted = array("d")
+        self._held = array("d")
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._end - self._start
+
+    def add(self, value: float, now: float) -> None:
+        """Add a sample taken at the given monotonic time."""
+        values = self._values
+        size = len(values)
+        if self._end - self._start == size:
+            self._drop()
+        if self._end > self._start:
+            # The previous sample was held until now
+            previous = values[(self._end - 1) % size]
+            held = now - self._times[(self._end - 1) % size]
+            self._weighted += previous * held
+            index = bisect_right(self._sorted, previous)
+            self._sorted.insert(index, previous)
+            self._held.insert(index, held)
+        values[self._end % size] = value
+        self._times[self._end % size] = now
+        self._max.push(self._end, value, values)
+        self._min.push(self._end, value, values)
+        self._end += 1
+        self.expire(now)
+
+    def expire(self, now: float) -> None:
+        """Drop the samples older than the window, keeping the last one."""
+        size = len(self._times)
+        limit = now - self.window
+        while self._end - self._start > 1 and self._times[self._start % size] < limit:
+            self._drop()
+
+    def _drop(self) -> None:
+        """Drop the oldest sample."""
+        size = len(self._values)
+        if self._end - self._start > 1:
+            value = self._values[self._start % size]
+            held = (
+                self._times[(self._start + 1) % size] - self._times[self._start % size]
+            )
+            self._weighted -= value * held
+            index = bisect_left(self._sorted, value)
+            while self._held[index] != held:
+                index += 1
+            del self._sorted[index]
+            del self._held[index]
+        self._max.drop(self._start)
+        self._min.drop(self._start)
+        self._start += 1
+
+    @property
+    def _last(self) -> float:
+        """Return the last sample."""
+        return self._values[(self._end - 1) % len(self._values)]
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples, weighted by the time they were held."""
+        if self._end == self._start:
+            return None
+        size = len(self._times)
+        span = self._times[(self._end - 1) % size] - self._times[self._start % size]
+        if span <= 0:
+            return self._last
+        return self._weighted / span
+
+    @property
+    def max(self) -> float | None:
+        """Return the highest sample."""
+        if not self._max:
+            return None
+        return self._values[self._max.first % len(self._values)]
+
+    @property
+    def min(self) -> float | None:
+        """Return the lowest sample."""
+        if not self._min:
+            return None
+        return self._values[self._min.first % len(self._values)]
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the percentile of the samples, weighted by the time they were held.
+
+        It is the lowest value held at least the given percent of the time.
+        """
+        if self._end == self._start:
+            return None
+        held = list(accumulate(self._held))
+        if not held or held[-1] <= 0:
+            return self._last
+        index = bisect_left(held, percent / 100 * held[-1])
+        return self._sorted[min(index, len(held) - 1)]
+
+    def statistic(self, statistic: WindowStatistic, percent: float) -> float | None:
+        """Return a statistic of the samples."""
+        if statistic is WindowStatistic.MEAN:
+            return self.mean
+        if statistic is WindowStatistic.MAX:
+            return self.max
+        if statistic is WindowStatistic.MIN:
+            return self.min
+        return self.percentile(percent)
+
+
+class PowerSampler:
+    """Windows of the apparent power and current of the teleinfo inputs.
+
+    The windows are created by the sensors using them, and removed with the
+    last of them, so nothing is sampled while the statistics sensors are
+    disabled. They are fed on every coordinator update.
+    """
+
+    def __init__(self, coordinator: EcoDevicesCoordinator) -> None:
+        """Initialize the sampler without windows."""
+        self.coordinator = coordinator
+        self._windows: dict[tuple[int, str, float], SlidingWindow] = {}
+        self._users: dict[tuple[int, str, float], int] = {}
+        self._generation: int | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the coordinator updates, return the stop callback."""
+        return self.coordinator.async_add_listener(self._async_handle_update)
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Add the samples of the new snapshot."""
+        self.update(self.coordinator.data)
+
+    def window(self, input_number: int, quantity: str, seconds: float) -> SlidingWindow:
+        """Return the window of a quantity of a teleinfo input, for a new user.
+
+        A new window starts with the current value.
+        """
+        key = (input_number, quantity, seconds)
+        if (window := self._windows.get(key)) is None:
+            window = self._windows[key] = SlidingWindow(seconds)
+            if (snapshot := self.coordinator.data) is not None and (
+                value := _sample(snapshot, input_number, quantity)
+            ) is not None:
+                window.add(value, time.monotonic())
+        self._users[key] = self._users.get(key, 0) + 1
+        return window
+
+    def release(self, input_number: int, quantity: str, seconds: float) -> None:
+        """Release a window, removed once it has no user."""
+        key = (input_number, quantity, seconds)
+        if (users := self._users.get(key, 0)) > 1:
+            self._users[key] = users - 1
+            return
+        self._users.pop(key, None)
+        self._windows.pop(key, None)
+
+    def update(self, snapshot: EcoDevicesSnapshot | None) -> None:
+        """Add the samples of a new snapshot, once per coordinator update."""
+        if snapshot is None or snapshot.generation == self._generation:
+            return
+        self._generation = snapshot.generation
+        now = time.monotonic()
+        for (input_number, quantity, _), window in self._windows.items():
+            if (value := _sample(snapshot, input_number, quantity)) is not None:
+                window.add(value, now)
+            else:
+                window.expire(now)
+
+
+def _sample(
+    snapshot: EcoDevicesSnapshot, input_number: int, quantity: str
+) -> float | None:
+    """Return the value of a quantity of a teleinfo input, None if not reported."""
+    if (teleinfo := snapshot.teleinfo.get(input_number)) is None:
+        return None
+    return teleinfo.papp if quantity == QUANTITY_PAPP else teleinfo.iinst
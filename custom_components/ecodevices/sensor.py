@@ -1,7 +1,10 @@
 """Support for the GCE Eco-Devices."""
 
-from collections.abc import Mapping
+from abc import abstractmethod
+from collections.abc import Callable, Mapping
+from datetime import datetime
 import logging
+import time
 from typing import Any
 
 from pyecodevices import EcoDevices
@@ -10,22 +13,25 @@ from homeassistant.components.sensor import (
     DEVICE_CLASS_STATE_CLASSES,
     RestoreSensor,
     SensorDeviceClass,
+    SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
+    PERCENTAGE,
+    EntityCategory,
     UnitOfApparentPower,
+    UnitOfElectricCurrent,
     UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPower,
+    UnitOfTime,
+    UnitOfVolume,
+    UnitOfVolumeFlowRate,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import slugify
 
 from .const import (
@@ -39,32 +45,95 @@ from .const import (
     CONF_C2_ENABLED,
     CONF_C2_TOTAL_UNIT_OF_MEASUREMENT,
     CONF_C2_UNIT_OF_MEASUREMENT,
+    CONF_METER_WRITE_POLICY,
+    CONF_POWER_WRITE_POLICY,
+    CONF_SAMPLING_PERCENTILE,
+    CONF_SAMPLING_WINDOW,
     CONF_T1_ENABLED,
-    CONF_T1_TYPE,
     CONF_T2_ENABLED,
-    CONF_T2_TYPE,
     CONF_TI_TYPE_BASE,
+    CONF_TI_TYPE_EJP,
     CONF_TI_TYPE_HCHP,
     CONF_TI_TYPE_TEMPO,
     CONTROLLER,
     COORDINATOR,
+    COSTS,
+    COUNTER_TELEINFO_MAX_RATE,
+    COUNTER_UNRECORDED_ATTR,
     DEFAULT_C1_NAME,
     DEFAULT_C2_NAME,
+    DEFAULT_SAMPLING_PERCENTILE,
+    DEFAULT_SAMPLING_WINDOW,
     DEFAULT_T1_NAME,
     DEFAULT_T2_NAME,
     DOMAIN,
+    FLEET_MEMBER,
+    RATES,
+    SAMPLER,
+    TELEINFO_EJP_ATTR,
     TELEINFO_EXTRA_ATTR,
     TELEINFO_TEMPO_ATTR,
+    TELEINFO_UNRECORDED_ATTR,
+)
+from .breaker import BreakerState
+from .coordinator import EcoDevicesCoordinator
+from .cost import CostEngine
+from .counter import MonotonicCounter
+from .entity import EcoDevicesEntity, async_add_entry_entities
+from .extractor import ValueExtractor, divided
+from .fleet import FleetMember
+from .instrumentation import PollRecord
+from .log import LogAggregator
+from .rate import MeterRates, RateMeter
+from .sampling import (
+    QUANTITY_IINST,
+    QUANTITY_PAPP,
+    PowerSampler,
+    SlidingWindow,
+    WindowStatistic,
+)
+from .snapshot import (
+    CONTRACT_PERIODS,
+    PHASES,
+    TEMPO_INDEX_KEYS,
+    EcoDevicesSnapshot,
+    TariffPeriod,
 )
-from .entity import get_device_info
+from .throttle import WritePolicy
 
 _LOGGER = logging.getLogger(__name__)
+_LOG = LogAggregator(_LOGGER)
+
+# Unit, seconds per unit of time and device class of the rate of a meter unit
+RATE_UNITS: dict[str, tuple[str, int, SensorDeviceClass]] = {
+    UnitOfEnergy.WATT_HOUR: (UnitOfPower.WATT, 3600, SensorDeviceClass.POWER),
+    UnitOfEnergy.KILO_WATT_HOUR: (
+        UnitOfPower.KILO_WATT,
+        3600,
+        SensorDeviceClass.POWER,
+    ),
+    UnitOfVolume.CUBIC_METERS: (
+        UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
+        3600,
+        SensorDeviceClass.VOLUME_FLOW_RATE,
+    ),
+    UnitOfVolume.LITERS: (
+        UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+        60,
+        SensorDeviceClass.VOLUME_FLOW_RATE,
+    ),
+}
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the GCE Eco-Devices platform."""
+    async_add_entry_entities(hass, entry, async_add_entities, _build_entities)
+
+
+def _build_entities(hass: HomeAssistant, entry: ConfigEntry) -> list[SensorEntity]:
+    """Return the entities of the enabled inputs."""
     data = hass.data[DOMAIN][entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
@@ -72,19 +141,62 @@ async def async_setup_entry(
     options = entry.options
 
     t1_enabled = options.get(CONF_T1_ENABLED, config.get(CONF_T1_ENABLED))
-    t1_type = options.get(CONF_T1_TYPE, config.get(CONF_T1_TYPE))
     t2_enabled = options.get(CONF_T2_ENABLED, config.get(CONF_T2_ENABLED))
-    t2_type = options.get(CONF_T2_TYPE, config.get(CONF_T2_TYPE))
     c1_enabled = options.get(CONF_C1_ENABLED, config.get(CONF_C1_ENABLED))
     c2_enabled = options.get(CONF_C2_ENABLED, config.get(CONF_C2_ENABLED))
+    power_policy = WritePolicy.from_config(
+        {**config, **options}, CONF_POWER_WRITE_POLICY
+    )
+    meter_policy = WritePolicy.from_config(
+        {**config, **options}, CONF_METER_WRITE_POLICY
+    )
+    sampling_window = options.get(
+        CONF_SAMPLING_WINDOW, config.get(CONF_SAMPLING_WINDOW, DEFAULT_SAMPLING_WINDOW)
+    )
+    sampling_percentile = options.get(
+        CONF_SAMPLING_PERCENTILE,
+        config.get(CONF_SAMPLING_PERCENTILE, DEFAULT_SAMPLING_PERCENTILE),
+    )
 
-    entities: list[EdSensorEntity] = []
+    entities: list[SensorEntity] = [
+        PollingIntervalEdDevice(controller, coordinator),
+        ConnectionStateEdDevice(controller, coordinator),
+        PollDurationEdDevice(controller, data[FLEET_MEMBER]),
+        PollRecordEdDevice(
+            controller,
+            coordinator,
+            key="request_duration",
+            name="Request duration",
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            getter=lambda record: record.request_duration * 1000,
+        ),
+        PollRecordEdDevice(
+            controller,
+            coordinator,
+            key="parse_duration",
+            name="Parse duration",
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            getter=lambda record: record.parse_duration * 1000,
+        ),
+        PollRecordEdDevice(
+            controller,
+            coordinator,
+            key="response_size",
+            name="Response size",
+            unit=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            getter=lambda record: record.response_bytes,
+        ),
+    ]
 
     for ti_input_number in (1, 2):
         if t1_enabled and ti_input_number == 1 or t2_enabled and ti_input_number == 2:
             _LOGGER.debug("Add the teleinfo %s sensor entities", ti_input_number)
             default_name = DEFAULT_T1_NAME if ti_input_number == 1 else DEFAULT_T2_NAME
-            ti_type = t1_type if ti_input_number == 1 else t2_type
+            # Chosen in the options or detected, None until the teleinfo reports
+            ti_type = coordinator.contracts.get(ti_input_number)
 
             entities.append(
                 TeleinfoInputEdDevice(
@@ -97,8 +209,79 @@ async def async_setup_entry(
                     device_class=SensorDeviceClass.APPARENT_POWER,
                     state_class=SensorStateClass.MEASUREMENT,
                     icon="mdi:flash",
+                    write_policy=power_policy,
                 )
             )
+            for quantity, quantity_name, unit, device_class in (
+                (
+                    QUANTITY_PAPP,
+                    "Power",
+                    UnitOfApparentPower.VOLT_AMPERE,
+                    SensorDeviceClass.APPARENT_POWER,
+                ),
+                (
+                    QUANTITY_IINST,
+                    "Current",
+                    UnitOfElectricCurrent.AMPERE,
+                    SensorDeviceClass.CURRENT,
+                ),
+            ):
+                entities.extend(
+                    TeleinfoWindowEdDevice(
+                        controller,
+                        coordinator,
+                        data[SAMPLER],
+                        input_number=ti_input_number,
+                        quantity=quantity,
+                        statistic=statistic,
+                        window=sampling_window,
+                        percentile=sampling_percentile,
+                        name=f"{default_name} {quantity_name} {statistic}",
+                        unit=unit,
+                        device_class=device_class,
+                    )
+                    for statistic in WindowStatistic
+                )
+            if ti_input_number in coordinator.three_phase_inputs:
+                for phase in PHASES:
+                    entities.append(
+                        TeleinfoPhaseEdDevice(
+                            controller,
+                            coordinator,
+                            input_number=ti_input_number,
+                            input_name=f"T{ti_input_number}_IINST{phase}",
+                            name=f"{default_name} Current Phase {phase}",
+                            unit=UnitOfElectricCurrent.AMPERE,
+                            device_class=SensorDeviceClass.CURRENT,
+                            state_class=SensorStateClass.MEASUREMENT,
+                            icon="mdi:current-ac",
+                        )
+                    )
+                    entities.append(
+                        TeleinfoPhaseEdDevice(
+                            controller,
+                            coordinator,
+                            input_number=ti_input_number,
+                            input_name=f"T{ti_input_number}_IMAX{phase}",
+                            name=f"{default_name} Max Current Phase {phase}",
+                            unit=UnitOfElectricCurrent.AMPERE,
+                            device_class=SensorDeviceClass.CURRENT,
+                            state_class=SensorStateClass.MEASUREMENT,
+                            icon="mdi:current-ac",
+                        )
+                    )
+                entities.append(
+                    TeleinfoImbalanceEdDevice(
+                        controller,
+                        coordinator,
+                        input_number=ti_input_number,
+                        input_name=f"T{ti_input_number}_imbalance",
+                        name=f"{default_name} Phase imbalance",
+                        unit=PERCENTAGE,
+                        state_class=SensorStateClass.MEASUREMENT,
+                        icon="mdi:scale-unbalanced",
+                    )
+                )
             if ti_type == CONF_TI_TYPE_BASE:
                 entities.append(
                     TeleinfoInputTotalEdDevice(
@@ -203,6 +386,65 @@ async def async_setup_entry(
                         device_class=SensorDeviceClass.ENUM,
                     )
                 )
+            elif ti_type == CONF_TI_TYPE_EJP:
+                entities.append(
+                    TeleinfoInputTotalEjpEdDevice(
+                        controller,
+                        coordinator,
+                        input_number=ti_input_number,
+                        input_name=f"T{ti_input_number}_total",
+                        name=default_name + " Total",
+                        unit=UnitOfEnergy.WATT_HOUR,
+                        device_class=SensorDeviceClass.ENERGY,
+                        state_class=SensorStateClass.TOTAL_INCREASING,
+                        icon="mdi:meter-electric",
+                    )
+                )
+                for desc, key in TELEINFO_EJP_ATTR.items():
+                    entities.append(
+                        TeleinfoInputEjpEdDevice(
+                            controller,
+                            coordinator,
+                            input_number=ti_input_number,
+                            input_name=f"T{ti_input_number}_{key}",
+                            name=default_name + " " + desc + " Total",
+                            unit=UnitOfEnergy.WATT_HOUR,
+                            device_class=SensorDeviceClass.ENERGY,
+                            state_class=SensorStateClass.TOTAL_INCREASING,
+                            icon="mdi:meter-electric",
+                        )
+                    )
+            priced_periods = [
+                period
+                for period in CONTRACT_PERIODS.get(ti_type, ())
+                if period in data[COSTS].prices
+            ]
+            entities.extend(
+                TeleinfoCostEdDevice(
+                    controller,
+                    coordinator,
+                    data[COSTS],
+                    input_number=ti_input_number,
+                    period=period,
+                    name=f"{default_name} Cost {period.upper()}",
+                    currency=hass.config.currency,
+                )
+                for period in priced_periods
+            )
+            if priced_periods:
+                entities.extend(
+                    TeleinfoCostSumEdDevice(
+                        controller,
+                        coordinator,
+                        data[COSTS],
+                        input_number=ti_input_number,
+                        month=month,
+                        name=default_name
+                        + (" Cost this month" if month else " Cost today"),
+                        currency=hass.config.currency,
+                    )
+                    for month in (False, True)
+                )
     for ci_input_number in (1, 2):
         if c1_enabled and ci_input_number == 1 or c2_enabled and ci_input_number == 2:
             _LOGGER.debug("Add the meter %s sensor entities", ci_input_number)
@@ -237,24 +479,42 @@ async def async_setup_entry(
                     device_class=options.get(
                         ci_device_class, config.get(ci_device_class)
                     ),
-                    state_class=SensorStateClass.MEASUREMENT
-                    if (
+                    state_class=(
                         SensorStateClass.MEASUREMENT
-                        in (
-                            DEVICE_CLASS_STATE_CLASSES.get(
-                                options.get(
-                                    ci_device_class, config.get(ci_device_class)
-                                ),
-                                {},
+                        if (
+                            SensorStateClass.MEASUREMENT
+                            in (
+                                DEVICE_CLASS_STATE_CLASSES.get(
+                                    options.get(
+                                        ci_device_class, config.get(ci_device_class)
+                                    ),
+                                    {},
+                                )
                             )
                         )
-                    )
-                    else None,
+                        else None
+                    ),
                     icon="mdi:counter",
                     divider_factor=options.get(
                         ci_divider_factor, config.get(ci_divider_factor)
                     ),
+                    write_policy=meter_policy,
+                )
+            )
+            entities.extend(
+                MeterInputRateEdDevice(
+                    controller,
+                    coordinator,
+                    data[RATES],
+                    input_number=ci_input_number,
+                    smoothed=smoothed,
+                    name=default_name + (" Rate smoothed" if smoothed else " Rate"),
+                    unit=options.get(ci_unit, config.get(ci_unit)),
+                    divider_factor=options.get(
+                        ci_divider_factor, config.get(ci_divider_factor)
+                    ),
                 )
+                for smoothed in (False, True)
             )
             entities.append(
                 MeterInputDailyEdDevice(
@@ -296,17 +556,16 @@ async def async_setup_entry(
                 )
             )
 
-    if entities:
-        async_add_entities(entities)
+    return entities
 
 
-class EdSensorEntity(CoordinatorEntity, RestoreSensor):
+class EdSensorEntity(EcoDevicesEntity, RestoreSensor):
     """Representation of a generic Eco-Devices sensor."""
 
     def __init__(
         self,
         controller: EcoDevices,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EcoDevicesCoordinator,
         input_number: int,
         input_name: str,
         name: str,
@@ -315,6 +574,7 @@ class EdSensorEntity(CoordinatorEntity, RestoreSensor):
         state_class: SensorStateClass | None = None,
         icon: str | None = None,
         divider_factor: float | None = None,
+        write_policy: WritePolicy | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -322,6 +582,19 @@ class EdSensorEntity(CoordinatorEntity, RestoreSensor):
         self._input_name = input_name
         self._input_number = input_number
         self._divider_factor = divider_factor
+        self._write_policy = write_policy
+        self._written_value: Any = None
+        self._written_time = 0.0
+        self._unsub_held_write: CALLBACK_TYPE | None = None
+        self.settings = (
+            name,
+            unit,
+            device_class,
+            state_class,
+            icon,
+            divider_factor,
+            write_policy,
+        )
 
         self._attr_name = name
         self._attr_native_unit_of_measurement = unit
@@ -331,171 +604,340 @@ class EdSensorEntity(CoordinatorEntity, RestoreSensor):
         self._attr_unique_id = slugify(
             f"{DOMAIN}_{self.controller.mac_address}_sensor_{self._input_name}"
         )
-        self._attr_device_info = get_device_info(self.controller)
+        self._extractor = self._build_extractor()
+        self._data_keys = self._build_data_keys()
 
-        self._last_state: StateType | None = None
+    @abstractmethod
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+
+    def _build_data_keys(self) -> tuple[str, ...]:
+        """Return the coordinator data keys the sensor depends on."""
+        return self._extractor.keys
+
+    def _extract(self) -> Any:
+        """Return the sensor value from the current coordinator snapshot."""
+        return self._extractor.read(self.coordinator.data)
 
     async def async_added_to_hass(self) -> None:
-        """Restore state on startup."""
+        """Cancel the write of a held value when removed."""
         await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_held_write)
 
-        last_state = await self.async_get_last_state()
+    def _write_allowed(self) -> bool:
+        """Apply the write policy of the sensor, if any.
 
-        if last_state is not None and last_state.state not in (
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
+        A change of availability is always written. A value held back is
+        written once the maximum interval of the policy passed, unless a new
+        value was written before.
+        """
+        if self._write_policy is None:
+            return True
+        now = time.monotonic()
+        value = self.native_value if self.available else None
+        if (
+            value is not None
+            and self._written_value is not None
+            and not self._write_policy.allows(
+                value, self._written_value, now - self._written_time
+            )
         ):
-            self._last_state = last_state.state
+            delay = self._write_policy.held_for(now - self._written_time)
+            if self._unsub_held_write is None and delay is not None:
+                self._unsub_held_write = async_call_later(
+                    self.hass, delay, self._async_write_held
+                )
+            return False
+        self._async_cancel_held_write()
+        self._written_value = value
+        self._written_time = now
+        return True
+
+    @callback
+    def _async_write_held(self, _now: datetime) -> None:
+        """Write the value held back by the write policy."""
+        self._unsub_held_write = None
+        self._handle_coordinator_update()
+
+    @callback
+    def _async_cancel_held_write(self) -> None:
+        """Cancel the pending write of a held value."""
+        if self._unsub_held_write is not None:
+            self._unsub_held_write()
+            self._unsub_held_write = None
+
+
+class EdTotalSensorEntity(EdSensorEntity):
+    """Representation of an ever-increasing Eco-Devices index.
+
+    The readings go through a monotonic counter, once per poll, and the state
+    is the last accepted value.
+    """
+
+    _counter_max_rate: float | None = COUNTER_TELEINFO_MAX_RATE
+    _counter_divider: float = 1
+    _unrecorded_attributes = COUNTER_UNRECORDED_ATTR
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor and its counter."""
+        super().__init__(*args, **kwargs)
+        self._counter = MonotonicCounter(self._counter_max_rate)
+        self._counter_generation: int | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the counter value on startup."""
+        last_value: float | None = None
+        if (last_data := await self.async_get_last_sensor_data()) is not None:
+            try:
+                last_value = float(last_data.native_value)
+            except (TypeError, ValueError):
+                last_value = None
+        if last_value is not None:
+            self._counter.restore(last_value * self._counter_divider)
+        self._update_counter()
+        await super().async_added_to_hass()
+
+    def _update_counter(self) -> None:
+        """Feed the counter with the reading of a new snapshot."""
+        data = self.coordinator.data
+        if data is None or data.generation == self._counter_generation:
+            return
+        self._counter_generation = data.generation
+        if (rejection := self._counter.update(self._extract())) is not None:
+            _LOG.warning(
+                f"{self.entity_id} {rejection}",
+                "Reading %s of %s rejected (%s), keep %s",
+                self._extract(),
+                self.entity_id,
+                rejection,
+                self._counter.value,
+            )
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the accepted value and the resets, a rejection writes nothing."""
+        return (
+            self.coordinator.last_update_success,
+            self._counter.value,
+            self._counter.resets,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Validate the new reading before writing the state."""
+        self._update_counter()
+        super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last accepted value."""
+        if (value := self._counter.value) is None:
+            return None
+        return value / self._counter_divider
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the rejected readings and resets of the counter.
+
+        They are updated with the next accepted value.
+        """
+        return self._counter.statistics()
 
 
 class TeleinfoInputEdDevice(EdSensorEntity):
     """Initialize the Teleinfo Input sensor."""
 
+    _unrecorded_attributes = TELEINFO_UNRECORDED_ATTR
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor and its attributes extractor."""
+        super().__init__(*args, **kwargs)
+        self._attribute_keys = tuple(
+            (name, f"T{self._input_number}_{key}")
+            for name, key in TELEINFO_EXTRA_ATTR.items()
+        )
+        self._reported_attribute_keys: tuple[tuple[str, str], ...] = ()
+        self._unreported_attribute_keys = self._attribute_keys
+        self._attributes_extractor = ValueExtractor(
+            tuple(key for _, key in self._attribute_keys), self._build_attributes
+        )
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"T{self._input_number}_PAPP",),
+            lambda snapshot: snapshot.teleinfo[self._input_number].papp,
+        )
+
+    def _build_data_keys(self) -> tuple[str, ...]:
+        """Return the coordinator data keys the sensor depends on."""
+        return (
+            *self._extractor.keys,
+            *(f"T{self._input_number}_{v}" for v in TELEINFO_EXTRA_ATTR.values()),
+        )
+
+    def _build_attributes(self, snapshot: EcoDevicesSnapshot) -> dict[str, Any]:
+        """Return the attributes the meter has reported at least once."""
+        raw = snapshot.raw
+        if self._unreported_attribute_keys and any(
+            key in raw for _, key in self._unreported_attribute_keys
+        ):
+            reported = self._reported_attribute_keys
+            self._reported_attribute_keys = tuple(
+                item
+                for item in self._attribute_keys
+                if item in reported or item[1] in raw
+            )
+            self._unreported_attribute_keys = tuple(
+                item
+                for item in self._attribute_keys
+                if item not in self._reported_attribute_keys
+            )
+        return {name: raw.get(key) for name, key in self._reported_attribute_keys}
+
     @property
     def native_value(self) -> int:
         """Return the state."""
-        return self.coordinator.data[f"T{self._input_number}_PAPP"]
+        return self._extract()
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
         if self.coordinator.data:
-            return {
-                k: self.coordinator.data.get(f"T{self._input_number}_{v}")
-                for k, v in TELEINFO_EXTRA_ATTR.items()
-            }
+            return self._attributes_extractor.read(self.coordinator.data)
         raise EcoDevicesIncorrectValueError("Data not received.")
 
 
-class TeleinfoInputTotalEdDevice(EdSensorEntity):
-    """Initialize the Teleinfo Input Total sensor."""
+class TeleinfoPhaseEdDevice(EdSensorEntity):
+    """Initialize the Teleinfo Input phase current or max current sensor."""
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        key = self._input_name.split("_", 1)[1]
+        attribute = "iinst_phases" if key.startswith("IINST") else "imax_phases"
+        index = int(key[-1]) - 1
+        number = self._input_number
+        return ValueExtractor(
+            (self._input_name,),
+            lambda snapshot: getattr(snapshot.teleinfo[number], attribute)[index],
+        )
 
     @property
-    def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        if (value := float(self.coordinator.data[f"T{self._input_number}_BASE"])) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+    def native_value(self) -> int | None:
+        """Return the state."""
+        return self._extract()
 
 
-class TeleinfoInputTotalHchpEdDevice(EdSensorEntity):
-    """Initialize the Teleinfo Input HCHP Total sensor."""
+class TeleinfoImbalanceEdDevice(EdSensorEntity):
+    """Initialize the Teleinfo Input phase imbalance sensor.
+
+    The largest deviation of a phase current from their mean, in percent of
+    the mean.
+    """
+
+    _attr_suggested_display_precision = 0
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            tuple(f"T{self._input_number}_IINST{phase}" for phase in PHASES),
+            lambda snapshot: snapshot.teleinfo[self._input_number].imbalance,
+        )
 
     @property
     def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        value_hc = float(self.coordinator.data[f"T{self._input_number}_HCHC"])
-        value_hp = float(self.coordinator.data[f"T{self._input_number}_HCHP"])
-        if (value := value_hc + value_hp) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+        """Return the state."""
+        return self._extract()
+
+
+class TeleinfoInputTotalEdDevice(EdTotalSensorEntity):
+    """Initialize the Teleinfo Input Total sensor."""
 
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"T{self._input_number}_BASE",),
+            lambda snapshot: snapshot.teleinfo[self._input_number].base,
+        )
+
+
+class TeleinfoInputTotalHchpEdDevice(EdTotalSensorEntity):
+    """Initialize the Teleinfo Input HCHP Total sensor."""
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"T{self._input_number}_HCHC", f"T{self._input_number}_HCHP"),
+            lambda snapshot: snapshot.teleinfo[self._input_number].total_hchp,
+        )
 
-class TeleinfoInputTotalHcEdDevice(EdSensorEntity):
+
+class TeleinfoInputTotalHcEdDevice(EdTotalSensorEntity):
     """Initialize the Teleinfo Input HC Total sensor."""
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        if (value := float(self.coordinator.data[f"T{self._input_number}_HCHC"])) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"T{self._input_number}_HCHC",),
+            lambda snapshot: snapshot.teleinfo[self._input_number].hchc,
+        )
 
 
-class TeleinfoInputTotalHpEdDevice(EdSensorEntity):
+class TeleinfoInputTotalHpEdDevice(EdTotalSensorEntity):
     """Initialize the Teleinfo Input HP Total sensor."""
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        if (value := float(self.coordinator.data[f"T{self._input_number}_HCHP"])) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"T{self._input_number}_HCHP",),
+            lambda snapshot: snapshot.teleinfo[self._input_number].hchp,
+        )
 
 
-class TeleinfoInputTotalTempoEdDevice(EdSensorEntity):
+class TeleinfoInputTotalTempoEdDevice(EdTotalSensorEntity):
     """Initialize the Teleinfo Input Tempo Total sensor."""
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        value = 0.0
-        for key in TELEINFO_TEMPO_ATTR.values():
-            value += float(self.coordinator.data[f"T{self._input_number}_{key}"])
-        if value > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            tuple(f"T{self._input_number}_{key}" for key in TEMPO_INDEX_KEYS),
+            lambda snapshot: snapshot.teleinfo[self._input_number].total_tempo,
+        )
 
 
-class TeleinfoInputTempoEdDevice(EdSensorEntity):
+class TeleinfoInputTempoEdDevice(EdTotalSensorEntity):
     """Initialize the Teleinfo Input Tempo sensor."""
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0 or the previous value."""
-        if (value := float(self.coordinator.data[self._input_name.upper()])) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value
-                return value
-            _LOGGER.warning(
-                "Value %s for %s not greater or equal to the previous one %s, ignore",
-                value,
-                self.entity_id,
-                self._last_state,
-            )
-            return None
-        _LOGGER.debug("Value for %s equal to 0, ignore", self.entity_id)
-        return None
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        index = TEMPO_INDEX_KEYS.index(self._input_name.split("_", 1)[1])
+        return ValueExtractor(
+            (self._input_name.upper(),),
+            lambda snapshot: snapshot.teleinfo[self._input_number].tempo[index],
+        )
+
+
+class TeleinfoInputTotalEjpEdDevice(EdTotalSensorEntity):
+    """Initialize the Teleinfo Input EJP Total sensor."""
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            tuple(f"T{self._input_number}_{key}" for key in TELEINFO_EJP_ATTR.values()),
+            lambda snapshot: snapshot.teleinfo[self._input_number].total_ejp,
+        )
+
+
+class TeleinfoInputEjpEdDevice(EdTotalSensorEntity):
+    """Initialize the Teleinfo Input EJP sensor."""
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        # ejphn or ejphpm, named after the key
+        attribute = self._input_name.split("_", 1)[1].lower()
+        return ValueExtractor(
+            (self._input_name,),
+            lambda snapshot: getattr(snapshot.teleinfo[self._input_number], attribute),
+        )
 
 
 class TeleinfoInputColor(EdSensorEntity):
@@ -508,50 +950,61 @@ class TeleinfoInputColor(EdSensorEntity):
         "❓",
     ]
 
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        if self._input_name.endswith("_DEMAIN"):
+            return ValueExtractor(
+                (self._input_name,),
+                lambda snapshot: snapshot.teleinfo[self._input_number].color_tomorrow,
+            )
+        return ValueExtractor(
+            (self._input_name,),
+            lambda snapshot: snapshot.teleinfo[self._input_number].color,
+        )
+
     @property
     def native_value(self) -> str | None:
         """Return the state."""
-        if type_heure := self.coordinator.data.get(self._input_name):
-            if type_heure.endswith("JB"):
-                return "🔵"
-            if type_heure.endswith("JW"):
-                return "⚪"
-            if type_heure.endswith("JR"):
-                return "🔴"
-        return "❓"
+        return self._extract().symbol
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
-        color_name = "inconnu"
-        if type_heure := self.coordinator.data.get(self._input_name):
-            if type_heure.endswith("JB"):
-                color_name = "Bleu"
-            if type_heure.endswith("JW"):
-                color_name = "Blanc"
-            if type_heure.endswith("JR"):
-                color_name = "Ro" + "uge"  # bypass codespell
-        return {"name": color_name}
+        return {"name": self._extract().label}
 
 
 class MeterInputEdDevice(EdSensorEntity):
     """Initialize the meter input sensor."""
 
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"meter{self._input_number + 1}",),
+            lambda snapshot: divided(
+                snapshot.meters[self._input_number].current, self._divider_factor
+            ),
+        )
+
+    def _build_data_keys(self) -> tuple[str, ...]:
+        """Return the coordinator data keys the sensor depends on."""
+        return (
+            *self._extractor.keys,
+            f"count{self._input_number - 1}",
+            f"c{self._input_number - 1}_fuel",
+        )
+
     @property
     def native_value(self) -> float:
         """Return the state."""
-        value = int(self.coordinator.data[f"meter{self._input_number + 1}"])
-        if self._divider_factor:
-            return value / self._divider_factor
-        return value
+        return self._extract()
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
         if self.coordinator.data:
             return {
-                "total": self.coordinator.data[f"count{self._input_number - 1}"],
-                "fuel": self.coordinator.data[f"c{self._input_number - 1}_fuel"],
+                "total": self.coordinator.data.raw[f"count{self._input_number - 1}"],
+                "fuel": self.coordinator.data.meters[self._input_number].fuel,
             }
         raise EcoDevicesIncorrectValueError("Data not received.")
 
@@ -559,32 +1012,432 @@ class MeterInputEdDevice(EdSensorEntity):
 class MeterInputDailyEdDevice(EdSensorEntity):
     """Initialize the meter input daily sensor."""
 
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"c{self._input_number - 1}day",),
+            lambda snapshot: divided(
+                snapshot.meters[self._input_number].daily, self._divider_factor
+            ),
+        )
+
     @property
     def native_value(self) -> float:
         """Return the state."""
-        value = int(self.coordinator.data[f"c{self._input_number - 1}day"])
-        if self._divider_factor:
-            return value / self._divider_factor
-        return value
+        return self._extract()
 
 
-class MeterInputTotalEdDevice(EdSensorEntity):
+class MeterInputTotalEdDevice(EdTotalSensorEntity):
     """Initialize the meter input total sensor."""
 
+    _counter_max_rate = None
+    _counter_divider = 1000
+
+    def _build_extractor(self) -> ValueExtractor:
+        """Return the extractor of the sensor value."""
+        return ValueExtractor(
+            (f"count{self._input_number - 1}",),
+            lambda snapshot: snapshot.meters[self._input_number].total,
+        )
+
+
+class TeleinfoWindowEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of a statistic of the recent teleinfo power or current."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+
+    def __init__(
+        self,
+        controller: EcoDevices,
+        coordinator: EcoDevicesCoordinator,
+        sampler: PowerSampler,
+        input_number: int,
+        quantity: str,
+        statistic: WindowStatistic,
+        window: float,
+        percentile: float,
+        name: str,
+        unit: str,
+        device_class: SensorDeviceClass,
+    ) -> None:
+        """Initialize the sensor, only the apparent power mean being enabled."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._sampler = sampler
+        self._input_number = input_number
+        self._quantity = quantity
+        self._statistic = statistic
+        self._window_seconds = window
+        self._percentile = percentile
+        self._window: SlidingWindow | None = None
+        self.settings = (window, percentile)
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_entity_registry_enabled_default = (
+            quantity == QUANTITY_PAPP and statistic is WindowStatistic.MEAN
+        )
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_"
+            f"T{input_number}_{quantity}_{statistic}"
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Start sampling the quantity, only for the enabled sensors."""
+        self._window = self._sampler.window(
+            self._input_number, self._quantity, self._window_seconds
+        )
+        await super().async_added_to_hass()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop sampling the quantity, unless another sensor uses its window."""
+        await super().async_will_remove_from_hass()
+        self._window = None
+        self._sampler.release(self._input_number, self._quantity, self._window_seconds)
+
+    def _value(self) -> float | None:
+        """Return the statistic of the samples of the window."""
+        if self._window is None:
+            return None
+        return self._window.statistic(self._statistic, self._percentile)
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the statistic, moving with the samples."""
+        return (self.coordinator.last_update_success, self._value())
+
     @property
     def native_value(self) -> float | None:
-        """Return the total value if it's greater than 0."""
-        if (
-            value := float(self.coordinator.data[f"count{self._input_number - 1}"])
-        ) > 0:
-            if self._last_state is None or value >= float(self._last_state):
-                self._last_state = value / 1000
-                return value / 1000
-        _LOGGER.warning(
-            "Total value for meter input %s not greater than 0, ignore",
-            self._input_number,
-        )
-        return None
+        """Return the statistic of the window."""
+        return self._value()
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the window settings."""
+        attributes: dict[str, Any] = {"window": self._window_seconds}
+        if self._statistic is WindowStatistic.PERCENTILE:
+            attributes["percentile"] = self._percentile
+        return attributes
+
+
+class MeterInputRateEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of the flow rate of a meter input, from its counter."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:speedometer"
+
+    def __init__(
+        self,
+        controller: EcoDevices,
+        coordinator: EcoDevicesCoordinator,
+        rates: MeterRates,
+        input_number: int,
+        smoothed: bool,
+        name: str,
+        unit: str | None,
+        divider_factor: float | None,
+    ) -> None:
+        """Initialize the sensor, in the unit of the meter per unit of time."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._rate: RateMeter = rates.rate(input_number)
+        self._smoothed = smoothed
+        self.settings = (unit, divider_factor)
+        if unit in RATE_UNITS:
+            unit, self._seconds, self._attr_device_class = RATE_UNITS[unit]
+        else:
+            self._seconds = 3600
+            unit = f"{unit}/h" if unit else None
+        self._scale = self._seconds / (divider_factor or 1)
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_c{input_number}_rate"
+            + ("_smoothed" if smoothed else "")
+        )
+
+    def _value(self) -> float | None:
+        """Return the rate in the unit of the sensor."""
+        rate = self._rate.smoothed if self._smoothed else self._rate.rate
+        if rate is None:
+            return None
+        return rate * self._scale
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the rate, updated on every reading of the counter."""
+        return (self.coordinator.last_update_success, self._value())
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rate."""
+        return self._value()
+
+
+class TeleinfoCostEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of the cost of a tariff period of a teleinfo input."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:cash"
+
+    def __init__(
+        self,
+        controller: EcoDevices,
+        coordinator: EcoDevicesCoordinator,
+        engine: CostEngine,
+        input_number: int,
+        period: TariffPeriod,
+        name: str,
+        currency: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._engine = engine
+        self._key = (input_number, period)
+        self.settings = (currency,)
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = currency
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_"
+            f"T{input_number}_cost_{period}"
+        )
+
+    def _value(self) -> float | None:
+        """Return the cost of the period since it has a price."""
+        if (cost := self._engine.costs.get(self._key)) is None:
+            return None
+        return cost.total
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the cost, moving with the index of the period."""
+        return (self.coordinator.last_update_success, self._value())
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the cost."""
+        return self._value()
+
+
+class TeleinfoCostSumEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of the cost of a teleinfo input today or this month."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:cash-multiple"
+
+    def __init__(
+        self,
+        controller: EcoDevices,
+        coordinator: EcoDevicesCoordinator,
+        engine: CostEngine,
+        input_number: int,
+        month: bool,
+        name: str,
+        currency: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._engine = engine
+        self._input_number = input_number
+        self._month = month
+        self.settings = (currency,)
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = currency
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_"
+            f"T{input_number}_cost_{'month' if month else 'day'}"
+        )
+
+    def _costs(self) -> dict[TariffPeriod, float]:
+        """Return the costs of the day or month, by tariff period."""
+        return {
+            period: cost.month if self._month else cost.day
+            for period, cost in self._engine.input_costs(self._input_number).items()
+        }
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the costs and the day they started over."""
+        return (
+            self.coordinator.last_update_success,
+            self._engine.day,
+            *self._costs().values(),
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the cost of all the periods."""
+        return sum(self._costs().values())
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the start of the day or month."""
+        return self._engine.last_reset(self._month)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the cost of each period."""
+        return {period.value: round(cost, 2) for period, cost in self._costs().items()}
+
+
+class PollingIntervalEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of the effective polling interval of the Eco-Devices."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-sync-outline"
+
+    def __init__(
+        self, controller: EcoDevices, coordinator: EcoDevicesCoordinator
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._attr_name = "Polling interval"
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_polling_interval"
+        )
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the update interval, the only value the sensor depends on."""
+        return (self.coordinator.poll_interval,)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the interval is known even when the last poll failed."""
+        return True
+
+    @property
+    def native_value(self) -> float:
+        """Return the current update interval in seconds."""
+        return self.coordinator.poll_interval.total_seconds()
+
+
+class ConnectionStateEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of the circuit breaker state of the Eco-Devices."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_options = [state.value for state in BreakerState]
+    _attr_icon = "mdi:lan-connect"
+
+    def __init__(
+        self, controller: EcoDevices, coordinator: EcoDevicesCoordinator
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._attr_name = "Connection state"
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_connection_state"
+        )
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the breaker state and its failure counter."""
+        breaker = self.coordinator.breaker
+        return (breaker.state, breaker.failures)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the state is known even when the last poll failed."""
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the breaker state."""
+        return self.coordinator.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the failures and the delay before the next probe."""
+        breaker = self.coordinator.breaker
+        return {"failures": breaker.failures, "retry_delay": round(breaker.delay)}
+
+
+class PollDurationEdDevice(SensorEntity):
+    """Representation of the last poll duration, with the fleet statistics."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 3
+    _attr_should_poll = False
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, controller: EcoDevices, fleet_member: FleetMember) -> None:
+        """Initialize the sensor."""
+        self.controller = controller
+        self._fleet_member = fleet_member
+        self._attr_name = "Poll duration"
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_poll_duration"
+        )
+        self._attr_device_info = fleet_member.coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for the fleet statistics updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._fleet_member.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last poll in seconds."""
+        return self._fleet_member.last_duration
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the health and timing statistics."""
+        return self._fleet_member.statistics()
+
+
+class PollRecordEdDevice(EcoDevicesEntity, SensorEntity):
+    """Representation of a measure of the last successful poll."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:gauge"
+
+    def __init__(
+        self,
+        controller: EcoDevices,
+        coordinator: EcoDevicesCoordinator,
+        key: str,
+        name: str,
+        unit: str,
+        device_class: SensorDeviceClass,
+        getter: Callable[[PollRecord], float],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.controller = controller
+        self._getter = getter
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_unique_id = slugify(
+            f"{DOMAIN}_{self.controller.mac_address}_sensor_{key}"
+        )
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the poll generation, the measures change on every poll."""
+        return (self.coordinator.last_update_success, self.coordinator.generation)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the measure of the last poll."""
+        if (record := self.coordinator.instrumentation.last) is None:
+            return None
+        return self._getter(record)
 
 
 class EcoDevicesIncorrectValueError(Exception):
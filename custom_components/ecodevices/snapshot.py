@@ -0,0 +1,408 @@
+"""Normalized snapshot of the Eco-Devices data, parsed once per update."""
+
+from collections.abc import Callable
+from enum import Enum, StrEnum
+from operator import itemgetter
+from typing import Any
+
+from .const import (
+    CONF_TI_TYPE_BASE,
+    CONF_TI_TYPE_EJP,
+    CONF_TI_TYPE_HCHP,
+    CONF_TI_TYPE_TEMPO,
+    TELEINFO_TEMPO_ATTR,
+)
+
+TELEINFO_INPUTS = (1, 2)
+METER_INPUTS = (1, 2)
+TEMPO_INDEX_KEYS = tuple(TELEINFO_TEMPO_ATTR.values())
+_NO_TEMPO: tuple[float | None, ...] = (None,) * len(TEMPO_INDEX_KEYS)
+PHASES = (1, 2, 3)
+_NO_PHASES: tuple[int | None, ...] = (None,) * len(PHASES)
+
+
+class TariffPeriod(StrEnum):
+    """Tariff period reported by the teleinfo PTEC field."""
+
+    UNKNOWN = "unknown"
+    TH = "th"
+    HC = "hc"
+    HP = "hp"
+    HN = "hn"
+    PM = "pm"
+    HCJB = "hcjb"
+    HPJB = "hpjb"
+    HCJW = "hcjw"
+    HPJW = "hpjw"
+    HCJR = "hcjr"
+    HPJR = "hpjr"
+
+    @classmethod
+    def from_ptec(cls, ptec: str | None) -> "TariffPeriod | None":
+        """Return the period of a PTEC value, None if it is not reported."""
+        if not ptec:
+            return None
+        code = ptec.strip(" .").lower()
+        if (period := _PERIODS.get(code)) is not None:
+            return period
+        return _PERIODS.get(code[:2], cls.UNKNOWN)
+
+    @property
+    def off_peak(self) -> bool:
+        """Return True for the off-peak (heures creuses) periods."""
+        return self in _OFF_PEAK
+
+
+_PERIODS = {period.value: period for period in TariffPeriod}
+_OFF_PEAK = frozenset(period for period in TariffPeriod if period.value[:2] == "hc")
+
+# Tariff period of each teleinfo index, in the order of TeleinfoSnapshot.indexes
+TELEINFO_PERIODS = (
+    TariffPeriod.TH,
+    TariffPeriod.HC,
+    TariffPeriod.HP,
+    TariffPeriod.HN,
+    TariffPeriod.PM,
+    TariffPeriod.HCJB,
+    TariffPeriod.HPJB,
+    TariffPeriod.HCJW,
+    TariffPeriod.HPJW,
+    TariffPeriod.HCJR,
+    TariffPeriod.HPJR,
+)
+# Tariff periods of the indexes of each contract
+CONTRACT_PERIODS = {
+    CONF_TI_TYPE_BASE: (TariffPeriod.TH,),
+    CONF_TI_TYPE_HCHP: (TariffPeriod.HC, TariffPeriod.HP),
+    CONF_TI_TYPE_EJP: (TariffPeriod.HN, TariffPeriod.PM),
+    CONF_TI_TYPE_TEMPO: TELEINFO_PERIODS[5:],
+}
+
+
+class TempoColor(Enum):
+    """Tempo day color, as a symbol and a French label."""
+
+    BLUE = ("🔵", "Bleu")
+    WHITE = ("⚪", "Blanc")
+    RED = ("🔴", "Ro" + "uge")  # bypass codespell
+    UNKNOWN = ("❓", "inconnu")
+
+    @classmethod
+    def from_value(cls, value: str | None) -> "TempoColor":
+        """Return the color of a PTEC or DEMAIN value."""
+        if value:
+            if value.endswith("JB"):
+                return cls.BLUE
+            if value.endswith("JW"):
+                return cls.WHITE
+            if value.endswith("JR"):
+                return cls.RED
+        return cls.UNKNOWN
+
+    @property
+    def symbol(self) -> str:
+        """Return the color symbol."""
+        return self.value[0]
+
+    @property
+    def label(self) -> str:
+        """Return the color name."""
+        return self.value[1]
+
+
+def _to_float(value: Any) -> float | None:
+    """Return the value as a float, None if it is missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> int | None:
+    """Return the value as an integer, None if it is missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sum(values: tuple[float | None, ...]) -> float | None:
+    """Return the sum of the values, None if one of them is missing."""
+    try:
+        return sum(values)
+    except TypeError:
+        return None
+
+
+def detect_contract(data: dict[str, Any], input_number: int) -> str | None:
+    """Return the contract of a teleinfo input, None if it reports nothing.
+
+    The contract is given by the OPTARIF field, or guessed from the indexes
+    the meter reports if it is missing.
+    """
+    prefix = f"T{input_number}_"
+    optarif = (data.get(prefix + "OPTARIF") or "").strip(" .").upper()
+    if optarif.startswith("BBR"):
+        return CONF_TI_TYPE_TEMPO
+    if optarif.startswith("HC"):
+        return CONF_TI_TYPE_HCHP
+    if optarif.startswith("EJP"):
+        return CONF_TI_TYPE_EJP
+    if optarif == "BASE":
+        return CONF_TI_TYPE_BASE
+    for contract, key in (
+        (CONF_TI_TYPE_TEMPO, TEMPO_INDEX_KEYS[0]),
+        (CONF_TI_TYPE_HCHP, "HCHC"),
+        (CONF_TI_TYPE_EJP, "EJPHN"),
+        (CONF_TI_TYPE_BASE, "BASE"),
+    ):
+        if _to_float(data.get(prefix + key)):
+            return contract
+    return None
+
+
+def detect_three_phase(data: dict[str, Any], input_number: int) -> bool:
+    """Return True if a teleinfo input reports the current of the phases."""
+    prefix = f"T{input_number}_"
+    return any(
+        _to_int(data.get(f"{prefix}{key}{phase}")) is not None
+        for key in ("IINST", "IMAX")
+        for phase in PHASES
+    )
+
+
+def _imbalance(currents: tuple[int | None, ...]) -> float | None:
+    """Return the largest deviation from the mean current, in percent of it."""
+    if None in currents or not (total := sum(currents)):
+        return None
+    mean = total / len(currents)
+    return max(abs(current - mean) for current in currents) / mean * 100
+
+
+# Raw keys of the teleinfo indexes, in the order of TELEINFO_PERIODS
+_INDEX_KEYS = ("BASE", "HCHC", "HCHP", "EJPHN", "EJPHPM", *TEMPO_INDEX_KEYS)
+_NO_INDEXES: tuple[float | None, ...] = (None,) * len(_INDEX_KEYS)
+# Position of the indexes of each contract, all of them while it is not known
+_CONTRACT_INDEXES = {
+    None: slice(0, len(_INDEX_KEYS)),
+    CONF_TI_TYPE_BASE: slice(0, 1),
+    CONF_TI_TYPE_HCHP: slice(1, 3),
+    CONF_TI_TYPE_EJP: slice(3, 5),
+    CONF_TI_TYPE_TEMPO: slice(5, 11),
+}
+# Missing indexes before and after the ones of each contract
+_CONTRACT_PADDING = {
+    contract: (_NO_INDEXES[: indexes.start], _NO_INDEXES[indexes.stop :])
+    for contract, indexes in _CONTRACT_INDEXES.items()
+}
+# Raw keys of the values of each input, built once
+_INPUT_KEYS = {
+    number: tuple(f"T{number}_{key}" for key in ("PAPP", "IINST", "PTEC", "DEMAIN"))
+    for number in TELEINFO_INPUTS
+}
+_INPUT_INDEX_KEYS = {
+    (number, contract): tuple(f"T{number}_{key}" for key in _INDEX_KEYS[indexes])
+    for number in TELEINFO_INPUTS
+    for contract, indexes in _CONTRACT_INDEXES.items()
+}
+_INPUT_PHASE_KEYS = {
+    number: tuple(
+        f"T{number}_{key}{phase}" for key in ("IINST", "IMAX") for phase in PHASES
+    )
+    for number in TELEINFO_INPUTS
+}
+
+
+def _items_getter(keys: tuple[str, ...]) -> Callable[[dict[str, Any]], tuple]:
+    """Return a getter of the values of the keys, raising KeyError if one is missing."""
+    if len(keys) == 1:
+        return lambda data: (data[keys[0]],)
+    return itemgetter(*keys)
+
+
+_INPUT_INDEX_GETTERS = {
+    number_contract: _items_getter(keys)
+    for number_contract, keys in _INPUT_INDEX_KEYS.items()
+}
+
+
+def _parse_indexes(raw: tuple[Any, ...]) -> tuple[float | None, ...]:
+    """Return the raw indexes as floats, None for the missing or invalid ones."""
+    try:
+        return tuple(map(float, raw))
+    except (TypeError, ValueError):
+        return tuple(map(_to_float, raw))
+
+
+class TeleinfoSnapshot:
+    """Parsed values of a teleinfo input.
+
+    Only the indexes of the contract are parsed, the others are None; all of
+    them are parsed while the contract is not known. The phases are parsed
+    for the three-phase meters only. The indexes, phases and tariff periods
+    whose raw values did not change since the previous snapshot of the input
+    are taken from it instead of being parsed again.
+    """
+
+    __slots__ = (
+        "_raw_indexes",
+        "_raw_phases",
+        "base",
+        "color",
+        "color_tomorrow",
+        "demain",
+        "ejphn",
+        "ejphpm",
+        "hchc",
+        "hchp",
+        "iinst",
+        "iinst_phases",
+        "imax_phases",
+        "imbalance",
+        "papp",
+        "period",
+        "ptec",
+        "tempo",
+        "total_ejp",
+        "total_hchp",
+        "total_tempo",
+    )
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        input_number: int,
+        contract: str | None = None,
+        three_phase: bool = False,
+        previous: "TeleinfoSnapshot | None" = None,
+    ) -> None:
+        """Parse the values of the teleinfo input from the raw data."""
+        get = data.get
+        papp, iinst, self.ptec, self.demain = map(get, _INPUT_KEYS[input_number])
+        self.papp = _to_int(papp)
+        self.iinst = _to_int(iinst)
+
+        raw_phases = self._raw_phases = (
+            tuple(map(get, _INPUT_PHASE_KEYS[input_number])) if three_phase else None
+        )
+        if previous is not None and previous._raw_phases == raw_phases:
+            self.iinst_phases = previous.iinst_phases
+            self.imax_phases = previous.imax_phases
+            self.imbalance = previous.imbalance
+        else:
+            self.iinst_phases = self.imax_phases = _NO_PHASES
+            if raw_phases is not None:
+                phases = tuple(map(_to_int, raw_phases))
+                self.iinst_phases = phases[: len(PHASES)]
+                self.imax_phases = phases[len(PHASES) :]
+            self.imbalance = _imbalance(self.iinst_phases)
+
+        try:
+            raw = _INPUT_INDEX_GETTERS[input_number, contract](data)
+        except KeyError:
+            raw = tuple(map(get, _INPUT_INDEX_KEYS[input_number, contract]))
+        raw_indexes = self._raw_indexes = (contract, raw)
+        if previous is not None and previous._raw_indexes == raw_indexes:
+            self.base = previous.base
+            self.hchc = previous.hchc
+            self.hchp = previous.hchp
+            self.ejphn = previous.ejphn
+            self.ejphpm = previous.ejphpm
+            self.tempo = previous.tempo
+            self.total_hchp = previous.total_hchp
+            self.total_ejp = previous.total_ejp
+            self.total_tempo = previous.total_tempo
+        else:
+            parsed = _parse_indexes(raw)
+            before, after = _CONTRACT_PADDING[contract]
+            values = before + parsed + after
+            self.base, self.hchc, self.hchp, self.ejphn, self.ejphpm = values[:5]
+            self.tempo = values[5:]
+            self.total_hchp = self.total_ejp = self.total_tempo = None
+            # The indexes of a known contract are the ones it totals
+            if contract == CONF_TI_TYPE_TEMPO:
+                self.total_tempo = _sum(parsed)
+            elif contract == CONF_TI_TYPE_HCHP:
+                self.total_hchp = _sum(parsed)
+            elif contract == CONF_TI_TYPE_EJP:
+                self.total_ejp = _sum(parsed)
+            elif contract is None:
+                self.total_hchp = _sum(values[1:3])
+                self.total_ejp = _sum(values[3:5])
+                self.total_tempo = _sum(self.tempo)
+
+        if previous is not None and previous.ptec == self.ptec:
+            self.period = previous.period
+            self.color = previous.color
+        else:
+            self.period = TariffPeriod.from_ptec(self.ptec)
+            self.color = TempoColor.from_value(self.ptec)
+        if previous is not None and previous.demain == self.demain:
+            self.color_tomorrow = previous.color_tomorrow
+        else:
+            self.color_tomorrow = TempoColor.from_value(self.demain)
+
+    def indexes(self) -> tuple[float | None, ...]:
+        """Return the indexes, in the order of TELEINFO_PERIODS."""
+        return (
+            self.base,
+            self.hchc,
+            self.hchp,
+            self.ejphn,
+            self.ejphpm,
+            *self.tempo,
+        )
+
+
+class MeterSnapshot:
+    """Parsed values of a meter input."""
+
+    __slots__ = ("current", "daily", "fuel", "total")
+
+    def __init__(self, data: dict[str, Any], input_number: int) -> None:
+        """Parse the values of the meter input from the raw data."""
+        self.current = _to_int(data.get(f"meter{input_number + 1}"))
+        self.daily = _to_int(data.get(f"c{input_number - 1}day"))
+        self.total = _to_float(data.get(f"count{input_number - 1}"))
+        self.fuel = data.get(f"c{input_number - 1}_fuel")
+
+
+class EcoDevicesSnapshot:
+    """Values of the enabled inputs of an Eco-Devices for one coordinator update."""
+
+    __slots__ = ("generation", "meters", "raw", "teleinfo")
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        generation: int,
+        teleinfo_inputs: tuple[int, ...] = TELEINFO_INPUTS,
+        meter_inputs: tuple[int, ...] = METER_INPUTS,
+        contracts: dict[int, str] | None = None,
+        three_phase_inputs: tuple[int, ...] = (),
+        previous: "EcoDevicesSnapshot | None" = None,
+    ) -> None:
+        """Parse the raw data returned by the Eco-Devices.
+
+        The values which did not change since the previous snapshot, if any,
+        are taken from it.
+        """
+        self.raw = data
+        self.generation = generation
+        contracts = contracts or {}
+        previous_teleinfo = previous.teleinfo if previous is not None else {}
+        self.teleinfo = {
+            number: TeleinfoSnapshot(
+                data,
+                number,
+                contracts.get(number),
+                number in three_phase_inputs,
+                previous_teleinfo.get(number),
+            )
+            for number in teleinfo_inputs
+        }
+        self.meters = {number: MeterSnapshot(data, number) for number in meter_inputs}
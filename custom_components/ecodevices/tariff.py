@@ -0,0 +1,138 @@
+"""Tariff period and Tempo color transitions of the teleinfo, fired as events."""
+
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, EVENT_COLOR_TOMORROW_CHANGED, EVENT_TARIFF_CHANGED
+from .coordinator import EcoDevicesCoordinator
+from .snapshot import TariffPeriod, TempoColor, TeleinfoSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TariffTracker:
+    """Follow the tariff period of the teleinfo inputs, as a state machine.
+
+    The period is parsed once per coordinator update with the snapshot. The
+    first period read is only remembered, then an event is fired on every
+    transition, so automations react to it instead of watching the states.
+    The color of tomorrow (DEMAIN) is followed the same way, so the Tempo
+    color announced for the next day fires its own event.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: EcoDevicesCoordinator,
+    ) -> None:
+        """Initialize the tracker, the periods being unknown."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self.periods: dict[int, TariffPeriod] = {}
+        self.colors_tomorrow: dict[int, TempoColor] = {}
+        self.transitions = 0
+        self._generation: int | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the coordinator updates, return the stop callback."""
+        return self.coordinator.async_add_listener(self._async_handle_update)
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Fire an event for the inputs whose period or next color changed."""
+        data = self.coordinator.data
+        if data is None or data.generation == self._generation:
+            return
+        self._generation = data.generation
+
+        for number, teleinfo in data.teleinfo.items():
+            self._async_period_update(number, teleinfo)
+            self._async_color_tomorrow_update(number, teleinfo)
+
+    @callback
+    def _async_period_update(self, number: int, teleinfo: TeleinfoSnapshot) -> None:
+        """Fire an event if the tariff period of an input changed."""
+        if (period := teleinfo.period) is None:
+            return
+        previous = self.periods.get(number)
+        self.periods[number] = period
+        if previous is None or previous is period:
+            return
+        _LOGGER.debug(
+            "Teleinfo %s of %s goes from %s to %s",
+            number,
+            self.coordinator.controller.host,
+            previous,
+            period,
+        )
+        self.transitions += 1
+        self.hass.bus.async_fire(
+            EVENT_TARIFF_CHANGED,
+            {
+                "device_id": self._device_id(),
+                "entry_id": self.entry.entry_id,
+                "input": number,
+                "old_period": previous.value,
+                "new_period": period.value,
+                "off_peak": period.off_peak,
+                "color": teleinfo.color.name.lower(),
+                "color_tomorrow": teleinfo.color_tomorrow.name.lower(),
+            },
+        )
+
+    @callback
+    def _async_color_tomorrow_update(
+        self, number: int, teleinfo: TeleinfoSnapshot
+    ) -> None:
+        """Fire an event if the Tempo color of tomorrow of an input changed."""
+        if teleinfo.demain is None:
+            return
+        color = teleinfo.color_tomorrow
+        previous = self.colors_tomorrow.get(number)
+        self.colors_tomorrow[number] = color
+        if previous is None or previous is color:
+            return
+        _LOGGER.debug(
+            "Tempo color of tomorrow of teleinfo %s of %s goes from %s to %s",
+            number,
+            self.coordinator.controller.host,
+            previous,
+            color,
+        )
+        self.hass.bus.async_fire(
+            EVENT_COLOR_TOMORROW_CHANGED,
+            {
+                "device_id": self._device_id(),
+                "entry_id": self.entry.entry_id,
+                "input": number,
+                "old_color": previous.name.lower(),
+                "new_color": color.name.lower(),
+            },
+        )
+
+    def _device_id(self) -> str | None:
+        """Return the ID of the device in the registry."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.coordinator.controller.mac_address)}
+        )
+        return device.id if device else None
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the current periods and colors of tomorrow, and the transitions."""
+        return {
+            "periods": {
+                number: period.value for number, period in self.periods.items()
+            },
+            "colors_tomorrow": {
+                number: color.name.lower()
+                for number, color in self.colors_tomorrow.items()
+            },
+            "transitions": self.transitions,
+        }
@@ -0,0 +1,51 @@
+"""Write policies limiting the states recorded for fast-moving sensors."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class WritePolicy:
+    """When a changed sensor value is worth writing.
+
+    A value is held back while it stays within the deadband of the last
+    written one, the largest of the absolute and the relative deadband, or
+    when the last write is more recent than the minimum interval. After the
+    maximum interval, any change is written whatever the deadband: a value
+    held back is written on a timer then, even if no new value comes.
+    """
+
+    deadband: float = 0
+    deadband_percent: float = 0
+    min_interval: float = 0
+    max_interval: float = 0
+
+    @classmethod
+    def from_config(
+        cls, config: Mapping[str, Any], keys: tuple[str, str, str, str]
+    ) -> "WritePolicy | None":
+        """Return the policy set by the options, None if nothing is throttled."""
+        policy = cls(*(float(config.get(key) or 0) for key in keys))
+        return policy if policy != cls() else None
+
+    def allows(self, value: Any, written_value: Any, elapsed: float) -> bool:
+        """Return True if the value may be written, elapsed since the last write."""
+        if elapsed < self.min_interval:
+            return False
+        if self.max_interval and elapsed >= self.max_interval:
+            return True
+        try:
+            change = abs(value - written_value)
+        except TypeError:
+            # Not a number, or no value written yet
+            return True
+        return change > max(
+            self.deadband, abs(written_value) * self.deadband_percent / 100
+        )
+
+    def held_for(self, elapsed: float) -> float | None:
+        """Return the seconds before a held value is written, None if not timed."""
+        if not self.max_interval:
+            return None
+        return max(0.0, max(self.min_interval, self.max_interval) - elapsed)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the per-tick CPU cost of reading the sensor values.
+
+Compare the former per-access key building and parsing of a Tempo teleinfo
+input (power, total, six indexes, two colors) with the snapshot parsed once per
+tick and read through the precompiled extractors. The power and the index of
+the current period move on every tick, as they do under load.
+
+Each entity is read once per tick by default, as Home Assistant does when it
+writes the state: its value, and its attributes if it has some. The counters
+which now validate the indexes replace the former checks against the last
+state, neither of them is measured.
+
+The tick is measured for the entities alone, then with the consumers which run
+with every teleinfo input: the hourly energy statistics and the costs read the
+indexes, the tariff tracker the period and the color of tomorrow. Without the
+snapshot, each of them would parse the raw values it reads.
+
+Usage: python scripts/bench_extractors.py [ticks] [reads_per_tick]
+"""
+
+from collections.abc import Callable
+import importlib
+from pathlib import Path
+import sys
+import timeit
+import types
+from typing import Any
+
+# Load the modules without the package __init__, which needs Home Assistant.
+PACKAGE = types.ModuleType("ecodevices")
+PACKAGE.__path__ = [
+    str(Path(__file__).resolve().parent.parent / "custom_components" / "ecodevices")
+]
+sys.modules[PACKAGE.__name__] = PACKAGE
+const = importlib.import_module("ecodevices.const")
+extractor = importlib.import_module("ecodevices.extractor")
+snapshot = importlib.import_module("ecodevices.snapshot")
+
+TEMPO_KEYS = ("BBRHCJB", "BBRHPJB", "BBRHCJW", "BBRHPJW", "BBRHCJR", "BBRHPJR")
+ROUNDS = 10
+# Teleinfo frame of a single-phase Tempo meter
+DATA = {
+    "T1_ADCO": "021800000001",
+    "T1_OPTARIF": "BBR(",
+    "T1_ISOUSC": "45",
+    "T1_PTEC": "HPJB",
+    "T1_PAPP": "00780",
+    "T1_IINST": "003",
+    "T1_IMAX": "090",
+    "T1_HHPHC": "A",
+    "T1_MOTDETAT": "000000",
+    "T1_DEMAIN": "BLEU",
+    **{
+        f"T1_{key}": f"{index * 1000 + 123456:09d}"
+        for index, key in enumerate(TEMPO_KEYS)
+    },
+}
+
+
+def legacy_color(value: str | None) -> tuple[str, dict[str, str]]:
+    """Return the state and the attributes of a color the way they used to be."""
+    state = "❓"
+    if value:
+        if value.endswith("JB"):
+            state = "🔵"
+        elif value.endswith("JW"):
+            state = "⚪"
+        elif value.endswith("JR"):
+            state = "🔴"
+    color_name = "inconnu"
+    if value:
+        if value.endswith("JB"):
+            color_name = "Bleu"
+        if value.endswith("JW"):
+            color_name = "Blanc"
+        if value.endswith("JR"):
+            color_name = "Rouge"
+    return state, {"name": color_name}
+
+
+def legacy_tick(data: dict, input_number: int, reads: int) -> None:
+    """Read the states the way the properties used to."""
+    for _ in range(reads):
+        (
+            data[f"T{input_number}_PAPP"],
+            {
+                name: data.get(f"T{input_number}_{key}")
+                for name, key in const.TELEINFO_EXTRA_ATTR.items()
+            },
+        )
+        value = 0.0
+        for key in TEMPO_KEYS:
+            value += float(data[f"T{input_number}_{key}"])
+        for key in TEMPO_KEYS:
+            float(data[f"T{input_number}_{key}".upper()])
+        legacy_color(data.get(f"T{input_number}_PTEC"))
+        legacy_color(data.get(f"T{input_number}_DEMAIN"))
+
+
+def legacy_consumers(data: dict, input_number: int) -> None:
+    """Read the values of the consumers the per-access way."""
+    # The hourly energy statistics, then the costs
+    for _ in range(2):
+        for key in TEMPO_KEYS:
+            float(data[f"T{input_number}_{key}"])
+    snapshot.TariffPeriod.from_ptec(data.get(f"T{input_number}_PTEC"))
+    snapshot.TempoColor.from_value(data.get(f"T{input_number}_DEMAIN"))
+
+
+def build_entities(input_number: int) -> list[Callable[[Any], Any]]:
+    """Build the state readers of the same entities, through extractors."""
+    power = extractor.ValueExtractor(
+        (f"T{input_number}_PAPP",), lambda data: data.teleinfo[input_number].papp
+    )
+    # Attributes the meter reports, found on the first update
+    reported = tuple(
+        (name, key)
+        for name, value in const.TELEINFO_EXTRA_ATTR.items()
+        if (key := f"T{input_number}_{value}") in DATA
+    )
+    attributes = extractor.ValueExtractor(
+        tuple(key for _, key in reported),
+        lambda data: {name: data.raw.get(key) for name, key in reported},
+    )
+    total = extractor.ValueExtractor(
+        tuple(f"T{input_number}_{key}" for key in TEMPO_KEYS),
+        lambda data: data.teleinfo[input_number].total_tempo,
+    )
+    indexes = [
+        extractor.ValueExtractor(
+            (f"T{input_number}_{key}",),
+            lambda data, index=index: data.teleinfo[input_number].tempo[index],
+        )
+        for index, key in enumerate(TEMPO_KEYS)
+    ]
+    colors = [
+        extractor.ValueExtractor(
+            (f"T{input_number}_PTEC",),
+            lambda data: data.teleinfo[input_number].color,
+        ),
+        extractor.ValueExtractor(
+            (f"T{input_number}_DEMAIN",),
+            lambda data: data.teleinfo[input_number].color_tomorrow,
+        ),
+    ]
+    return [
+        lambda data: (power.read(data), attributes.read(data)),
+        total.read,
+        *(index.read for index in indexes),
+        *(
+            lambda data, color=color: (
+                color.read(data).symbol,
+                {"name": color.read(data).label},
+            )
+            for color in colors
+        ),
+    ]
+
+
+def consumers(data: Any, input_number: int) -> tuple:
+    """Read the values of the consumers from the snapshot."""
+    teleinfo = data.teleinfo[input_number]
+    return (
+        teleinfo.indexes(),
+        teleinfo.indexes(),
+        teleinfo.period,
+        teleinfo.color_tomorrow,
+    )
+
+
+def payloads(ticks: int) -> list[dict]:
+    """Return the data of each tick: the power and the current index move."""
+    return [
+        {
+            **DATA,
+            "T1_PAPP": f"{780 + tick % 50:05d}",
+            "T1_BBRHPJB": f"{124456 + tick:09d}",
+        }
+        for tick in range(ticks)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark, keeping the best of the rounds."""
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    entities = build_entities(1)
+    data = payloads(ticks)
+
+    def legacy(with_consumers: bool) -> None:
+        for payload in data:
+            legacy_tick(payload, 1, reads)
+            if with_consumers:
+                legacy_consumers(payload, 1)
+
+    def extractor_ticks(with_consumers: bool) -> None:
+        # Previous snapshot of the coordinator, the unchanged values are reused
+        previous = None
+        for generation, payload in enumerate(data):
+            previous = snapshot.EcoDevicesSnapshot(
+                payload, generation, (1,), (), {1: "tempo"}, (), previous
+            )
+            for _ in range(reads):
+                for read_state in entities:
+                    read_state(previous)
+            if with_consumers:
+                consumers(previous, 1)
+
+    print(f"{ticks} ticks, {len(entities)} entities, {reads} reads per tick")
+    for name, with_consumers in (("entities", False), ("+ consumers", True)):
+        # Interleave the rounds, so that a slower period of the machine does
+        # not favour one of them
+        legacy_time = compiled = float("inf")
+        for _ in range(ROUNDS):
+            legacy_time = min(
+                legacy_time, timeit.timeit(lambda: legacy(with_consumers), number=1)
+            )
+            compiled = min(
+                compiled,
+                timeit.timeit(lambda: extractor_ticks(with_consumers), number=1),
+            )
+        print(
+            f"{name:12} legacy {legacy_time / ticks * 1e6:6.2f} us/tick, "
+            f"snapshot {compiled / ticks * 1e6:6.2f} us/tick, "
+            f"speedup {legacy_time / compiled:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""End-to-end polling benchmark against the simulated Eco-Devices.
+
+Start the simulator with one device per config entry, set the entries up in a
+test Home Assistant instance through async_setup_entry, let the fleet poll for
+a while and report:
+
+- the poll latency percentiles measured by the fleet,
+- the CPU time of the event loop thread per poll,
+- the state writes (changed and reported states) per second.
+
+Needs Home Assistant and pytest-homeassistant-custom-component installed.
+
+Usage: python scripts/benchmark.py --entries 20 --duration 60 --t1 tempo --c1
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from homeassistant import loader
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+)
+from homeassistant.core import Event, callback
+from homeassistant.helpers import recorder as recorder_helper
+from homeassistant.setup import async_setup_component
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable-next=wrong-import-position
+from custom_components.ecodevices.const import (  # noqa: E402
+    CONF_C1_DIVIDER_FACTOR,
+    CONF_C1_ENABLED,
+    CONF_C1_TOTAL_UNIT_OF_MEASUREMENT,
+    CONF_C1_UNIT_OF_MEASUREMENT,
+    CONF_C2_DIVIDER_FACTOR,
+    CONF_C2_ENABLED,
+    CONF_C2_TOTAL_UNIT_OF_MEASUREMENT,
+    CONF_C2_UNIT_OF_MEASUREMENT,
+    CONF_T1_ENABLED,
+    CONF_T1_TYPE,
+    CONF_T2_ENABLED,
+    CONF_T2_TYPE,
+    CONF_TI_TYPE_AUTO,
+    CONF_TI_TYPES,
+    DOMAIN,
+    FLEET_MEMBER,
+)
+
+USERNAME = "admin"
+PASSWORD = "benchmark"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--scan-interval", type=int, default=5, help="seconds")
+    parser.add_argument("--port", type=int, default=18080, help="first port")
+    parser.add_argument("--t1", choices=CONF_TI_TYPES, default="tempo")
+    parser.add_argument("--t2", choices=CONF_TI_TYPES)
+    parser.add_argument("--c1", action="store_true")
+    parser.add_argument("--c2", action="store_true")
+    parser.add_argument("--idle", action="store_true", help="values do not move")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    return parser
+
+
+def start_simulator(args: argparse.Namespace) -> subprocess.Popen:
+    """Start the simulator of the benchmarked devices."""
+    command = [
+        sys.executable,
+        str(ROOT / "scripts" / "simulator.py"),
+        f"--count={args.entries}",
+        f"--port={args.port}",
+        f"--t1={args.t1}",
+        f"--latency={args.latency}",
+        f"--jitter={args.jitter}",
+        f"--failure-rate={args.failure_rate}",
+        f"--username={USERNAME}",
+        f"--password={PASSWORD}",
+    ]
+    if args.t2:
+        command.append(f"--t2={args.t2}")
+    command.extend(
+        flag
+        for flag, enabled in (
+            ("--c1", args.c1),
+            ("--c2", args.c2),
+            ("--idle", args.idle),
+        )
+        if enabled
+    )
+    simulator = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    if simulator.stdout.readline().strip() != "ready":
+        simulator.kill()
+        raise SystemExit("The simulator did not start")
+    return simulator
+
+
+def entry_data(args: argparse.Namespace, port: int) -> dict:
+    """Return the config entry data of a simulated device."""
+    return {
+        CONF_HOST: "127.0.0.1",
+        CONF_PORT: port,
+        CONF_USERNAME: USERNAME,
+        CONF_PASSWORD: PASSWORD,
+        CONF_SCAN_INTERVAL: args.scan_interval,
+        CONF_T1_ENABLED: True,
+        CONF_T2_ENABLED: bool(args.t2),
+        CONF_C1_ENABLED: args.c1,
+        CONF_C1_UNIT_OF_MEASUREMENT: "L",
+        CONF_C1_TOTAL_UNIT_OF_MEASUREMENT: "m³",
+        CONF_C1_DIVIDER_FACTOR: 1000,
+        CONF_C2_ENABLED: args.c2,
+        CONF_C2_UNIT_OF_MEASUREMENT: "L",
+        CONF_C2_TOTAL_UNIT_OF_MEASUREMENT: "m³",
+        CONF_C2_DIVIDER_FACTOR: 1000,
+    }
+
+
+def entry_options(args: argparse.Namespace) -> dict:
+    """Return the config entry options, with the teleinfo contracts."""
+    return {
+        CONF_T1_TYPE: args.t1,
+        CONF_T2_TYPE: args.t2 or CONF_TI_TYPE_AUTO,
+    }
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """Return a percentile of the values."""
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def async_benchmark(args: argparse.Namespace) -> None:
+    """Set up the entries, poll for the duration and report the measures."""
+    database = tempfile.mkdtemp()
+    async with async_test_home_assistant(config_dir=str(ROOT)) as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+        # Dependency of the integration, for the hourly statistics
+        recorder_helper.async_initialize_recorder(hass)
+        await async_setup_component(
+            hass, "recorder", {"recorder": {"db_url": f"sqlite:///{database}/db"}}
+        )
+
+        entries = [
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                unique_id=f"benchmark-{number}",
+                data=entry_data(args, args.port + number),
+                options=entry_options(args),
+            )
+            for number in range(args.entries)
+        ]
+        setup_start = time.perf_counter()
+        for entry in entries:
+            entry.add_to_hass(hass)
+            if not await hass.config_entries.async_setup(entry.entry_id):
+                raise SystemExit(f"Setup of {entry.data[CONF_HOST]} failed")
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - setup_start
+        entity_count = len(hass.states.async_entity_ids())
+
+        durations: list[float] = []
+        writes = 0
+
+        @callback
+        def _count_write(_event: Event) -> None:
+            nonlocal writes
+            writes += 1
+
+        @callback
+        def _accept(_event_data) -> bool:
+            return True
+
+        unsubs = [
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write),
+            hass.bus.async_listen(
+                EVENT_STATE_REPORTED, _count_write, event_filter=_accept
+            ),
+        ]
+        for entry in entries:
+            member = hass.data[DOMAIN][entry.entry_id][FLEET_MEMBER]
+
+            @callback
+            def _record(member=member) -> None:
+                if member.last_duration is not None:
+                    durations.append(member.last_duration)
+
+            unsubs.append(member.async_add_listener(_record))
+
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        cpu = time.thread_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+        for unsub in unsubs:
+            unsub()
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await hass.async_stop()
+    shutil.rmtree(database)
+
+    polls = len(durations)
+    print(f"{args.entries} entries, {entity_count} entities, {wall:.0f} s")
+    print(f"setup:           {setup_time:8.2f} s")
+    print(f"polls:           {polls:8d} ({polls / wall:.2f}/s)")
+    if polls >= 2:
+        print(f"poll p50:        {percentile(durations, 50) * 1000:8.1f} ms")
+        print(f"poll p90:        {percentile(durations, 90) * 1000:8.1f} ms")
+        print(f"poll p99:        {percentile(durations, 99) * 1000:8.1f} ms")
+    if polls:
+        print(f"loop CPU/poll:   {cpu / polls * 1000:8.2f} ms")
+    print(f"loop CPU:        {cpu / wall * 100:8.2f} %")
+    print(f"state writes/s:  {writes / wall:8.2f}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = build_parser().parse_args()
+    simulator = start_simulator(args)
+    try:
+        asyncio.run(async_benchmark(args))
+    finally:
+        simulator.terminate()
+        simulator.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Stand-in for the push of the GCE Eco-Devices.
+
+Send the values of a simulated Eco-Devices to the webhook of a config entry in
+push mode, as the query string of a GET (the default, like the device) or as a
+POST form, JSON object or XML document.
+
+Usage: python scripts/push_client.py http://127.0.0.1:8123/api/webhook/<id> \
+    --t1 tempo --c1 --interval 1
+"""
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+from simulator import SimulatedEcoDevices, build_parser
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_push(args) -> None:
+    """Push the values at the interval until cancelled."""
+    device = SimulatedEcoDevices(0, args)
+    async with aiohttp.ClientSession() as session:
+        while True:
+            device.advance()
+            values = device.status()
+            for teleinfo_input in device.teleinfo:
+                values.update(teleinfo_input.values())
+
+            start = time.perf_counter()
+            if args.format == "query":
+                request = session.get(args.url, params=values)
+            elif args.format == "form":
+                request = session.post(args.url, data=values)
+            elif args.format == "json":
+                request = session.post(args.url, json=values)
+            else:
+                body = "".join(f"<{k}>{v}</{k}>" for k, v in values.items())
+                request = session.post(
+                    args.url,
+                    data=f"<response>{body}</response>",
+                    headers={"Content-Type": "text/xml"},
+                )
+            try:
+                async with request as response:
+                    _LOGGER.info(
+                        "Pushed %s values: %s in %.1f ms",
+                        len(values),
+                        response.status,
+                        (time.perf_counter() - start) * 1000,
+                    )
+            except aiohttp.ClientError as err:
+                _LOGGER.warning("Push failed: %s", err)
+            await asyncio.sleep(args.interval)
+
+
+def main() -> None:
+    """Run the push client."""
+    parser = build_parser()
+    parser.description = __doc__.splitlines()[0]
+    parser.add_argument("url", help="webhook URL")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds")
+    parser.add_argument(
+        "--format", choices=("query", "form", "json", "xml"), default="query"
+    )
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(async_push(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Local simulator of GCE Eco-Devices.
+
+Serve the status.xml and teleinfo XML documents of one or more Eco-Devices,
+with BASE, HC/HP, EJP or Tempo contracts on the teleinfo inputs and evolving
+meter counters, optionally with latency, jitter and failures.
+
+Usage: python scripts/simulator.py --count 10 --port 8080 --t1 tempo --c1
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import random
+import time
+
+from aiohttp import BasicAuth, hdrs, web
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTRACTS = ("base", "hchp", "ejp", "tempo")
+TEMPO_COLORS = {"blue": "JB", "white": "JW", "red": "JR"}
+TEMPO_TOMORROW = {"blue": "BLEU", "white": "BLAN", "red": "ROUG"}
+
+
+@dataclass
+class TeleinfoInput:
+    """Simulated teleinfo input."""
+
+    number: int
+    contract: str
+    three_phase: bool
+    tempo_color: str
+    idle: bool
+    papp: int = 800
+    indexes: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Initialize the indexes of the contract."""
+        keys = {
+            "base": ("BASE",),
+            "hchp": ("HCHC", "HCHP"),
+            "ejp": ("EJPHN", "EJPHPM"),
+            "tempo": tuple(
+                f"BBRH{period}{color}"
+                for color in TEMPO_COLORS.values()
+                for period in ("C", "P")
+            ),
+        }[self.contract]
+        self.indexes = {key: random.randint(1_000_000, 9_000_000) for key in keys}
+
+    def period_key(self) -> str:
+        """Return the index key of the current tariff period."""
+        off_peak = not 6 <= time.localtime().tm_hour < 22
+        if self.contract == "base":
+            return "BASE"
+        if self.contract == "hchp":
+            return "HCHC" if off_peak else "HCHP"
+        if self.contract == "ejp":
+            return "EJPHN"
+        color = TEMPO_COLORS[self.tempo_color]
+        return f"BBRH{'C' if off_peak else 'P'}{color}"
+
+    def ptec(self) -> str:
+        """Return the current PTEC value."""
+        key = self.period_key()
+        if key == "BASE":
+            return "TH.."
+        if key in ("HCHC", "HCHP"):
+            return f"{key[2:]}.."
+        if key == "EJPHN":
+            return "HN.."
+        return key[3:]
+
+    def advance(self, elapsed: float) -> None:
+        """Move the power and the index of the current period."""
+        if self.idle:
+            return
+        self.papp = max(0, min(12000, self.papp + random.randint(-150, 150)))
+        self.indexes[self.period_key()] += self.papp * elapsed / 3600
+
+    def values(self) -> dict[str, str]:
+        """Return the XML values of the input."""
+        prefix = f"T{self.number}_"
+        iinst = round(self.papp / 230)
+        values = {
+            "ADCO": f"0218{self.number:08d}",
+            "OPTARIF": {
+                "base": "BASE",
+                "hchp": "HC..",
+                "ejp": "EJP.",
+                "tempo": "BBR(",
+            }[self.contract],
+            "ISOUSC": "45",
+            "PTEC": self.ptec(),
+            "PAPP": f"{self.papp:05d}",
+            "HHPHC": "A",
+            "MOTDETAT": "000000",
+            **{key: f"{int(value):09d}" for key, value in self.indexes.items()},
+        }
+        if self.three_phase:
+            values.update(
+                {
+                    **{
+                        f"IINST{phase}": f"{iinst // 3 + phase:03d}"
+                        for phase in (1, 2, 3)
+                    },
+                    **{f"IMAX{phase}": "060" for phase in (1, 2, 3)},
+                    "PPOT": "00",
+                }
+            )
+        else:
+            values.update({"IINST": f"{iinst:03d}", "IMAX": "090"})
+        if self.contract == "tempo":
+            values["DEMAIN"] = TEMPO_TOMORROW[self.tempo_color]
+        return {prefix + key: value for key, value in values.items()}
+
+
+@dataclass
+class MeterInput:
+    """Simulated pulse meter input."""
+
+    number: int
+    idle: bool
+    count: int = 0
+    daily: int = 0
+    flow: float = 1.0
+
+    def advance(self, elapsed: float) -> None:
+        """Count the pulses since the previous request."""
+        if self.idle:
+            return
+        self.flow = max(0.0, self.flow + random.uniform(-0.5, 0.5))
+        pulses = round(self.flow * elapsed)
+        self.count += pulses
+        self.daily += pulses
+
+    def values(self) -> dict[str, str]:
+        """Return the status values of the meter."""
+        index = self.number - 1
+        return {
+            f"meter{self.number + 1}": str(round(self.flow * 60)),
+            f"c{index}day": str(self.daily),
+            f"count{index}": str(self.count),
+            f"c{index}_fuel": "0",
+        }
+
+
+class SimulatedEcoDevices:
+    """One simulated Eco-Devices."""
+
+    def __init__(self, number: int, args: argparse.Namespace) -> None:
+        """Initialize the device."""
+        self.args = args
+        self.mac = f"00:04:A3:00:{number // 256:02X}:{number % 256:02X}"
+        self.teleinfo = [
+            TeleinfoInput(
+                index, contract, args.three_phase, args.tempo_color, args.idle
+            )
+            for index, contract in ((1, args.t1), (2, args.t2))
+            if contract
+        ]
+        self.meters = [
+            MeterInput(index, args.idle)
+            for index, enabled in ((1, args.c1), (2, args.c2))
+            if enabled
+        ]
+        self._last_update = time.monotonic()
+        self.requests = 0
+
+    def advance(self) -> None:
+        """Move all the values since the previous request."""
+        now = time.monotonic()
+        elapsed, self._last_update = now - self._last_update, now
+        for teleinfo_input in self.teleinfo:
+            teleinfo_input.advance(elapsed)
+        for meter in self.meters:
+            meter.advance(elapsed)
+
+    def status(self) -> dict[str, str]:
+        """Return the status.xml values."""
+        values = {"version": "3.00.02", "config_mac": self.mac}
+        for meter in self.meters:
+            values.update(meter.values())
+        for teleinfo_input in self.teleinfo:
+            values[f"T{teleinfo_input.number}_PAPP"] = f"{teleinfo_input.papp:05d}"
+        return values
+
+    def teleinfo_values(self, number: int) -> dict[str, str]:
+        """Return the teleinfo XML values of an input."""
+        for teleinfo_input in self.teleinfo:
+            if teleinfo_input.number == number:
+                return teleinfo_input.values()
+        return {}
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve a document, with the configured latency and failures."""
+        self.requests += 1
+        args = self.args
+        if request.path.startswith("/protect/") and args.username:
+            auth = request.headers.get(hdrs.AUTHORIZATION)
+            if auth is None or BasicAuth.decode(auth) != BasicAuth(
+                args.username, args.password or ""
+            ):
+                raise web.HTTPUnauthorized
+
+        await asyncio.sleep(max(0.0, random.gauss(args.latency, args.jitter)))
+
+        if random.random() < args.failure_rate:
+            if args.failure_mode == "timeout":
+                await asyncio.sleep(3600)
+            request.transport.close()
+            return web.Response()
+
+        self.advance()
+        if request.path == "/status.xml":
+            values = self.status()
+        elif request.path == "/protect/settings/teleinfo1.xml":
+            values = self.teleinfo_values(1)
+        elif request.path == "/protect/settings/teleinfo2.xml":
+            values = self.teleinfo_values(2)
+        else:
+            raise web.HTTPNotFound
+        body = "".join(f"<{key}>{value}</{key}>" for key, value in values.items())
+        return web.Response(
+            text=f'<?xml version="1.0" encoding="utf-8"?><response>{body}</response>',
+            content_type="text/xml",
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="first port")
+    parser.add_argument("--count", type=int, default=1, help="number of devices")
+    parser.add_argument("--t1", choices=CONTRACTS, default="tempo")
+    parser.add_argument("--t2", choices=CONTRACTS)
+    parser.add_argument("--c1", action="store_true")
+    parser.add_argument("--c2", action="store_true")
+    parser.add_argument("--three-phase", action="store_true")
+    parser.add_argument("--tempo-color", choices=TEMPO_COLORS, default="blue")
+    parser.add_argument("--idle", action="store_true", help="values do not move")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-mode", choices=("reset", "timeout"), default="reset")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    return parser
+
+
+async def async_serve(args: argparse.Namespace) -> None:
+    """Serve the simulated devices until cancelled."""
+    runners = []
+    for number in range(args.count):
+        device = SimulatedEcoDevices(number, args)
+        app = web.Application()
+        app.router.add_get("/{path:.*}", device.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, args.host, args.port + number).start()
+        runners.append(runner)
+    _LOGGER.info(
+        "Serving %s Eco-Devices on %s:%s-%s",
+        args.count,
+        args.host,
+        args.port,
+        args.port + args.count - 1,
+    )
+    # Tell a parent process the devices are ready
+    print("ready", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Run the simulator."""
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(async_serve(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the GCE Eco-Devices integration."""
@@ -0,0 +1,102 @@
+"""Fixtures for the Eco-Devices tests."""
+
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
+
+from custom_components.ecodevices.const import (
+    CONF_C1_ENABLED,
+    CONF_C2_ENABLED,
+    CONF_T1_ENABLED,
+    CONF_T1_TYPE,
+    CONF_T2_ENABLED,
+    CONF_T2_TYPE,
+    CONF_TI_TYPE_AUTO,
+    DOMAIN,
+)
+
+HOST = "192.168.1.20"
+PORT = 80
+MAC_ADDRESS = "00:04:A3:01:02:03"
+
+STATUS = {"version": "3.00.02", "config_mac": MAC_ADDRESS, "T1_PAPP": "00780"}
+TELEINFO_1 = {
+    "T1_ADCO": "021800000001",
+    "T1_OPTARIF": "BBR(",
+    "T1_ISOUSC": "45",
+    "T1_PTEC": "HPJB",
+    "T1_PAPP": "00780",
+    "T1_IINST": "003",
+    "T1_IMAX": "090",
+    "T1_BBRHCJB": "001000000",
+    "T1_BBRHPJB": "002000000",
+    "T1_BBRHCJW": "000100000",
+    "T1_BBRHPJW": "000200000",
+    "T1_BBRHCJR": "000010000",
+    "T1_BBRHPJR": "000020000",
+    "T1_DEMAIN": "BLEU",
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Load the integration from custom_components, with its recorder."""
+    return
+
+
+@pytest.fixture
+def device_data() -> dict[str, dict[str, str]]:
+    """Return the documents served by the mocked Eco-Devices, by source."""
+    return {"status": dict(STATUS), "teleinfo1": dict(TELEINFO_1), "teleinfo2": {}}
+
+
+@pytest.fixture
+def mock_device(device_data: dict[str, dict[str, str]]) -> Generator[Any]:
+    """Serve the device data instead of requesting an Eco-Devices."""
+
+    async def _get_sources(self, sources, record=None, request_timeout=None):
+        result: dict[str, str] = {}
+        for source in sources:
+            result.update(device_data[source])
+        return result
+
+    with patch(
+        "custom_components.ecodevices.api.EcoDevicesClient.get_sources",
+        _get_sources,
+    ) as get_sources:
+        yield get_sources
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return the config entry of an Eco-Devices with its first teleinfo input."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        unique_id=f"{DOMAIN}_{HOST}_{PORT}",
+        title=f"Eco-Devices {HOST}:{PORT}",
+        data={
+            CONF_HOST: HOST,
+            CONF_PORT: PORT,
+            CONF_USERNAME: "",
+            CONF_PASSWORD: "",
+            CONF_SCAN_INTERVAL: 5,
+            CONF_T1_ENABLED: True,
+            CONF_T1_TYPE: CONF_TI_TYPE_AUTO,
+            CONF_T2_ENABLED: False,
+            CONF_T2_TYPE: CONF_TI_TYPE_AUTO,
+            CONF_C1_ENABLED: False,
+            CONF_C2_ENABLED: False,
+        },
+    )
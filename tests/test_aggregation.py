@@ -0,0 +1,87 @@
+"""Tests for the hourly energy aggregation."""
+
+from datetime import datetime
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.ecodevices.const import COORDINATOR, DOMAIN
+
+STATISTIC_ID = f"{DOMAIN}:00_04_a3_01_02_03_t1_hpjb"
+
+
+async def _async_setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up the entry and wait for the statistics to be loaded."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def _async_push(hass: HomeAssistant, entry: MockConfigEntry, index: int) -> None:
+    """Push a new index of the current tariff period."""
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    coordinator.async_push({"T1_BBRHPJB": f"{index:09d}"})
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_restart_in_the_middle_of_an_hour(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_device,
+    device_data: dict[str, dict[str, str]],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the consumption before, while and after a restart is imported."""
+    freezer.move_to("2026-10-18 10:05:00+00:00")
+    config_entry.add_to_hass(hass)
+    await _async_setup(hass, config_entry)
+    # The first readings load the last statistic then set the baseline
+    await _async_push(hass, config_entry, 2_000_000)
+    await _async_push(hass, config_entry, 2_000_000)
+    freezer.move_to("2026-10-18 10:20:00+00:00")
+    await _async_push(hass, config_entry, 2_000_500)
+
+    # The hour in progress is imported when unloaded
+    freezer.move_to("2026-10-18 10:30:00+00:00")
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await async_wait_recording_done(hass)
+
+    # The index moved while stopped, the first reading only loads the sum
+    # and the index of the last statistic
+    freezer.move_to("2026-10-18 10:40:00+00:00")
+    device_data["teleinfo1"]["T1_BBRHPJB"] = "002000800"
+    await _async_setup(hass, config_entry)
+    await hass.data[DOMAIN][config_entry.entry_id][COORDINATOR].async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.move_to("2026-10-18 10:45:00+00:00")
+    await _async_push(hass, config_entry, 2_000_900)
+    freezer.move_to("2026-10-18 11:01:00+00:00")
+    await _async_push(hass, config_entry, 2_001_000)
+    await async_wait_recording_done(hass)
+
+    statistics = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime(2026, 10, 18, 9, tzinfo=dt_util.UTC),
+        None,
+        {STATISTIC_ID},
+        "hour",
+        None,
+        {"sum", "state"},
+    )
+    rows = statistics[STATISTIC_ID]
+    assert len(rows) == 1
+    assert (
+        rows[0]["start"] == datetime(2026, 10, 18, 10, tzinfo=dt_util.UTC).timestamp()
+    )
+    assert rows[0]["sum"] == 900
+    assert rows[0]["state"] == 2_000_900
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,112 @@
+"""Tests for the circuit breaker of the Eco-Devices."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ecodevices.breaker import BreakerState, CircuitBreaker
+from custom_components.ecodevices.const import BREAKER_JITTER
+
+
+class Clock:
+    """Monotonic clock moved by the tests."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """Replace the monotonic clock of the breaker."""
+    clock = Clock()
+    with patch(
+        "custom_components.ecodevices.breaker.time", SimpleNamespace(monotonic=clock)
+    ):
+        yield clock
+
+
+@pytest.fixture
+def no_jitter():
+    """Remove the jitter of the breaker delays."""
+    with patch("custom_components.ecodevices.breaker.random.uniform", return_value=1.0):
+        yield
+
+
+@pytest.mark.usefixtures("no_jitter")
+def test_opens_after_the_threshold(clock: Clock) -> None:
+    """Test the breaker opens after the consecutive failures, then half-opens."""
+    breaker = CircuitBreaker(failure_threshold=3, base_delay=10, max_delay=100)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.allow_request()
+    assert breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.delay == 10
+    assert breaker.retry_in == 10
+
+    clock.now = 9.5
+    assert not breaker.allow_request()
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.retry_in == 0.5
+
+    clock.now = 10
+    assert breaker.allow_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+
+
+@pytest.mark.usefixtures("no_jitter")
+def test_failed_probe_doubles_the_delay(clock: Clock) -> None:
+    """Test a failed probe opens the breaker again for twice the delay."""
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=10, max_delay=35)
+    breaker.record_failure()
+    for delay in (20, 35, 35):
+        clock.now += breaker.delay
+        assert breaker.allow_request()
+        assert breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.delay == delay
+        assert breaker.retry_in == delay
+
+
+@pytest.mark.usefixtures("no_jitter")
+def test_success_resets_the_breaker(clock: Clock) -> None:
+    """Test a successful probe closes the breaker and restarts the delays."""
+    breaker = CircuitBreaker(failure_threshold=2, base_delay=10, max_delay=100)
+    assert not breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.delay == 20
+
+    clock.now = 20
+    assert breaker.allow_request()
+    assert breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.delay == 0
+
+    # The threshold and the base delay apply again
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.delay == 10
+
+
+def test_jitter_bounds(clock: Clock) -> None:
+    """Test the delays stay within the jitter of the exponential delay."""
+    for _ in range(200):
+        breaker = CircuitBreaker(failure_threshold=1, base_delay=10, max_delay=40)
+        for opens in range(4):
+            breaker.record_failure()
+            delay = min(40, 10 * 2**opens)
+            assert (
+                delay * (1 - BREAKER_JITTER)
+                <= breaker.delay
+                <= delay * (1 + BREAKER_JITTER)
+            )
+            assert breaker.retry_in == breaker.delay
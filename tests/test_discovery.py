@@ -0,0 +1,75 @@
+"""Tests for the discovery of the Eco-Devices of a network."""
+
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecodevices.api import (
+    async_get_host_session,
+    async_release_host_session,
+)
+from custom_components.ecodevices.const import DOMAIN, SESSIONS
+from custom_components.ecodevices.discovery import (
+    ProbeResult,
+    async_discover,
+    async_probe,
+)
+
+from .conftest import HOST, MAC_ADDRESS, PORT
+
+
+async def test_probe_releases_the_host_session(
+    hass: HomeAssistant, mock_device
+) -> None:
+    """Test a probe goes through the session of the host, then releases it."""
+    probe = await async_probe(hass, HOST, PORT)
+
+    assert probe.mac_address == MAC_ADDRESS
+    assert probe.teleinfo == {1: "tempo"}
+    assert HOST not in hass.data[DOMAIN][SESSIONS]
+
+
+async def test_discovery_stops_after_the_timeout(hass: HomeAssistant) -> None:
+    """Test the hosts not probed in time are given up."""
+    found = ProbeResult(HOST, PORT, MAC_ADDRESS, "3.00.02", {}, ())
+
+    async def _async_probe(hass, host, *args, **kwargs) -> ProbeResult:
+        if host != HOST:
+            await asyncio.sleep(3600)
+        return found
+
+    with (
+        patch("custom_components.ecodevices.discovery.DISCOVERY_TIMEOUT", 0.1),
+        patch("custom_components.ecodevices.discovery.async_probe", _async_probe),
+    ):
+        assert await async_discover(hass, [HOST, "192.168.1.21"], PORT) == [found]
+
+
+async def test_discovery_shares_one_session(
+    hass: HomeAssistant, device_data: dict[str, dict[str, str]]
+) -> None:
+    """Test the scan probes the unconfigured hosts through one session."""
+    sessions = {}
+
+    async def _get_sources(self, sources, record=None, request_timeout=None):
+        sessions[self.host] = self._session
+        result: dict[str, str] = {}
+        for source in sources:
+            result.update(device_data[source])
+        return result
+
+    configured = async_get_host_session(hass, HOST)
+    hosts = [HOST, "192.168.1.21", "192.168.1.22"]
+    with patch(
+        "custom_components.ecodevices.api.EcoDevicesClient.get_sources", _get_sources
+    ):
+        assert len(await async_discover(hass, hosts, PORT)) == 3
+
+    assert sessions[HOST] is configured
+    scan_session = sessions["192.168.1.21"]
+    assert sessions["192.168.1.22"] is scan_session
+    assert scan_session is not configured
+    assert scan_session.closed
+    assert list(hass.data[DOMAIN][SESSIONS]) == [HOST]
+    await async_release_host_session(hass, HOST)
@@ -0,0 +1,189 @@
+"""Tests for the scheduling of the polls by the fleet."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ecodevices.breaker import BreakerState, CircuitBreaker
+from custom_components.ecodevices.fleet import EcoDevicesFleet
+
+
+class FakeLoop:
+    """Event loop clock moved by the tests, recording the armed timer."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+        self.timer: float | None = None
+
+    def time(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def call_at(self, when: float, callback) -> SimpleNamespace:
+        """Arm the timer."""
+        self.timer = when
+        return SimpleNamespace(cancel=self.cancel)
+
+    def cancel(self) -> None:
+        """Cancel the timer."""
+        self.timer = None
+
+
+class FakeCoordinator:
+    """Coordinator whose requests take a while and fail while unreachable."""
+
+    def __init__(self, loop: FakeLoop, interval: float, duration: float = 0) -> None:
+        """Initialize the coordinator, reachable."""
+        self.loop = loop
+        self.poll_interval = timedelta(seconds=interval)
+        self.duration = duration
+        self.breaker = CircuitBreaker(failure_threshold=2, base_delay=30)
+        self.reachable = True
+        self.last_update_success = True
+        self.requests: list[float] = []
+        self.refused = 0
+
+    async def async_refresh(self) -> None:
+        """Request the device the way the coordinator does."""
+        if not self.breaker.allow_request():
+            self.refused += 1
+            self.last_update_success = False
+            return
+        self.requests.append(self.loop.now)
+        self.loop.now += self.duration
+        self.last_update_success = self.reachable
+        if self.reachable:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+
+@pytest.fixture
+def loop() -> FakeLoop:
+    """Return the loop of the fleet, also the clock of the breakers."""
+    loop = FakeLoop()
+    with (
+        patch(
+            "custom_components.ecodevices.breaker.time",
+            SimpleNamespace(monotonic=loop.time),
+        ),
+        patch("custom_components.ecodevices.breaker.random.uniform", return_value=1),
+    ):
+        yield loop
+
+
+@pytest.fixture
+def fleet(loop: FakeLoop) -> EcoDevicesFleet:
+    """Return a fleet running the polls when the tests move the clock."""
+    tasks = []
+    fleet = EcoDevicesFleet(
+        SimpleNamespace(
+            loop=loop,
+            is_stopping=False,
+            async_create_background_task=lambda coro, name: tasks.append(coro),
+        )
+    )
+    fleet.tasks = tasks
+    return fleet
+
+
+async def _async_run_until(fleet: EcoDevicesFleet, loop: FakeLoop, end: float) -> None:
+    """Fire the timer of the fleet and run the polls until the end time."""
+    while loop.timer is not None and loop.timer <= end:
+        loop.now = max(loop.now, loop.timer)
+        fleet._async_on_timer()
+        while fleet.tasks:
+            await fleet.tasks.pop(0)
+
+
+@pytest.mark.parametrize("duration", [0, 4])
+async def test_open_breaker_delays_the_next_poll(
+    fleet: EcoDevicesFleet, loop: FakeLoop, duration: float
+) -> None:
+    """Test the poll after the breaker opened is its probe, after its delay."""
+    coordinator = FakeCoordinator(loop, 10, duration)
+    member = fleet.async_register("entry", coordinator)
+    await _async_run_until(fleet, loop, 10)
+    assert coordinator.requests == [10]
+
+    coordinator.reachable = False
+    await _async_run_until(fleet, loop, 30)
+    assert coordinator.requests == [10, 20, 30]
+    assert coordinator.breaker.state is BreakerState.OPEN
+    opened = 30 + duration
+    assert member.next_poll == opened + 30
+
+    # Nothing is requested nor counted until the breaker lets the probe through
+    await _async_run_until(fleet, loop, opened + 29)
+    assert coordinator.requests == [10, 20, 30]
+    assert member.polls == 3
+    assert member.failures == 2
+
+    coordinator.reachable = True
+    await _async_run_until(fleet, loop, opened + 30)
+    assert coordinator.requests == [10, 20, 30, opened + 30]
+    assert coordinator.refused == 0
+    assert coordinator.breaker.state is BreakerState.CLOSED
+    assert member.polls == 4
+    assert member.consecutive_failures == 0
+
+
+async def test_failed_probe_doubles_the_wait(
+    fleet: EcoDevicesFleet, loop: FakeLoop
+) -> None:
+    """Test a failed probe is followed by the next probe after the doubled delay."""
+    coordinator = FakeCoordinator(loop, 10, 1)
+    coordinator.reachable = False
+    member = fleet.async_register("entry", coordinator)
+    await _async_run_until(fleet, loop, 20)
+    assert coordinator.requests == [10, 20]
+    await _async_run_until(fleet, loop, 51)
+    assert coordinator.requests == [10, 20, 51]
+    assert member.next_poll == 52 + 60
+
+    await _async_run_until(fleet, loop, 52 + 59)
+    assert coordinator.requests == [10, 20, 51]
+    await _async_run_until(fleet, loop, 52 + 60)
+    assert coordinator.requests == [10, 20, 51, 112]
+    assert coordinator.refused == 0
+    assert member.failures == 4
+
+
+async def test_polls_are_spread_over_the_interval(
+    fleet: EcoDevicesFleet, loop: FakeLoop
+) -> None:
+    """Test the devices are polled on evenly spread slots which do not drift."""
+    coordinators = [FakeCoordinator(loop, 30, 2) for _ in range(3)]
+    members = [
+        fleet.async_register(f"entry{index}", coordinator)
+        for index, coordinator in enumerate(coordinators)
+    ]
+    assert [member.next_poll for member in members] == [10, 20, 30]
+    assert loop.timer == 10
+
+    await _async_run_until(fleet, loop, 70)
+    assert [coordinator.requests for coordinator in coordinators] == [
+        [10, 40, 70],
+        [20, 50],
+        [30, 60],
+    ]
+    assert [member.last_wait for member in members] == [0, 0, 0]
+
+
+async def test_register_spreads_again(fleet: EcoDevicesFleet, loop: FakeLoop) -> None:
+    """Test a new device spreads the polls again, or is polled now if asked."""
+    first = fleet.async_register("entry1", FakeCoordinator(loop, 20))
+    assert first.next_poll == 20
+
+    loop.now = 5
+    second = fleet.async_register("entry2", FakeCoordinator(loop, 20))
+    assert (first.next_poll, second.next_poll) == (15, 25)
+    third = fleet.async_register("entry3", FakeCoordinator(loop, 60), poll_now=True)
+    assert third.next_poll == 5
+    assert loop.timer == 5
+
+    fleet.async_unregister("entry3")
+    assert loop.timer == first.next_poll
@@ -0,0 +1,62 @@
+"""Tests for the setup and unload of the Eco-Devices entries."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecodevices import async_migrate_entry
+from custom_components.ecodevices.const import (
+    BREAKERS,
+    CONF_T1_TYPE,
+    CONF_T2_TYPE,
+    CONF_TI_TYPE_AUTO,
+    CONF_TI_TYPE_BASE,
+    CONF_TI_TYPE_HCHP,
+    DOMAIN,
+)
+
+from .conftest import HOST, PORT
+
+
+async def test_unload_removes_the_breaker(
+    hass: HomeAssistant, mock_device, config_entry: MockConfigEntry
+) -> None:
+    """Test the breaker of an entry is forgotten when it is unloaded."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.entry_id in hass.data[DOMAIN][BREAKERS]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert config_entry.entry_id not in hass.data[DOMAIN][BREAKERS]
+
+
+async def test_migrate_keeps_the_chosen_contracts(hass: HomeAssistant) -> None:
+    """Test the migration to version 3 only sets the missing contracts to auto."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={CONF_HOST: HOST, CONF_PORT: PORT, CONF_T1_TYPE: CONF_TI_TYPE_BASE},
+        options={CONF_T2_TYPE: CONF_TI_TYPE_HCHP},
+    )
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={CONF_HOST: "192.168.1.21", CONF_PORT: PORT, CONF_T1_TYPE: False},
+    )
+    for config_entry in (entry, other):
+        config_entry.add_to_hass(hass)
+        assert await async_migrate_entry(hass, config_entry)
+        assert config_entry.version == 3
+
+    assert {**entry.data, **entry.options} == {
+        CONF_HOST: HOST,
+        CONF_PORT: PORT,
+        CONF_T1_TYPE: CONF_TI_TYPE_BASE,
+        CONF_T2_TYPE: CONF_TI_TYPE_HCHP,
+    }
+    assert other.options == {
+        CONF_T1_TYPE: CONF_TI_TYPE_AUTO,
+        CONF_T2_TYPE: CONF_TI_TYPE_AUTO,
+    }
@@ -0,0 +1,107 @@
+"""Tests for the rate-limited logging."""
+
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from custom_components.ecodevices.log import LogAggregator
+
+SUMMARY = "Suppressed %s similar log records: %s"
+
+
+@pytest.fixture
+def clock() -> SimpleNamespace:
+    """Replace the monotonic clock of the aggregator."""
+    clock = SimpleNamespace(now=0.0)
+    with patch(
+        "custom_components.ecodevices.log.time",
+        SimpleNamespace(monotonic=lambda: clock.now),
+    ):
+        yield clock
+
+
+@pytest.fixture
+def logger() -> MagicMock:
+    """Return a logger recording the records."""
+    logger = MagicMock(spec=logging.Logger)
+    logger.isEnabledFor.return_value = True
+    return logger
+
+
+def test_burst_then_refill(clock: SimpleNamespace, logger: MagicMock) -> None:
+    """Test a key logs a burst, then one record per refill period."""
+    aggregator = LogAggregator(logger, burst=2, refill_period=10, summary_interval=60)
+    for index in range(4):
+        aggregator.warning("poll", "Poll %s failed", index)
+    assert logger.log.call_args_list == [
+        call(logging.WARNING, "Poll %s failed", 0),
+        call(logging.WARNING, "Poll %s failed", 1),
+    ]
+
+    # Another key has its own bucket
+    aggregator.warning("push", "Push failed")
+    assert logger.log.call_count == 3
+
+    logger.log.reset_mock()
+    clock.now = 5
+    aggregator.warning("poll", "Poll %s failed", 4)
+    clock.now = 10
+    aggregator.warning("poll", "Poll %s failed", 5)
+    assert logger.log.call_args_list == [call(logging.WARNING, "Poll %s failed", 5)]
+
+
+def test_summary_of_the_suppressed_records(
+    clock: SimpleNamespace, logger: MagicMock
+) -> None:
+    """Test the suppressed records are summarized once per interval, at their level."""
+    aggregator = LogAggregator(logger, burst=1, refill_period=600, summary_interval=60)
+    aggregator.debug("a", "A")
+    aggregator.debug("a", "A")
+    aggregator.warning("b", "B")
+    aggregator.warning("b", "B")
+    aggregator.warning("b", "B")
+    assert logger.log.call_count == 2
+
+    clock.now = 60
+    aggregator.debug("a", "A")
+    assert logger.log.call_args_list[2:] == [
+        call(logging.WARNING, SUMMARY, 4, "a: 2, b: 2")
+    ]
+
+    # Nothing suppressed since the summary, none is logged
+    logger.log.reset_mock()
+    aggregator.flush()
+    logger.log.assert_not_called()
+
+
+def test_flush_forgets_the_full_buckets(
+    clock: SimpleNamespace, logger: MagicMock
+) -> None:
+    """Test a flush forgets the keys back to a full bucket."""
+    aggregator = LogAggregator(logger, burst=1, refill_period=10, summary_interval=60)
+    aggregator.warning("a", "A")
+    aggregator.warning("a", "A")
+    clock.now = 5
+    aggregator.warning("b", "B")
+    clock.now = 16
+    aggregator.flush()
+    assert logger.log.call_args_list[-1] == call(logging.WARNING, SUMMARY, 1, "a: 1")
+    assert list(aggregator._buckets) == ["a"]
+
+    # Back online, the flush logs nothing more
+    logger.log.reset_mock()
+    clock.now = 20
+    aggregator.flush()
+    logger.log.assert_not_called()
+    assert not aggregator._buckets
+
+
+def test_disabled_level_is_ignored(logger: MagicMock) -> None:
+    """Test the records of a disabled level neither log nor use tokens."""
+    logger.isEnabledFor.side_effect = lambda level: level >= logging.WARNING
+    aggregator = LogAggregator(logger, burst=1)
+    aggregator.debug("a", "A")
+    aggregator.warning("a", "A")
+    assert logger.log.call_args_list == [call(logging.WARNING, "A")]
@@ -0,0 +1,77 @@
+"""Tests for the flow rates of the meter inputs."""
+
+import math
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ecodevices.const import RATE_SMOOTHING_TIME
+from custom_components.ecodevices.rate import MeterRates, RateMeter
+from custom_components.ecodevices.snapshot import EcoDevicesSnapshot
+
+
+def test_rate_between_readings() -> None:
+    """Test the rate is the increase over the time between the readings."""
+    rate = RateMeter()
+    rate.update(100, 0)
+    assert rate.rate is None
+    assert rate.smoothed is None
+
+    rate.update(130, 10)
+    assert rate.rate == 3
+    assert rate.smoothed == 3
+
+    # Same time, or a glitch: nothing changes
+    rate.update(140, 10)
+    rate.update(None, 20)
+    assert rate.rate == 3
+
+    rate.update(190, 30)
+    assert rate.rate == 2.5
+    weight = 1 - math.exp(-20 / RATE_SMOOTHING_TIME)
+    assert rate.smoothed == pytest.approx(3 + weight * (2.5 - 3))
+
+
+def test_smoothing_weighs_the_elapsed_time() -> None:
+    """Test irregular readings at the same rate leave the smoothed rate as is."""
+    rate = RateMeter()
+    rate.update(0.5, 0)
+    for now, reading in ((1, 1.5), (61, 61.5), (62, 62.5), (662, 662.5)):
+        rate.update(reading, now)
+        assert rate.rate == 1
+        assert rate.smoothed == pytest.approx(1)
+
+
+def test_reset_starts_over() -> None:
+    """Test a confirmed counter reset starts over from the new value."""
+    rate = RateMeter()
+    rate.update(1000, 0)
+    rate.update(1100, 10)
+    assert rate.rate == 10
+    # Rejected until confirmed, then the first reading after the reset
+    rate.update(5, 20)
+    rate.update(6, 30)
+    assert rate.rate == 10
+    rate.update(7, 40)
+    assert rate.rate == 10
+    rate.update(27, 41)
+    assert rate.rate == 20
+
+
+def test_meter_rates_once_per_snapshot() -> None:
+    """Test the rates of the meters are fed once per coordinator update."""
+    rates = MeterRates(coordinator=None)
+    rate = rates.rate(1)
+    assert rates.rate(1) is rate
+    snapshot = None
+    clock = SimpleNamespace(monotonic=lambda: 0)
+    with patch("custom_components.ecodevices.rate.time", clock):
+        for generation, (now, count) in enumerate(((0, "100"), (10, "150"))):
+            clock.monotonic = lambda now=now: now
+            snapshot = EcoDevicesSnapshot(
+                {"count0": count}, generation, (), (1,), {}, (), snapshot
+            )
+            rates.update(snapshot)
+            rates.update(snapshot)
+    assert rate.rate == 5
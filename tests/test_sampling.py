@@ -0,0 +1,149 @@
+"""Tests for the windowed statistics of the teleinfo power."""
+
+from array import array
+import random
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.ecodevices.const import DOMAIN, SAMPLER
+from custom_components.ecodevices.sampling import (
+    QUANTITY_PAPP,
+    SlidingWindow,
+    WindowStatistic,
+    _ExtremumQueue,
+)
+
+
+def test_extremum_queue() -> None:
+    """Test the queue keeps the extremum of the samples still in the ring."""
+    values = array("d", bytes(8 * 4))
+    maximum = _ExtremumQueue(4, 1)
+    assert not maximum
+    for number, value in enumerate((3, 1, 2, 5, 4, 4)):
+        values[number % 4] = value
+        if number >= 4:
+            maximum.drop(number - 4)
+        maximum.push(number, value, values)
+    # 4 and 4 are left after the 5, the last equal one ranks first
+    assert maximum.first == 3
+    maximum.drop(3)
+    assert maximum.first == 5
+
+    minimum = _ExtremumQueue(4, -1)
+    for number, value in enumerate((3, 1, 2)):
+        values[number] = value
+        minimum.push(number, value, values)
+    assert minimum.first == 1
+    minimum.drop(0)
+    assert minimum.first == 1
+    minimum.drop(1)
+    assert minimum.first == 2
+
+
+def test_weighted_by_the_time_held() -> None:
+    """Test the samples weigh the time they were held, not their count."""
+    window = SlidingWindow(600)
+    assert window.mean is None
+    assert window.percentile(50) is None
+    window.add(100, 0)
+    assert window.mean == 100
+    assert window.percentile(95) == 100
+
+    # Polled fast during a peak: 1000 held 10 s, 100 held 90 s
+    window.add(1000, 90)
+    for now in range(91, 101):
+        window.add(1000, now)
+    window.add(100, 100)
+    assert len(window) == 13
+    assert window.mean == (100 * 90 + 1000 * 10) / 100
+    assert window.percentile(50) == 100
+    assert window.percentile(90) == 100
+    assert window.percentile(91) == 1000
+    assert window.max == 1000
+    assert window.min == 100
+    assert window.statistic(WindowStatistic.MEAN, 0) == window.mean
+
+
+def test_expired_samples() -> None:
+    """Test the samples older than the window are dropped, the last one kept."""
+    window = SlidingWindow(60)
+    window.add(10, 0)
+    window.add(20, 30)
+    window.add(30, 60)
+    assert window.mean == 15
+    window.add(40, 80)
+    assert len(window) == 3
+    assert window.mean == (20 * 30 + 30 * 20) / 50
+    assert window.min == 20
+
+    window.expire(200)
+    assert len(window) == 1
+    assert window.mean == window.max == window.min == window.percentile(50) == 40
+
+
+def test_full_rings_against_a_sorted_copy() -> None:
+    """Test the statistics of random samples overflowing the rings."""
+    rng = random.Random(1)
+    window = SlidingWindow(1e9, size=16)
+    samples: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(200):
+        now += rng.choice((0, 1, 2, 5))
+        value = float(rng.randint(0, 20))
+        window.add(value, now)
+        samples = [*samples, (value, now)][-16:]
+
+        held = [
+            (value, later[1] - time)
+            for (value, time), later in zip(samples, samples[1:], strict=False)
+        ]
+        span = samples[-1][1] - samples[0][1]
+        assert window.max == max(value for value, _ in samples)
+        assert window.min == min(value for value, _ in samples)
+        if span:
+            assert window.mean == pytest.approx(sum(v * h for v, h in held) / span)
+            total = 0.0
+            for value, duration in sorted(held):
+                total += duration
+                if total >= span / 2:
+                    break
+            assert window.percentile(50) == value
+
+
+async def test_window_removed_with_its_sensors(
+    hass: HomeAssistant, mock_device, config_entry: MockConfigEntry
+) -> None:
+    """Test the window of the power is removed with the last sensor using it."""
+    config_entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    max_id = registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "ecodevices_00_04_a3_01_02_03_sensor_t1_papp_max",
+        config_entry=config_entry,
+    ).entity_id
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    sampler = hass.data[DOMAIN][config_entry.entry_id][SAMPLER]
+    key = (1, QUANTITY_PAPP, 300)
+    assert sampler._users[key] == 2
+    # A new window starts with the current value
+    assert hass.states.get(max_id).state == "780.0"
+
+    registry.async_update_entity(max_id, disabled_by=er.RegistryEntryDisabler.USER)
+    await hass.async_block_till_done()
+    assert sampler._users[key] == 1
+
+    mean_id = registry.async_get_entity_id(
+        "sensor", DOMAIN, "ecodevices_00_04_a3_01_02_03_sensor_t1_papp_mean"
+    )
+    registry.async_update_entity(mean_id, disabled_by=er.RegistryEntryDisabler.USER)
+    await hass.async_block_till_done()
+    assert key not in sampler._windows
+    assert key not in sampler._users
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,46 @@
+"""Tests for the Eco-Devices sensors."""
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecodevices.const import COORDINATOR, DOMAIN
+
+from .conftest import TELEINFO_1
+
+
+async def test_rejected_readings_write_nothing(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_device,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the repeated rejected readings of an index do not write its state."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    state = hass.states.get("sensor.teleinfo_1_total")
+    assert state.state == "3330000.0"
+
+    zeros = {key: "000000000" for key in TELEINFO_1 if key.startswith("T1_BBRH")}
+    for _ in range(5):
+        freezer.tick(5)
+        coordinator.async_push(zeros)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.teleinfo_1_total") == state
+    assert hass.states.get("sensor.teleinfo_1_total").last_reported == (
+        state.last_reported
+    )
+
+    # The rejections are reported with the next accepted value
+    freezer.tick(5)
+    coordinator.async_push({"T1_BBRHPJB": "002000001"})
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.teleinfo_1_total")
+    assert state.state == "3330001.0"
+    assert state.attributes["rejected_zero"] == 5
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,62 @@
+"""Tests for the parsing of the Eco-Devices values."""
+
+import pytest
+
+from custom_components.ecodevices.const import (
+    CONF_TI_TYPE_BASE,
+    CONF_TI_TYPE_EJP,
+    CONF_TI_TYPE_HCHP,
+    CONF_TI_TYPE_TEMPO,
+)
+from custom_components.ecodevices.snapshot import TariffPeriod, detect_contract
+
+from .conftest import TELEINFO_1
+
+
+@pytest.mark.parametrize(
+    ("data", "contract"),
+    [
+        ({"T1_OPTARIF": "BBR("}, CONF_TI_TYPE_TEMPO),
+        ({"T1_OPTARIF": "HC.."}, CONF_TI_TYPE_HCHP),
+        ({"T1_OPTARIF": "EJP."}, CONF_TI_TYPE_EJP),
+        ({"T1_OPTARIF": "BASE"}, CONF_TI_TYPE_BASE),
+        ({"T1_OPTARIF": "base"}, CONF_TI_TYPE_BASE),
+        # OPTARIF wins over the indexes
+        ({**TELEINFO_1, "T1_OPTARIF": "HC.."}, CONF_TI_TYPE_HCHP),
+        # Guessed from the indexes without OPTARIF
+        ({"T1_BBRHCJB": "001000000"}, CONF_TI_TYPE_TEMPO),
+        ({"T1_HCHC": "001000000", "T1_HCHP": "0"}, CONF_TI_TYPE_HCHP),
+        ({"T1_OPTARIF": "", "T1_EJPHN": "001000000"}, CONF_TI_TYPE_EJP),
+        ({"T1_BASE": "001000000"}, CONF_TI_TYPE_BASE),
+        # Null indexes, other input or nothing reported
+        ({"T1_BASE": "000000000"}, None),
+        ({"T2_OPTARIF": "BASE"}, None),
+        ({}, None),
+    ],
+)
+def test_detect_contract(data: dict[str, str], contract: str | None) -> None:
+    """Test the contract is read from OPTARIF, or guessed from the indexes."""
+    assert detect_contract(data, 1) == contract
+
+
+@pytest.mark.parametrize(
+    ("ptec", "period"),
+    [
+        ("TH..", TariffPeriod.TH),
+        ("HC..", TariffPeriod.HC),
+        ("HP..", TariffPeriod.HP),
+        ("HN..", TariffPeriod.HN),
+        ("PM..", TariffPeriod.PM),
+        ("HCJB", TariffPeriod.HCJB),
+        ("HPJW", TariffPeriod.HPJW),
+        (" hpjr ", TariffPeriod.HPJR),
+        # Variants of the first two letters, unknown values
+        ("HCxx", TariffPeriod.HC),
+        ("XX..", TariffPeriod.UNKNOWN),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_tariff_period_from_ptec(ptec: str | None, period: TariffPeriod | None) -> None:
+    """Test the tariff period is read from the PTEC field."""
+    assert TariffPeriod.from_ptec(ptec) is period
@@ -0,0 +1,49 @@
+"""Tests for the tariff period and Tempo color events."""
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecodevices.const import (
+    COORDINATOR,
+    DOMAIN,
+    EVENT_COLOR_TOMORROW_CHANGED,
+    EVENT_TARIFF_CHANGED,
+)
+
+
+async def test_color_tomorrow_change_fires_an_event(
+    hass: HomeAssistant, mock_device, config_entry: MockConfigEntry
+) -> None:
+    """Test a new DEMAIN color fires an event, without a tariff transition."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    color_events = async_capture_events(hass, EVENT_COLOR_TOMORROW_CHANGED)
+    tariff_events = async_capture_events(hass, EVENT_TARIFF_CHANGED)
+    # The first values read are only remembered
+    coordinator.async_push({"T1_PAPP": "00790"})
+    await hass.async_block_till_done()
+
+    coordinator.async_push({"T1_DEMAIN": "HPJR"})
+    await hass.async_block_till_done()
+    coordinator.async_push({"T1_DEMAIN": "HPJR", "T1_PAPP": "00800"})
+    await hass.async_block_till_done()
+
+    assert len(color_events) == 1
+    assert color_events[0].data["input"] == 1
+    assert color_events[0].data["old_color"] == "unknown"
+    assert color_events[0].data["new_color"] == "red"
+    assert not tariff_events
+
+    coordinator.async_push({"T1_DEMAIN": "----"})
+    await hass.async_block_till_done()
+    assert len(color_events) == 2
+    assert color_events[1].data["old_color"] == "red"
+    assert color_events[1].data["new_color"] == "unknown"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,111 @@
+"""Tests for the write policies of the fast-moving sensors."""
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecodevices.const import (
+    CONF_POWER_DEADBAND,
+    CONF_POWER_MAX_INTERVAL,
+    CONF_POWER_WRITE_POLICY,
+    COORDINATOR,
+    DOMAIN,
+)
+from custom_components.ecodevices.throttle import WritePolicy
+
+
+def test_from_config() -> None:
+    """Test the policy is read from the options, None without throttling."""
+    assert WritePolicy.from_config({}, CONF_POWER_WRITE_POLICY) is None
+    assert WritePolicy.from_config(
+        {CONF_POWER_DEADBAND: "10", CONF_POWER_MAX_INTERVAL: None},
+        CONF_POWER_WRITE_POLICY,
+    ) == WritePolicy(deadband=10)
+
+
+def test_deadband() -> None:
+    """Test the largest of the absolute and the relative deadband applies."""
+    policy = WritePolicy(deadband=10, deadband_percent=5)
+    assert not policy.allows(105, 100, 0)
+    assert policy.allows(111, 100, 0)
+    assert not policy.allows(1040, 1000, 0)
+    assert not policy.allows(951, 1000, 0)
+    assert policy.allows(949, 1000, 0)
+    # Not a number, or nothing written yet
+    assert policy.allows("on", "off", 0)
+    assert policy.allows(100, None, 0)
+
+
+def test_intervals() -> None:
+    """Test the minimum interval holds any change, the maximum forces it."""
+    policy = WritePolicy(deadband=10, min_interval=5, max_interval=60)
+    assert not policy.allows(200, 100, 4)
+    assert policy.allows(200, 100, 5)
+    assert not policy.allows(101, 100, 59)
+    assert policy.allows(101, 100, 60)
+
+    assert policy.held_for(20) == 40
+    assert policy.held_for(70) == 0
+    assert WritePolicy(deadband=10).held_for(20) is None
+    assert WritePolicy(min_interval=90, max_interval=60).held_for(20) == 70
+
+
+async def test_held_value_written_after_the_max_interval(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_device,
+    device_data: dict[str, dict[str, str]],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a change within the deadband is written once the max interval passed."""
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_POWER_DEADBAND: 50, CONF_POWER_MAX_INTERVAL: 60},
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+
+    async def _async_set_power(power: str) -> None:
+        # Pushed, and read by the next polls
+        device_data["teleinfo1"]["T1_PAPP"] = power
+        coordinator.async_push({"T1_PAPP": power})
+        await hass.async_block_till_done()
+
+    await _async_set_power("00790")
+    assert hass.states.get("sensor.teleinfo_1").state == "790"
+
+    freezer.tick(10)
+    await _async_set_power("00800")
+    assert hass.states.get("sensor.teleinfo_1").state == "790"
+
+    # Written on time, without a new value
+    freezer.tick(49)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.teleinfo_1").state == "790"
+    freezer.tick(1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.teleinfo_1").state == "800"
+
+    # A value out of the deadband is written, the next held one is timed from it
+    freezer.tick(10)
+    await _async_set_power("00900")
+    assert hass.states.get("sensor.teleinfo_1").state == "900"
+    await _async_set_power("00910")
+    freezer.tick(59)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.teleinfo_1").state == "900"
+    freezer.tick(1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.teleinfo_1").state == "910"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)